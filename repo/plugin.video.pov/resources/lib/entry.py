@@ -270,6 +270,9 @@ class Router:
 		elif mode == 'clear_thumbnails':
 			from modules.tuneup import clear_thumbnails
 			clear_thumbnails()
+		elif mode == 'debrid_check_benchmark':
+			from modules.debrid_benchmark import benchmark_dialog
+			benchmark_dialog()
 		elif mode == 'manual_add_nzb_to_cloud':
 			from modules.debrid import Source
 			Source(params).manual_add_nzb_to_cloud()
@@ -1,5 +1,6 @@
 import json
-from threading import Thread
+from concurrent.futures import ThreadPoolExecutor as TPE
+from threading import Thread, Lock
 from debrids import alldebrid_api, premiumize_api, real_debrid_api, torbox_api, offcloud_api
 from caches.debrid_cache import DebridCache
 from indexers import metadata
@@ -210,58 +211,92 @@ class Source:
 
 class DebridCheck:
 	def __init__(self, meta, name):
-		self.cached_list = []
+		self.cached_list, self.unchecked, self.pending, self.seen = [], [], [], set()
 		self.name, self.debrid, self.function = self._debrid_dict[name]
 		self.imdb, self.season, self.episode = meta.get('imdb_id'), meta.get('season'), meta.get('episode')
+		# single worker so batches and the final check resolve in the order they were queued
+		self.lock, self.tpe, self.result, self.external, self.scheduled = Lock(), TPE(1), None, None, False
 
-	def cache_check(self):
+	def add(self, hashes):
+		with self.lock:
+			if self.result: return
+			new_hashes = [i for i in dict.fromkeys(hashes) if i not in self.seen]
+			if not new_hashes: return
+			self.seen.update(new_hashes)
+			self.pending.extend(new_hashes)
+			# hashes arriving while a batch is in flight are sent together as the next one
+			if self.scheduled: return
+			self.scheduled = True
+			self.tpe.submit(self.check_pending)
+
+	def finish(self):
+		with self.lock:
+			if not self.result: self.result = self.tpe.submit(self.finish_check)
+		return self.result
+
+	def check_pending(self):
+		with self.lock:
+			hashes, self.pending, self.scheduled = self.pending, [], False
+		self.check_batch(hashes)
+
+	def check_batch(self, hashes):
 		try:
-			self.cached_list.extend(i[0] for i in self.cached_hashes if i[1] == self.debrid and i[2] == 'True')
-			unchecked_filter = {h[0] for h in self.cached_hashes if h[1] == self.debrid}
-			unchecked_hashes = [i for i in self.hash_list if i not in unchecked_filter]
+			cached_hashes = self.cache_lookup(hashes)
+			self.cached_list.extend(i[0] for i in cached_hashes if i[1] == self.debrid and i[2] == 'True')
+			unchecked_filter = {h[0] for h in cached_hashes if h[1] == self.debrid}
+			unchecked_hashes = [i for i in hashes if i not in unchecked_filter]
 			if not unchecked_hashes: return
-			if self.debrid in ('rd', 'ad'): checked_hashes = self.external_check_cache(unchecked_hashes)
-			else: checked_hashes = self.function().check_cache(unchecked_hashes)
-			if not checked_hashes: return
-			hashes_to_cache = []
-			process_append = hashes_to_cache.append
-			cached_append = self.cached_list.append
-			try:
-				for h in unchecked_hashes:
-					if h in checked_hashes:
-						cached_append(h)
-						cached = 'True'
-					else: cached = 'False'
-					process_append((h, cached))
-			except:
-				for i in unchecked_hashes: process_append((i, 'False'))
-			if hashes_to_cache: Thread(target=self.cache_write, args=(hashes_to_cache,)).start()
+			if self.debrid in ('rd', 'ad'):
+				self.unchecked.extend(unchecked_hashes)
+				if not self.external: self.start_external()
+			else: self.store_results(unchecked_hashes, self.function().check_cache(unchecked_hashes))
 		except: pass
-		finally: return self.cached_list
-
-	def external_check_cache(self, unchecked_hashes):
-		checked_hashes = []
-		if self.debrid == 'ad': threads = (
-			Thread(target=aio_check_cache, args=(self.imdb, self.season, self.episode, checked_hashes)),
-		)
-		else: threads = (
-			Thread(target=tio_check_cache, args=(self.imdb, self.season, self.episode, checked_hashes)),
-			Thread(target=dmm_check_cache, args=(unchecked_hashes, self.imdb, checked_hashes))
-		)
-		for i in threads: i.start()
-		for i in threads: i.join()
-		return list(set(checked_hashes))
+
+	def start_external(self):
+		# torrentio/aiostreams are keyed on imdb, not hashes, so they run while the remaining providers scrape
+		self.external_hashes = []
+		target = tio_check_cache if self.debrid == 'rd' else aio_check_cache
+		self.external = Thread(target=target, args=(self.imdb, self.season, self.episode, self.external_hashes))
+		self.external.start()
+
+	def finish_check(self):
+		try:
+			if not self.unchecked: return
+			self.external.join()
+			checked_hashes = set(self.external_hashes)
+			if self.debrid == 'rd':
+				dmm_hashes = []
+				dmm_check_cache([i for i in self.unchecked if i not in checked_hashes], self.imdb, dmm_hashes)
+				checked_hashes.update(dmm_hashes)
+			self.store_results(self.unchecked, checked_hashes)
+		except: pass
+		finally:
+			self.tpe.shutdown(False)
+			return self.cached_list
+
+	def store_results(self, unchecked_hashes, checked_hashes):
+		if not checked_hashes: return
+		hashes_to_cache = []
+		process_append = hashes_to_cache.append
+		cached_append = self.cached_list.append
+		try:
+			for h in unchecked_hashes:
+				if h in checked_hashes:
+					cached_append(h)
+					cached = 'True'
+				else: cached = 'False'
+				process_append((h, cached))
+		except:
+			for i in unchecked_hashes: process_append((i, 'False'))
+		if hashes_to_cache: Thread(target=self.cache_write, args=(hashes_to_cache,)).start()
+
+	def cache_lookup(self, hashes):
+		return DebridCache().get_many(hashes) or []
 
 	def cache_write(self, hashes):
 		DebridCache().set_many(hashes, self.debrid)
 
-	@classmethod
-	def set_cached_hashes(cls, hash_list):
-		cls.hash_list = hash_list
-		cls.cached_hashes = DebridCache().get_many(hash_list) or []
-
 	_debrid_dict = {i[0]: i for i in debrid_list}
-	hash_list, cached_hashes = [], []
 
 import re, random, requests
 from fenom.client import randomagent
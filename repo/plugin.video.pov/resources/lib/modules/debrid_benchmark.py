@@ -0,0 +1,80 @@
+import time, random
+from concurrent.futures import ThreadPoolExecutor as TPE
+from modules.debrid import DebridCheck
+from modules.kodi_utils import show_busy_dialog, hide_busy_dialog, show_text
+# from modules.kodi_utils import logger
+
+heading = 'Debrid Check Benchmark'
+result_format = 'Providers: %d | Hashes: %d | Debrids: %d | Rounds: %d[CR][CR]'
+result_format += 'Two-phase: [B]%.3fs[/B][CR]Streaming: [B]%.3fs[/B][CR][CR]Saved: [B]%.3fs (%d%%)[/B]'
+
+class SyntheticAPI:
+	latency, per_hash = 0.4, 0.0005
+	def check_cache(self, hashes):
+		time.sleep(self.latency + self.per_hash * len(hashes))
+		return [i for i in hashes if int(i[-1], 16) % 3 == 0]
+
+class SyntheticCheck(DebridCheck):
+	def __init__(self, name):
+		super().__init__({}, name)
+		self.function = SyntheticAPI
+
+	def cache_lookup(self, hashes):
+		return []
+
+	def cache_write(self, hashes):
+		pass
+
+def synthetic_providers(providers, hashes, seed=7):
+	rng = random.Random(seed)
+	pool = ['%040x' % rng.getrandbits(160) for _ in range(hashes)]
+	return [(rng.uniform(0.5, 3.0), rng.sample(pool, hashes // 4)) for _ in range(providers)]
+
+def scrape(delay, hashes):
+	time.sleep(delay)
+	return [{'source': 'torrent', 'hash': i} for i in hashes]
+
+def run_two_phase(providers, debrids):
+	start_time = time.monotonic()
+	with TPE(len(providers)) as tpe:
+		futures = [tpe.submit(scrape, *i) for i in providers]
+	result_hashes = list({i['hash'] for fut in futures for i in fut.result()})
+	checks = [SyntheticCheck(item) for item in debrids]
+	for check in checks: check.add(result_hashes)
+	results = [check.finish().result() for check in checks]
+	return time.monotonic() - start_time, results
+
+def run_streaming(providers, debrids):
+	start_time = time.monotonic()
+	checks = [SyntheticCheck(item) for item in debrids]
+	def queue_hashes(fut):
+		hashes = [i['hash'] for i in fut.result()]
+		for check in checks: check.add(hashes)
+	with TPE(len(providers)) as tpe:
+		for i in providers: tpe.submit(scrape, *i).add_done_callback(queue_hashes)
+	results = [check.finish().result() for check in checks]
+	return time.monotonic() - start_time, results
+
+def debrid_check_benchmark(providers=12, hashes=2000, debrids=('premiumize.me', 'torbox', 'offcloud'), rounds=3):
+	provider_data = synthetic_providers(providers, hashes)
+	two_phase = streaming = 0.0
+	for _ in range(rounds):
+		elapsed, expected = run_two_phase(provider_data, debrids)
+		two_phase += elapsed
+		elapsed, results = run_streaming(provider_data, debrids)
+		streaming += elapsed
+		if [set(i) for i in results] != [set(i) for i in expected]:
+			raise Exception('%s: streaming results differ from two-phase' % heading)
+	two_phase, streaming = two_phase / rounds, streaming / rounds
+	return {'providers': providers, 'hashes': hashes, 'debrids': len(debrids), 'rounds': rounds,
+			'two_phase': two_phase, 'streaming': streaming, 'saved': two_phase - streaming}
+
+def benchmark_dialog():
+	show_busy_dialog()
+	try: result = debrid_check_benchmark()
+	finally: hide_busy_dialog()
+	text = result_format % (
+		result['providers'], result['hashes'], result['debrids'], result['rounds'], result['two_phase'],
+		result['streaming'], result['saved'], round(result['saved'] / result['two_phase'] * 100)
+	)
+	show_text(heading, text, font_size='large')
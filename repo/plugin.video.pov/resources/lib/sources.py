@@ -561,7 +561,8 @@ class Manager:
 	@dialog_hook
 	def results(self, info):
 		ExternalSource.resolutions, ExternalSource.timeout = self.resolutions, self.timeout
-		tpe = TPE(max(1, len(self.source_dict), len(self.debrid_torrents)))
+		tpe = TPE(max(1, len(self.source_dict)))
+		checks = [DebridCheck(self.meta, item) for item in self.debrid_torrents]
 		self.threads = set()
 		try:
 			random.shuffle(self.source_dict)
@@ -571,27 +572,51 @@ class Manager:
 				args = (provider, module, *pack) if pack else (provider, module)
 				fut = tpe.submit(ExternalSource(self.meta, args=args).results, info)
 				fut.name = pack_display % (provider, *pack) if pack and pack[0] else provider
+				# debrid checks start on each provider's hashes while the rest are still scraping
+				fut.add_done_callback(lambda fut: self.queue_hashes(fut, checks))
 				self.threads.add(fut)
 			self.wait()
 			providers = (i for fut in self.threads for i in (fut.result() if fut.done() else []))
 			self.sources.extend(self.process_duplicates(providers))
 			torrent_sources = [i for i in self.sources if 'torrent' in i['source']]
-			result_hashes = list({i['hash'] for i in torrent_sources})
-			DebridCheck.set_cached_hashes(result_hashes)
+			result_hashes = [i['hash'] for i in torrent_sources]
 			self.threads = set()
-			for item in self.debrid_torrents:
-				fut = tpe.submit(DebridCheck(self.meta, item).cache_check)
-				fut.name = item
+			for check in checks:
+				# only queues hashes a late provider callback has not handed over yet
+				check.add(result_hashes)
+				fut = check.finish()
+				fut.name = check.name
 				self.threads.add(fut)
 			self.wait(debrid_check=True)
-			for name, hashes in ((fut.name, fut.result() if fut.done() else []) for fut in self.threads):
-				status = ('Unchecked %s' if name in ('real-debrid', 'alldebrid') else 'Uncached %s') % name
-				self.final_sources.extend({**i, 'cache_provider': name, 'debrid': name} for i in torrent_sources if i['hash'] in hashes)
-				self.final_sources.extend({**i, 'cache_provider': status, 'debrid': name} for i in torrent_sources if i['hash'] not in hashes)
+			debrid_results = [(fut.name, fut.result() if fut.done() else []) for fut in self.threads]
+			self.final_sources.extend(self.classify_torrents(torrent_sources, debrid_results))
 		except: notification(32574)
-		finally: tpe.shutdown(False)
+		finally:
+			for check in checks: check.finish()
+			tpe.shutdown(False)
 		return self.final_sources
 
+	def classify_torrents(self, torrent_sources, debrid_results):
+		# uncached rows are dropped by _sort_uncached_torrents unless shown, so they are never built here
+		show_uncached = self.display_uncached_torrents or get_property('fs_filterless_search') == 'true'
+		classifiers = []
+		for name, hashes in debrid_results:
+			if name in ('real-debrid', 'alldebrid'): status = 'Unchecked %s' % name
+			elif show_uncached: status = 'Uncached %s' % name
+			else: status = None
+			classifiers.append((name, set(hashes), status))
+		for i in torrent_sources:
+			_hash = i['hash']
+			for name, hashes, status in classifiers:
+				if _hash in hashes: yield {**i, 'cache_provider': name, 'debrid': name}
+				elif status: yield {**i, 'cache_provider': status, 'debrid': name}
+
+	def queue_hashes(self, fut, checks):
+		try: hashes = [i['hash'] for i in fut.result() if 'torrent' in i['source']]
+		except: return
+		if not hashes: return
+		for check in checks: check.add(hashes)
+
 	def wait(self, debrid_check=False):
 		if not self.background:
 			if self.internal_activated or self.internal_prescraped:
@@ -3,6 +3,8 @@
 from tmdbhelper.lib.addon.logger import kodi_log, TimerFunc
 from tmdbhelper.lib.addon.plugin import get_setting, get_version
 from tmdbhelper.lib.files.futils import FileUtils
+from contextlib import contextmanager
+from threading import local
 import sqlite3
 
 
@@ -17,6 +19,7 @@ class DatabaseCore:
     _db_read_timeout = 1.0
     database_version = 1
     database_changes = {}
+    _thread_local = local()  # Per-thread connections shared by all instances -- sqlite connections cannot cross threads
 
     def __init__(self, folder=None, filename=None):
         '''Initialize our caching class'''
@@ -76,6 +79,7 @@ class DatabaseCore:
     def init_database(self):
         # import xbmcvfs
         from jurialmunkey.locker import MutexPropLock
+        self.del_thread_databases()
         with MutexPropLock(f'{self._db_file}.lockfile', kodi_log=self.kodi_log):
             # if xbmcvfs.exists(self._db_file):
             #     self.set_database_init()
@@ -105,6 +109,67 @@ class DatabaseCore:
         connection.row_factory = sqlite3.Row
         return self.set_pragmas(connection)
 
+    @property
+    def thread_databases(self):
+        try:
+            return self._thread_local.databases
+        except AttributeError:
+            self._thread_local.databases = {}
+            return self._thread_local.databases
+
+    @property
+    def thread_transactions(self):
+        try:
+            return self._thread_local.transactions
+        except AttributeError:
+            self._thread_local.transactions = {}
+            return self._thread_local.transactions
+
+    @property
+    def in_bulk_transaction(self):
+        return bool(self.thread_transactions.get(self._db_file))
+
+    def get_thread_database(self, read_only=False):
+        """ Reuse a connection for this thread and database rather than reconnecting for every statement """
+        read_only = read_only and not self.in_bulk_transaction  # Reads inside a transaction must see its writes
+        key = (self._db_file, read_only)
+        try:
+            return self.thread_databases[key]
+        except KeyError:
+            connection = self.get_database(read_only=read_only, log_level=2)
+            if connection:
+                self.thread_databases[key] = connection
+            return connection
+
+    def del_thread_databases(self):
+        for read_only in (True, False):
+            connection = self.thread_databases.pop((self._db_file, read_only), None)
+            if connection:
+                connection.close()
+
+    @contextmanager
+    def bulk_transaction(self):
+        """
+        Run all statements on this thread inside one transaction committed at the end (rolled back on exception)
+        Methods called within do not need to pass a connection. Nested calls join the outer transaction.
+        """
+        connection = self.get_thread_database()
+        depth = self.thread_transactions.get(self._db_file, 0)
+        self.thread_transactions[self._db_file] = depth + 1
+        try:
+            if not depth:
+                connection.execute('BEGIN')
+            yield connection
+        except Exception:
+            if not depth:
+                connection.rollback()
+            raise
+        else:
+            if not depth:
+                connection.commit()
+        finally:
+            self.thread_transactions[self._db_file] = depth
+
     def database_execute(self, connection, query, data=None):
         try:
             if not data:
@@ -121,7 +186,10 @@ class DatabaseCore:
         try:
             if connection:
                 return self.database_execute(connection, query, data=data)
-            with self.get_database(read_only=read_only) as connection:
+            connection = self.get_thread_database(read_only=read_only)
+            if self.in_bulk_transaction:
+                return self.database_execute(connection, query, data=data)
+            with connection:
                 return self.database_execute(connection, query, data=data)
         except Exception as database_exception:
             self.kodi_log(f'CACHE: database GET DATABASE ERROR! -- {database_exception}\n{self._sc_name} -- read_only: {read_only}', 2)
@@ -203,8 +271,26 @@ class DatabaseCore:
         return connection
 
 
+def cached_statement(func):
+    """ Memoise statement text by table/keys/conditions as the same statements are rebuilt in per-item loops """
+    cache = {}
+
+    def hashable(value):
+        return tuple(value) if isinstance(value, list) else value
+
+    def wrapper(*args, **kwargs):
+        key = (tuple(hashable(i) for i in args), tuple((k, hashable(v)) for k, v in kwargs.items()))
+        try:
+            return cache[key]
+        except KeyError:
+            cache[key] = statement = func(*args, **kwargs)
+            return statement
+    return wrapper
+
+
 class DatabaseStatements:
     @staticmethod
+    @cached_statement
     def insert_or_ignore(table, keys=('id', )):
         return 'INSERT OR IGNORE INTO {table}({keys}) VALUES ({values})'.format(
             table=table,
@@ -212,6 +298,7 @@ class DatabaseStatements:
             values=', '.join(['?' for _ in keys]))
 
     @staticmethod
+    @cached_statement
     def insert_or_replace(table, keys=('id', )):
         return 'INSERT OR REPLACE INTO {table}({keys}) VALUES ({values})'.format(
             table=table,
@@ -219,6 +306,7 @@ class DatabaseStatements:
             values=', '.join(['?' for _ in keys]))
 
     @staticmethod
+    @cached_statement
     def insert_or_update_if_null(table, keys=('id', ), conflict_constraint='id'):
         return (
             'INSERT INTO {table}({keys}) VALUES ({values}) '
@@ -232,6 +320,7 @@ class DatabaseStatements:
         )
 
     @staticmethod
+    @cached_statement
     def delete_keys(table, keys, conditions='item_type=?'):
         return 'UPDATE {table} SET {keys} {conditions}'.format(
             table=table,
@@ -239,22 +328,26 @@ class DatabaseStatements:
             conditions=f'WHERE {conditions}' if conditions else '')
 
     @staticmethod
+    @cached_statement
     def delete_item(table, conditions='id=?'):
         return 'DELETE FROM {table} WHERE {conditions}'.format(
             table=table,
             conditions=conditions)
 
     @staticmethod
+    @cached_statement
     def update_if_null(table, keys, conditions='id=?'):
         return 'UPDATE {table} SET {keys} WHERE {conditions}'.format(
             keys=', '.join([f'{k}=ifnull(?,{k})' for k in keys]), table=table, conditions=conditions)
 
     @staticmethod
+    @cached_statement
     def select_limit(table, keys, conditions='id=?'):
         return 'SELECT {keys} FROM {table} WHERE {conditions} LIMIT 1'.format(
             keys=', '.join(keys), table=table, conditions=conditions)
 
     @staticmethod
+    @cached_statement
     def select(table, keys, conditions=None):
         if not conditions:
             return 'SELECT {keys} FROM {table}'.format(
@@ -114,6 +114,36 @@ class Downloader(object):
             content = downloaded_gzip.read()
         return content
 
+    download_size = 0
+    download_read = 0
+
+    @property
+    def download_progress(self):
+        """ Percentage of compressed bytes read from a streamed download (0 if size unknown) """
+        if not self.download_size:
+            return 0
+        return min(int((self.download_read / self.download_size) * 100), 100)
+
+    def get_gzip_lines(self):
+        """ Generator yielding decompressed lines from a streamed gzip download without holding whole file in memory """
+        if not self.download_url:
+            return
+
+        with BusyDialog():
+            response = self.open_url(self.download_url, stream=True)
+        if not response:
+            Dialog().ok(ADDONNAME, get_localized(32058))
+            return
+
+        self.download_size = int(response.headers.get('Content-Length') or 0)
+        self.download_read = 0
+        response.raw.decode_content = True  # Only undo transport encoding -- file itself is still gzipped
+
+        with response, gzip.GzipFile(fileobj=response.raw) as downloaded_gzip:
+            for line in downloaded_gzip:
+                self.download_read = response.raw.tell()
+                yield line
+
     def get_extracted_zip(self):
         import zipfile
         if not self.download_url or not self.extract_to:
@@ -268,7 +268,33 @@ class ContainerDirectoryCommon(CommonContainerAPIs):
         """
         return
 
+    @cached_property
+    def is_prefetch_enabled(self):
+        if self.handle == -1:
+            return False
+        if not self.pagination:
+            return False
+        return get_setting('prefetch_next_page')
+
+    def prefetch_next_page(self, items):
+        """ After serving this page build the next page in the background to warm caches (opt-in) """
+        if not self.is_prefetch_enabled:
+            return
+        next_page = next((li.next_page for li in items if li and li.next_page), None)
+        if not next_page:
+            return
+        from tmdbhelper.lib.items.pages import NextPagePrefetcher
+        NextPagePrefetcher(self, next_page).run()
+
+    def cancel_prefetch(self):
+        """ Loading any container stops a running prefetch for a previous container """
+        if self.handle == -1:
+            return
+        from tmdbhelper.lib.items.pages import NextPagePrefetcher
+        NextPagePrefetcher.cancel()
+
     def get_directory(self, items_only=False, build_items=True):
+        self.cancel_prefetch()
 
         with TimerList(self.timer_lists, 'total', logging=self.log_timers):
             self.trakt_playdata.pre_sync_start(**self.params)
@@ -308,6 +334,8 @@ class ContainerDirectoryCommon(CommonContainerAPIs):
         if self.container_refresh:
             executebuiltin('Container.Refresh')
 
+        self.prefetch_next_page(items)
+
 
 class ContainerDirectory(ContainerDirectoryCommon):
 
@@ -32,3 +32,95 @@ class PaginatedItems():
 
     def get_dict(self):
         return {'items': self.items, 'headers': self.headers}
+
+
+class NextPagePrefetcher():
+    """
+    Builds page N+1 of a container after page N has been served to warm the request cache and ItemDetails.db
+    Only one page per container is prefetched at a time up to max_page
+    Stops if another container is loaded or the user leaves the plugin folder (non-widgets)
+    A prefetched page is skipped until lock_expiry seconds pass so it can be warmed again once caches age
+    """
+    max_page = 10
+    lock_expiry = 900
+
+    def __init__(self, container, next_page):
+        self.container = container
+        self.next_page = try_int(next_page)
+        self.params = {**container.parent_params, 'page': self.next_page}
+
+    @property
+    def container_key(self):
+        from hashlib import md5
+        params = sorted((k, f'{v}') for k, v in self.container.parent_params.items() if k not in ('page', 'plugin_category'))
+        return md5(f'{params}'.encode()).hexdigest()
+
+    @property
+    def token(self):
+        try:
+            return self._token
+        except AttributeError:
+            self._token = f'{self.container_key}.{self.next_page}'
+            return self._token
+
+    @property
+    def lock_name(self):
+        return f'Prefetch.{self.container_key}'
+
+    @staticmethod
+    def cancel():
+        """ Called whenever a container loads so that a prefetch for the previous container stops """
+        from jurialmunkey.window import get_property
+        get_property('Prefetch.Current', clear_property=True)
+
+    def get_lock(self):
+        """ Returns last locked page or 0 if the lock has expired """
+        from time import time
+        from jurialmunkey.window import get_property
+        page, _, expiry = (get_property(self.lock_name) or '').partition(';')
+        return try_int(page) if try_int(expiry) > time() else 0
+
+    def set_lock(self, page):
+        from time import time
+        from jurialmunkey.window import get_property
+        get_property(self.lock_name, f'{page};{int(time()) + self.lock_expiry}')
+
+    @property
+    def is_on_folder(self):
+        if self.container.is_widget:
+            return True
+        from tmdbhelper.lib.addon.plugin import get_infolabel, PLUGINPATH
+        return get_infolabel('Container.FolderPath').startswith(PLUGINPATH)
+
+    @property
+    def is_active(self):
+        from jurialmunkey.window import get_property
+        if get_property('Prefetch.Current') != self.token:
+            return False  # Another container has been loaded since so cancel
+        return self.is_on_folder
+
+    def run(self):
+        from jurialmunkey.window import get_property
+        get_property('Prefetch.Current', self.token)
+        if not self.next_page or self.next_page > self.max_page:
+            return
+        if self.get_lock() >= self.next_page:
+            return  # Already prefetched or prefetching this page
+        self.set_lock(self.next_page)
+        try:
+            self.prefetch()
+        finally:
+            if not self.is_active:  # Allow refetch later if cancelled
+                self.set_lock(self.next_page - 1)
+
+    def prefetch(self):
+        from tmdbhelper.lib.items.routes import get_container
+        container = get_container(self.params.get('info'))(-1, self.container.paramstring, **self.params)
+        container.pagination = False  # Don't chain another next page item
+        container.get_tmdb_id()
+        if not self.is_active:
+            return
+        items = container.get_items(**container.params)
+        if not items or not self.is_active:
+            return
+        container.build_detailed_items(items)
@@ -4,6 +4,8 @@ import xbmcvfs
 import colorsys
 import hashlib
 import random
+from threading import Lock, Timer, Event
+from collections import OrderedDict
 from xbmc import getCacheThumbName, skinHasImage, Monitor, sleep
 from tmdbhelper.lib.addon.plugin import get_infolabel, get_setting, get_condvisibility, ADDONDATA
 from jurialmunkey.window import WindowPropertySetter
@@ -23,14 +25,16 @@ ARTWORK_LOOKUP_TABLE = {
 
 # PIL causes issues (via numpy) on Linux systems using python versions higher than 3.8.5
 # Lazy import PIL to avoid using it unless user requires ImageFunctions
-ImageFilter, Image = None, None
+ImageFilter, ImageStat, Image = None, None, None
 
 
 def lazyimport_pil(func):
     def wrapper(*args, **kwargs):
-        global ImageFilter
+        global ImageFilter, ImageStat
         if ImageFilter is None:
             from PIL import ImageFilter
+        if ImageStat is None:
+            from PIL import ImageStat
         return func(*args, **kwargs)
     return wrapper
 
@@ -112,6 +116,122 @@ def _openimage(image, targetpath, filename):
     return ('', None)
 
 
+class ImageDecoder():
+    """ Keeps the last few decoded source images so that crop/blur/desaturate/colors share one decode """
+    max_entries = 3
+    _lock = Lock()
+    _images = OrderedDict()
+    _loading = {}
+
+    @classmethod
+    def get_image(cls, source, targetpath, filename):
+        """ Returns a fully loaded image for source -- callers must not modify or close it """
+        key = md5hash(source)
+        with cls._lock:
+            try:
+                cls._images.move_to_end(key)
+                return cls._images[key]
+            except KeyError:
+                pass
+            loading = cls._loading.get(key)
+            if loading is None:
+                loading = cls._loading[key] = Event()
+                loading.image = None
+                is_loader = True
+            else:
+                is_loader = False
+
+        # Another thread is already fetching this source so wait for its decode instead of repeating it
+        if not is_loader:
+            loading.wait()
+            return loading.image
+
+        # Fetch and decode outside the lock so that different images still load in parallel
+        try:
+            loading.image = cls.decode_image(source, targetpath, filename)
+            if loading.image:
+                with cls._lock:
+                    cls._images[key] = loading.image
+                    while len(cls._images) > cls.max_entries:
+                        cls._images.popitem(last=False)  # Not closed as another thread may still be using it -- gc frees it
+            return loading.image
+        finally:
+            with cls._lock:
+                cls._loading.pop(key, None)
+            loading.set()
+
+    @staticmethod
+    def decode_image(source, targetpath, filename):
+        img, targetfile = _openimage(source, targetpath, filename)
+        if not img:
+            return
+        try:
+            img.load()
+        finally:
+            xbmcvfs.delete(targetfile) if targetfile else None  # Data is loaded so temp copy can go now but image stays open
+        return img
+
+
+class ImageIndex():
+    """ Small on-disk index memoising colour results by artwork hash to avoid decoding previously seen artwork """
+    max_entries = 500
+    write_delay = 5
+    _lock = Lock()
+    _data = None
+    _timer = None
+
+    def __init__(self, save_path):
+        self.filepath = os.path.join(save_path, 'index.json')
+
+    def read_index(self):
+        from json import loads
+        try:
+            with xbmcvfs.File(self.filepath, 'r') as f:
+                return OrderedDict(loads(f.read() or '{}'))
+        except Exception:
+            return OrderedDict()
+
+    def write_index(self):
+        from json import dumps
+        with self._lock:
+            ImageIndex._timer = None
+            data = dumps(ImageIndex._data, separators=(',', ':'))
+        with xbmcvfs.File(self.filepath, 'w') as f:
+            f.write(data)
+
+    def queue_write(self):
+        """ Batch index writes so browsing new artwork doesn't rewrite the whole file per item -- call within lock """
+        if ImageIndex._timer is not None:
+            return
+        ImageIndex._timer = Timer(self.write_delay, self.write_index)
+        ImageIndex._timer.daemon = True  # Don't hold up Kodi exiting -- flush() writes the last batch on stop
+        ImageIndex._timer.start()
+
+    @staticmethod
+    def flush():
+        """ Write any pending batch now e.g. when the service or script stops """
+        timer = ImageIndex._timer
+        if timer is None:
+            return
+        timer.cancel()
+        timer.function()
+
+    def get(self, key):
+        with self._lock:
+            if ImageIndex._data is None:
+                ImageIndex._data = self.read_index()
+            return ImageIndex._data.get(key)
+
+    def set(self, key, value):
+        with self._lock:
+            if ImageIndex._data is None:
+                ImageIndex._data = self.read_index()
+            ImageIndex._data[key] = value
+            while len(ImageIndex._data) > self.max_entries:
+                ImageIndex._data.popitem(last=False)
+            self.queue_write()
+
+
 def _saveimage(image, targetfile):
     """ Save image object to disk
     Uses flush() and os.fsync() to ensure file is written to disk before continuing
@@ -181,7 +301,7 @@ class ImageFunctions(SafeThread, WindowPropertySetter):
         destination = os.path.join(self.save_path, filename)
         try:
             if not xbmcvfs.exists(destination):  # Used to do os.utime(destination, None) on existing here
-                img, targetfile = _openimage(source, self.save_path, filename)
+                img = ImageDecoder.get_image(source, self.save_path, filename)
                 try:
                     # Errors with single channel L conversion to RGBa so catch exceptions
                     img_rgba = img.convert('RGBa')
@@ -192,7 +312,7 @@ class ImageFunctions(SafeThread, WindowPropertySetter):
                     img = img.crop(img.getbbox())
                 img.thumbnail(self.crop_size)
                 _saveimage(img, destination)
-                _closeimage(img, targetfile)
+                _closeimage(img)
 
             return destination
 
@@ -206,12 +326,12 @@ class ImageFunctions(SafeThread, WindowPropertySetter):
         destination = os.path.join(self.save_path, filename)
         try:
             if not xbmcvfs.exists(destination):  # os.utime(destination, None)
-                img, targetfile = _openimage(source, self.save_path, filename)
+                img = ImageDecoder.get_image(source, self.save_path, filename).copy()
                 img.thumbnail((self.blur_size, self.blur_size))
                 img = img.convert('RGB')
                 img = img.filter(ImageFilter.GaussianBlur(self.radius))
                 _saveimage(img, destination)
-                _closeimage(img, targetfile)
+                _closeimage(img)
 
             return destination
 
@@ -224,10 +344,9 @@ class ImageFunctions(SafeThread, WindowPropertySetter):
         destination = os.path.join(self.save_path, filename)
         try:
             if not xbmcvfs.exists(destination):  # os.utime(destination, None)
-                img, targetfile = _openimage(source, self.save_path, filename)
-                img = img.convert('LA')
+                img = ImageDecoder.get_image(source, self.save_path, filename).convert('LA')
                 _saveimage(img, destination)
-                _closeimage(img, targetfile)
+                _closeimage(img)
 
             return destination
 
@@ -236,12 +355,7 @@ class ImageFunctions(SafeThread, WindowPropertySetter):
 
     def get_maincolor(self, img):
         """Returns main color of image as list of rgb values 0:255"""
-        rgb_list = [None, None, None]
-        for channel in range(3):
-            pixels = img.getdata(band=channel)
-            values = [pixel for pixel in pixels]
-            rgb_list[channel] = self.clamp(sum(values) / len(values))
-        return rgb_list
+        return [self.clamp(i) for i in ImageStat.Stat(img).mean[:3]]
 
     def get_compcolor(self, r, g, b, shift=0.33):
         """
@@ -271,18 +385,20 @@ class ImageFunctions(SafeThread, WindowPropertySetter):
         b = try_int(colorhex[6:8], 16)
         return [r, g, b]
 
-    def set_prop_colorgradient(self, propname, start_hex, end_hex, checkprop):
+    def iter_colorgradient(self, propname, start_hex, end_hex, checkprop):
+        """ Sets one step of the gradient per iteration so several gradients can share a single timer """
         if not start_hex or not end_hex:
             return
 
-        steps = 20
-
         rgb_a = self.hex_to_rgb(start_hex)
         rgb_z = self.hex_to_rgb(end_hex)
 
-        inc_r = (rgb_z[0] - rgb_a[0]) // steps
-        inc_g = (rgb_z[1] - rgb_a[1]) // steps
-        inc_b = (rgb_z[2] - rgb_a[2]) // steps
+        # Scale steps to the largest channel change so small shifts don't spend a second sleeping
+        steps = min(max(abs(z - a) for a, z in zip(rgb_a, rgb_z)) // 12, 20)
+
+        inc_r = (rgb_z[0] - rgb_a[0]) // steps if steps else 0
+        inc_g = (rgb_z[1] - rgb_a[1]) // steps if steps else 0
+        inc_b = (rgb_z[2] - rgb_a[2]) // steps if steps else 0
 
         val_r = rgb_a[0]
         val_g = rgb_a[1]
@@ -296,54 +412,66 @@ class ImageFunctions(SafeThread, WindowPropertySetter):
             val_r = val_r + inc_r
             val_g = val_g + inc_g
             val_b = val_b + inc_b
-            Monitor().waitForAbort(0.05)
+            yield
 
         self.get_property(propname, set_property=end_hex)
-        return end_hex
+
+    def set_prop_colorgradients(self, gradients):
+        """ Steps main and comp gradients together so neither lags behind the other """
+        monitor = Monitor()
+        gradients = [self.iter_colorgradient(*gradient) for gradient in gradients]
+        while gradients:
+            gradients = [gradient for gradient in gradients if next(gradient, StopIteration) is not StopIteration]
+            if gradients and monitor.waitForAbort(0.05):
+                return
 
     @lazyimport_pil
-    def colors(self, source):
-        filename = f'{md5hash(source)}.png'
-        destination = self.save_path + filename
-        targetfile = None
+    def get_colors_maincolor(self, source):
+        """ Returns main rgb from on-disk index or else from a small reduction of the shared decoded image """
+        index = ImageIndex(self.save_path)
+        index_key = md5hash(source)
+        maincolor_rgb = index.get(index_key)
+        if maincolor_rgb:
+            return maincolor_rgb
+        img = ImageDecoder.get_image(source, self.save_path, f'{index_key}.png')
+        img = img.convert('RGB') if img.mode not in ('RGB', 'RGBA') else img
+        img = img.resize((64, 64))
+        maincolor_rgb = self.get_maincolor(img)
+        _closeimage(img)
+        index.set(index_key, maincolor_rgb)
+        return maincolor_rgb
 
+    def colors(self, source):
         try:
-            if xbmcvfs.exists(destination):  # os.utime(destination, None)
-                img = _imageopen(xbmcvfs.translatePath(destination))
-            else:
-                img, targetfile = _openimage(source, self.save_path, filename)
-                img.thumbnail((128, 128))
-                img = img.convert('RGB')
-                _saveimage(img, destination)
-
-            maincolor_rgb = self.get_maincolor(img)
+            maincolor_rgb = self.get_colors_maincolor(source)
             maincolor_hex = self.rgb_to_hex(*self.get_color_lumsat(*maincolor_rgb))
             compcolor_rgb = self.get_compcolor(*maincolor_rgb)
             compcolor_hex = self.rgb_to_hex(*self.get_color_lumsat(*compcolor_rgb))
 
+            gradients = []
+
             maincolor_propname = self.save_prop + '.Main'
             maincolor_propchek = self.save_prop + '.MainCheck'
             maincolor_propvalu = self.get_property(maincolor_propname)
             if not maincolor_propvalu:
                 self.get_property(maincolor_propname, set_property=maincolor_hex)
-            else:
+            elif maincolor_propvalu != maincolor_hex:
                 self.get_property(maincolor_propchek, set_property=maincolor_propvalu)
-                thread_maincolor = SafeThread(target=self.set_prop_colorgradient, args=[
-                    maincolor_propname, maincolor_propvalu, maincolor_hex, maincolor_propchek])
-                thread_maincolor.start()
+                gradients.append((maincolor_propname, maincolor_propvalu, maincolor_hex, maincolor_propchek))
 
             compcolor_propname = self.save_prop + '.Comp'
             compcolor_propchek = self.save_prop + '.CompCheck'
             compcolor_propvalu = self.get_property(compcolor_propname)
             if not compcolor_propvalu:
                 self.get_property(compcolor_propname, set_property=compcolor_hex)
-            else:
+            elif compcolor_propvalu != compcolor_hex:
                 self.get_property(compcolor_propchek, set_property=compcolor_propvalu)
-                thread_compcolor = SafeThread(target=self.set_prop_colorgradient, args=[
-                    compcolor_propname, compcolor_propvalu, compcolor_hex, compcolor_propchek])
-                thread_compcolor.start()
+                gradients.append((compcolor_propname, compcolor_propvalu, compcolor_hex, compcolor_propchek))
+
+            if gradients:
+                thread_gradients = SafeThread(target=self.set_prop_colorgradients, args=[gradients])
+                thread_gradients.start()
 
-            _closeimage(img, targetfile)
             return maincolor_hex
 
         except Exception as exc:
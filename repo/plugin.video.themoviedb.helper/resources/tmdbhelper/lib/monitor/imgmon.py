@@ -1,4 +1,4 @@
-from tmdbhelper.lib.monitor.images import ImageManipulations
+from tmdbhelper.lib.monitor.images import ImageManipulations, ImageIndex
 from tmdbhelper.lib.monitor.poller import Poller, POLL_MIN_INCREMENT
 from tmdbhelper.lib.monitor.listitemtools import ListItemInfoGetter
 from tmdbhelper.lib.addon.tmdate import set_timestamp, get_timestamp
@@ -120,3 +120,6 @@ class ImagesMonitor(SafeThread, ListItemInfoGetter, ImageManipulations, Poller):
 
     def run(self):
         self.poller()
+
+    def _on_exit(self):
+        ImageIndex.flush()  # Index writes are batched on a daemon timer so write the last batch before stopping
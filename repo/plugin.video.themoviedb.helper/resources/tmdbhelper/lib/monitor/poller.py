@@ -1,10 +1,19 @@
-from tmdbhelper.lib.addon.plugin import get_condvisibility
-from jurialmunkey.window import WindowChecker
+from tmdbhelper.lib.addon.plugin import get_condvisibility, get_setting
+from jurialmunkey.window import WindowChecker, get_property
+from threading import Event
+from time import monotonic, thread_time
 
 POLL_MIN_INCREMENT = 0.2
 POLL_MID_INCREMENT = 1
 POLL_MAX_INCREMENT = 2
 
+POLL_BACKOFF_MULTIPLIER = 1.5  # Grow idle time by this factor each tick that focus stays on same item
+POLL_BACKOFF_INCREMENT = 0.6  # Longest idle time while focus is stable -- skin notifications wake us sooner
+
+POLL_WAKE_SLICE = 0.05  # Wakeable idle waits in slices as Kodi only runs Monitor callbacks while in waitForAbort
+
+POLL_STATS_INTERVAL = 60
+
 
 CV_DISABLED = (
     "!Skin.HasSetting(TMDbHelper.Service) + "
@@ -68,12 +77,97 @@ ON_FULLSCREEN = "Window.IsVisible(VideoFullScreen.xml)"
 WINDOW_XML_FULLSCREEN = ('VideoFullScreen.xml', )
 
 
+class PollerStats():
+    """ Counts poller ticks, infolabel/property calls and CPU time and reports them once a minute """
+
+    def __init__(self, name):
+        self.property_name = f'{name}.PollerStats'
+        self.enabled = get_setting('debug_logging')
+        self.reset()
+
+    def reset(self):
+        self.ticks = 0
+        self.calls = 0
+        self.wakeups = 0
+        self.timer = monotonic()
+        self.cputime = thread_time()
+
+    def report(self):
+        if not self.enabled:
+            return
+        if monotonic() - self.timer < POLL_STATS_INTERVAL:
+            return
+        cpu = thread_time() - self.cputime
+        get_property(self.property_name, f'ticks:{self.ticks} calls:{self.calls} wakeups:{self.wakeups} cpu:{cpu:.3f}s')
+        self.reset()
+
+
 class Poller(WindowChecker):
     _cond_on_disabled = CV_DISABLED
 
+    @property
+    def poller_stats(self):
+        try:
+            return self._poller_stats
+        except AttributeError:
+            self._poller_stats = PollerStats(self.__class__.__name__)
+            return self._poller_stats
+
+    @property
+    def wakeup_event(self):
+        try:
+            return self._wakeup_event
+        except AttributeError:
+            self._wakeup_event = Event()
+            self.update_monitor.register_wakeup_event(self._wakeup_event)
+            return self._wakeup_event
+
+    @property
+    def tick_cache(self):
+        try:
+            return self._tick_cache
+        except AttributeError:
+            self._tick_cache = {}
+            return self._tick_cache
+
+    def tick_cached(self, func, *args, **kwargs):
+        """ Memoise a condition read for the remainder of the current poller tick """
+        key = (func.__name__, args, tuple(kwargs.items()))
+        try:
+            return self.tick_cache[key]
+        except KeyError:
+            self.poller_stats.calls += 1
+            self.tick_cache[key] = value = func(*args, **kwargs)
+            return value
+
+    def get_tick_condvisibility(self, condition):
+        return self.tick_cached(get_condvisibility, condition)
+
+    def get_tick_window_property(self, key, is_home=False):
+        return self.tick_cached(self.get_window_property, key, is_home=is_home)
+
     def _on_idle(self, wait_time=30):
         self.update_monitor.waitForAbort(wait_time)
 
+    def _on_wakeable_idle(self, wait_time=POLL_MIN_INCREMENT):
+        """ Short idle which ends early when Kodi sends a notification e.g. skin NotifyAll(TMDbHelper, ...) """
+        end_time = monotonic() + wait_time
+        while not self.wakeup_event.is_set():
+            remaining = end_time - monotonic()
+            if remaining <= 0 or self.update_monitor.waitForAbort(min(remaining, POLL_WAKE_SLICE)):
+                return
+        self.wakeup_event.clear()
+        self.poller_stats.wakeups += 1
+
+    def _on_adaptive_idle(self, state):
+        """ Back off idle time while state (e.g. focused item) is unchanged and reset as soon as it changes """
+        if state != getattr(self, '_adaptive_state', None):
+            self._adaptive_state = state
+            self._adaptive_wait = POLL_MIN_INCREMENT
+        else:
+            self._adaptive_wait = min(self._adaptive_wait * POLL_BACKOFF_MULTIPLIER, POLL_BACKOFF_INCREMENT)
+        self._on_wakeable_idle(self._adaptive_wait)
+
     def _on_modal(self):
         self._on_idle(POLL_MID_INCREMENT)
 
@@ -97,7 +191,7 @@ class Poller(WindowChecker):
 
     def _on_fullscreen(self):
         self._on_player()
-        if self.is_current_window_xml(WINDOW_XML_INFODIALOG) or get_condvisibility(CV_FULLSCREEN_LISTITEM):
+        if self.is_current_window_xml(WINDOW_XML_INFODIALOG) or self.get_tick_condvisibility(CV_FULLSCREEN_LISTITEM):
             return self._on_listitem()
         self._on_idle(POLL_MID_INCREMENT)
 
@@ -107,17 +201,17 @@ class Poller(WindowChecker):
 
     @property
     def is_on_disabled(self):
-        return get_condvisibility(self._cond_on_disabled)
+        return self.get_tick_condvisibility(self._cond_on_disabled)
 
     @property
     def is_on_screensaver(self):
-        return get_condvisibility(ON_SCREENSAVER)
+        return self.get_tick_condvisibility(ON_SCREENSAVER)
 
     @property
     def is_on_modal(self):
         if self.is_current_window_xml(WINDOW_XML_MODAL):
             return True
-        if self.get_window_property(WINDOW_PROPERTY_MODAL):
+        if self.get_tick_window_property(WINDOW_PROPERTY_MODAL):
             return True
         return False
 
@@ -125,13 +219,13 @@ class Poller(WindowChecker):
     def is_on_context(self):
         if self.is_current_window_xml(WINDOW_XML_CONTEXT):
             return True
-        if self.get_window_property(WINDOW_PROPERTY_CONTEXT):
+        if self.get_tick_window_property(WINDOW_PROPERTY_CONTEXT):
             return True
         return False
 
     @property
     def is_on_scroll(self):
-        return get_condvisibility(CV_SCROLL)
+        return self.get_tick_condvisibility(CV_SCROLL)
 
     @property
     def is_on_listitem(self):
@@ -139,17 +233,20 @@ class Poller(WindowChecker):
             return True
         if self.is_current_window_xml(WINDOW_XML_MEDIA):
             return True
-        if self.get_window_property('WidgetContainer', is_home=True):
+        if self.get_tick_window_property('WidgetContainer', is_home=True):
             return True
-        if self.get_window_property('WidgetContainer'):
+        if self.get_tick_window_property('WidgetContainer'):
             return True
         return False
 
     def poller(self):
         while not self.update_monitor.abortRequested() and not self.exit:
             self.get_current_window()  # Get the current window ID and store for this loop
+            self.tick_cache.clear()  # Condition reads are only valid for this loop
+            self.poller_stats.ticks += 1
+            self.poller_stats.report()
 
-            if self.get_window_property('ServiceStop', is_home=True):
+            if self.get_tick_window_property('ServiceStop', is_home=True):
                 self.exit = True
 
             # If we're in fullscreen video then we should update the playermonitor time
@@ -37,7 +37,7 @@ class ServiceMonitor(Poller):
 
     def _on_listitem(self):
         self.listitem_funcs.on_listitem()
-        self._on_idle(POLL_MIN_INCREMENT)
+        self._on_adaptive_idle((self.listitem_funcs._cur_window, self.listitem_funcs._cur_item))
 
     def _on_scroll(self):
         self.listitem_funcs.on_scroll()
@@ -6,6 +6,22 @@ class UpdateMonitor(xbmc.Monitor):
     Monitors updating Kodi library
     """
 
+    @property
+    def wakeup_events(self):
+        try:
+            return self._wakeup_events
+        except AttributeError:
+            self._wakeup_events = []
+            return self._wakeup_events
+
+    def register_wakeup_event(self, event):
+        """ Event is set whenever Kodi sends a notification so that pollers can stop idling early """
+        self.wakeup_events.append(event)
+
+    def onNotification(self, sender, method, data):
+        for event in self.wakeup_events:
+            event.set()
+
     @staticmethod
     def run_library_tagger():
         from tmdbhelper.lib.addon.thread import SafeThread
@@ -1,18 +1,33 @@
 class TableDailyExport:
     conditions = None
+    batch_size = 5000
 
     def __init__(self, parent):
         self.parent = parent
 
     @staticmethod
-    def get_downloaded_list(export_list):
-        from json import loads as json_loads
-        from tmdbhelper.lib.files.downloader import Downloader
+    def get_download_url(export_list):
         from tmdbhelper.lib.addon.tmdate import get_datetime_utcnow, get_timedelta
         datestamp = get_datetime_utcnow() - get_timedelta(days=1)
         datestamp = datestamp.strftime("%m_%d_%Y")
-        download_url = f'https://files.tmdb.org/p/exports/{export_list}_ids_{datestamp}.json.gz'
-        return [json_loads(i) for i in Downloader(download_url=download_url).get_gzip_text().splitlines()]
+        return f'https://files.tmdb.org/p/exports/{export_list}_ids_{datestamp}.json.gz'
+
+    def get_downloaded_batches(self, downloader):
+        """ Generator yielding lists of value tuples of batch_size parsed line by line from streamed export """
+        from json import loads as json_loads
+        batch = []
+        for line in downloader.get_gzip_lines():
+            try:
+                i = json_loads(line)
+            except ValueError:
+                continue
+            batch.append(tuple((i.get(x) for x in self.keys)))
+            if len(batch) < self.batch_size:
+                continue
+            yield batch
+            batch = []
+        if batch:
+            yield batch
 
     @staticmethod
     def configure_list(data):
@@ -22,9 +37,23 @@ class TableDailyExport:
         return self.parent.get_cached_values(self.table, self.keys, self.configure_list, conditions=self.conditions)
 
     def set_cached(self):
-        data = self.get_downloaded_list(self.export_list)
-        values = [tuple((i[x] for x in self.keys)) for i in data] if data else None
-        if not values:
-            return
-        self.parent.set_cached_values(self.table, self.keys, values)
+        from tmdbhelper.lib.files.downloader import Downloader
+        from tmdbhelper.lib.addon.dialog import DialogProgressSyncBG
+        downloader = Downloader(download_url=self.get_download_url(self.export_list))
+
+        dialog_progress_bg = DialogProgressSyncBG()
+        dialog_progress_bg.heading = f'Updating {self.table}'
+        dialog_progress_bg.create()
+
+        def update_progress(total):
+            dialog_progress_bg.update(downloader.download_progress, message=f'{total}')
+
+        try:
+            if not self.parent.set_cached_values_batched(
+                    self.table, self.keys, self.get_downloaded_batches(downloader),
+                    progress=update_progress):
+                return
+        finally:
+            dialog_progress_bg.close()
+
         return self.get_cached()
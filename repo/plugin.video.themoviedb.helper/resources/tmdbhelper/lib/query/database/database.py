@@ -142,3 +142,24 @@ class FindQueriesDatabase(
             self.set_expiry(f'{table}.{item_id}' if item_id else table, expiry=expiry) if expiry else None
             self.access.set_cached_list_values(table, keys=keys, values=values, overwrite=overwrite)
             connection.execute('COMMIT')
+
+    def set_cached_values_batched(self, table, keys, batches, item_id=None, expiry=DEFAULT_EXPIRY, overwrite=True, progress=None):
+        """ Insert an iterable of value lists with executemany inside one transaction. Rolls back on abort. """
+        from xbmc import Monitor
+        monitor = Monitor()
+        total = 0
+        with self.access.connection.open() as connection:
+            connection.execute('BEGIN')
+            for values in batches:
+                if monitor.abortRequested():
+                    connection.execute('ROLLBACK')
+                    return
+                self.access.set_cached_list_values(table, keys=keys, values=values, overwrite=overwrite)
+                total += len(values)
+                progress(total) if progress else None
+            if not total:
+                connection.execute('ROLLBACK')
+                return
+            self.set_expiry(f'{table}.{item_id}' if item_id else table, expiry=expiry) if expiry else None
+            connection.execute('COMMIT')
+        return total
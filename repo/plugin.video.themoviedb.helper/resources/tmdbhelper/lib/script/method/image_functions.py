@@ -11,7 +11,9 @@ def blur_image(blur_image=None, prefix='ListItem', **kwargs):
 
 
 def image_colors(image_colors=None, prefix='ListItem', **kwargs):
-    from tmdbhelper.lib.monitor.images import ImageFunctions
+    from tmdbhelper.lib.monitor.images import ImageFunctions, ImageIndex
     image_colors = ImageFunctions(method='colors', artwork=image_colors, prefix=prefix)
     image_colors.setName('image_colors')
     image_colors.start()
+    image_colors.join()
+    ImageIndex.flush()  # Script exits next so write the batched colour index now
@@ -143,6 +143,69 @@ def test_func(test_func, dialog_output=False, **kwargs):
         head = path
         return finalise(head, data)
 
+    def test_func_database_benchmark(count=1000, loops=5, **kwargs):
+        from timeit import default_timer as timer
+        from tmdbhelper.lib.files.dbdata import Database
+
+        class BenchmarkDatabase(Database):
+            database_tables = {
+                'benchmark': {
+                    'id': {'data': 'TEXT PRIMARY KEY', 'indexed': True},
+                    'label': {'data': 'TEXT'},
+                    'value': {'data': 'INTEGER'},
+                }
+            }
+
+        count, loops = int(count), int(loops)
+        cache = BenchmarkDatabase(filename='benchmark.db')
+        cache.del_list_values('benchmark', conditions='id IS NOT NULL')
+        keys = ('label', 'value', )
+
+        def benchmark(func):
+            times = []
+            for x in range(loops):
+                start = timer()
+                func(x)
+                times.append(timer() - start)
+            times = sorted(times)
+            return {'min': f'{times[0]:.4f} sec', 'median': f'{times[len(times) // 2]:.4f} sec', 'max': f'{times[-1]:.4f} sec'}
+
+        def set_many_values(x):
+            cache.set_many_values('benchmark', keys, {f'{x}.{i}': (f'label_{i}', i) for i in range(count)})
+
+        def set_many_values_bulk(x):
+            with cache.bulk_transaction():
+                set_many_values(x + loops)
+
+        def set_item_values_loop(x):
+            for i in range(count // 10):
+                cache.set_item_values('benchmark', f'loop.{x}.{i}', keys, (f'label_{i}', i))
+
+        def set_item_values_loop_bulk(x):
+            with cache.bulk_transaction():
+                set_item_values_loop(x + loops)
+
+        def get_list_values(x):
+            cache.get_list_values('benchmark', ('id', ) + keys, (f'{x}.%', ), conditions='id LIKE ?')
+
+        def get_values_loop(x):
+            for i in range(count // 10):
+                cache.get_values('benchmark', f'{x}.{i}', keys)
+
+        data = {
+            'count': count,
+            'loops': loops,
+            'set_many_values': benchmark(set_many_values),
+            'set_many_values_bulk': benchmark(set_many_values_bulk),
+            'set_item_values_loop': benchmark(set_item_values_loop),
+            'set_item_values_loop_bulk': benchmark(set_item_values_loop_bulk),
+            'get_list_values': benchmark(get_list_values),
+            'get_values_loop': benchmark(get_values_loop),
+        }
+        cache.del_list_values('benchmark', conditions='id IS NOT NULL')
+        head = 'database_benchmark'
+        return finalise(head, data)
+
     routes = {
         'response': test_func_response,
         'trakt_response': test_func_trakt_response,
@@ -159,6 +222,7 @@ def test_func(test_func, dialog_output=False, **kwargs):
         'jrpc': test_func_jrpc,
         'jrpc_directory': test_func_jrpc_directory,
         'trakt_auth': test_func_trakt_auth,
+        'database_benchmark': test_func_database_benchmark,
     }
 
     return routes[test_func](**kwargs)
@@ -574,8 +574,9 @@ class Sources:
 				if pack == 'season': name = '%s (season pack)' % name
 				elif pack == 'show': name = '%s (show pack)' % name
 				threads.append(Thread(target=self.getEpisodeSource, args=(imdb, season, episode, data, i[0], i[1], pack), name=name))
-			[i.start() for i in threads]
 			end_time = time() + timeout
+			homeWindow.setProperty('cocoscrapers.scrape_deadline', str(end_time)) # shared scraper pool stops queued work at this time
+			[i.start() for i in threads]
 		except: return log_utils.error()
 		while True:
 			try:
@@ -590,6 +591,8 @@ class Sources:
 				control.sleep(100)
 			except: log_utils.error()
 		del threads[:] # Make sure any remaining providers are stopped.
+		homeWindow.setProperty('cocoscrapers.scrape_cancel', str(time())) # queued provider work started before now is dropped
+		homeWindow.clearProperty('cocoscrapers.scrape_deadline')
 		self.sources.extend(self.scraper_sources)
 		self.tvshowtitle = tvshowtitle
 		self.year = year
@@ -708,6 +711,7 @@ class Sources:
 			if self.all_providers == 'true': timeout = 90
 			start_time = time()
 			end_time = start_time + timeout
+			homeWindow.setProperty('cocoscrapers.scrape_deadline', str(end_time)) # shared scraper pool stops queued work at this time
 			quality = getSetting('hosts.quality') or '0'
 			line1 = line2 = line3 = ""
 			terminate_onCloud = getSetting('terminate.onCloud.sources') == 'true'
@@ -814,6 +818,8 @@ class Sources:
 			except: log_utils.error()
 		progressDialog.update(100, debrid_message)
 		del threads[:] # Make sure any remaining providers are stopped, only deletes threads not started yet.
+		homeWindow.setProperty('cocoscrapers.scrape_cancel', str(time())) # queued provider work started before now is dropped
+		homeWindow.clearProperty('cocoscrapers.scrape_deadline')
 		self.sources.extend(self.scraper_sources)
 		self.tvshowtitle = tvshowtitle
 		self.year = year
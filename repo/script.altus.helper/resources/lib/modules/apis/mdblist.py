@@ -23,7 +23,7 @@ class MDbListClient(BaseAPIClient):
         return datetime_object
 
     def get_ratings_from_api(
-        self, id_with_type: str, media_type: str = "movie", config=None
+        self, id_with_type: str, media_type: str = "movie", config=None, persist=True
     ) -> Dict[str, Any]:
         # """Fetch ratings with database check first."""
         # # Check database cache first
@@ -41,7 +41,7 @@ class MDbListClient(BaseAPIClient):
             response = self.session.get(url, timeout=5)
             if response.status_code == 200:
                 result = self._process_response(response.json(), config)
-                if result:
+                if result and persist:
                     self.database.update_ratings(id_with_type, result)
                 return result
         except requests.RequestException:
@@ -11,6 +11,10 @@ BLUR_SATURATION = xbmc.getInfoLabel("Skin.String(BlurSaturation)") or "1.0"
 RATINGS_DATABASE_PATH = xbmcvfs.translatePath(
     "special://profile/addon_data/script.altus.helper/ratings_cache.db"
 )
+COLOR_CACHE_DATABASE_PATH = xbmcvfs.translatePath(
+    "special://profile/addon_data/script.altus.helper/color_cache.db"
+)
+COLOR_CACHE_MAX_ENTRIES = 5000
 RATINGS_IMAGE_PATH = "special://home/addons/skin.altus/resources/rating_images/"
 PROFILE_PATH = xbmcvfs.translatePath(
     "special://userdata/addon_data/script.altus.helper/current_profile.json"
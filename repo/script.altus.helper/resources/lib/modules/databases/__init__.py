@@ -1,3 +1,4 @@
 from .ratings import RatingsDatabase
+from .colors import ColorCacheDatabase
 
-__all__ = ['RatingsDatabase']
\ No newline at end of file
+__all__ = ['RatingsDatabase', 'ColorCacheDatabase']
\ No newline at end of file
@@ -0,0 +1,82 @@
+import sqlite3
+import json
+import os
+import time
+from threading import Lock
+from typing import Optional, Dict, Any
+from ..config import COLOR_CACHE_DATABASE_PATH, COLOR_CACHE_MAX_ENTRIES
+from ..helper import COLOR_CACHE_FILE
+import xbmc
+
+
+class ColorCacheDatabase:
+    """Size-capped colour cache, the least recently used entries are evicted first."""
+
+    def __init__(self):
+        self.db_path = COLOR_CACHE_DATABASE_PATH
+        self._lock = Lock()
+        self.conn = sqlite3.connect(self.db_path, timeout=60, check_same_thread=False)
+        with self._lock, self.conn:
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS colors (
+                    cache_key TEXT PRIMARY KEY,
+                    colors TEXT,
+                    last_used INTEGER
+                )
+            """
+            )
+            self.conn.execute(
+                "CREATE INDEX IF NOT EXISTS colors_last_used ON colors (last_used)"
+            )
+        self._import_legacy_cache()
+
+    def _import_legacy_cache(self) -> None:
+        """Move entries from the old color_cache.json into the database."""
+        if not os.path.exists(COLOR_CACHE_FILE):
+            return
+        try:
+            with open(COLOR_CACHE_FILE, "r") as f:
+                self.put_many(json.load(f))
+            os.remove(COLOR_CACHE_FILE)
+        except Exception as e:
+            xbmc.log(f"Error importing color cache: {str(e)}", 3)
+
+    def get(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        with self._lock, self.conn:
+            result = self.conn.execute(
+                "SELECT colors FROM colors WHERE cache_key=?", (cache_key,)
+            ).fetchone()
+            if not result:
+                return None
+            self.conn.execute(
+                "UPDATE colors SET last_used=? WHERE cache_key=?",
+                (int(time.time()), cache_key),
+            )
+        return json.loads(result[0])
+
+    def put_many(self, entries: Dict[str, Dict[str, Any]]) -> None:
+        """Store entries in one transaction and trim the cache to COLOR_CACHE_MAX_ENTRIES."""
+        if not entries:
+            return
+        now = int(time.time())
+        with self._lock, self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO colors (cache_key, colors, last_used) VALUES (?, ?, ?)",
+                [(key, json.dumps(value), now) for key, value in entries.items()],
+            )
+            self.conn.execute(
+                """
+                DELETE FROM colors WHERE cache_key IN (
+                    SELECT cache_key FROM colors ORDER BY last_used DESC LIMIT -1 OFFSET ?
+                )
+                """,
+                (COLOR_CACHE_MAX_ENTRIES,),
+            )
+
+    def clear(self) -> None:
+        with self._lock:
+            with self.conn:
+                self.conn.execute("DELETE FROM colors")
+            self.conn.execute("VACUUM")
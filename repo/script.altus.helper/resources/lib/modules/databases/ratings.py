@@ -1,34 +1,29 @@
 import sqlite3
-import datetime as dt
-from datetime import datetime, timedelta
 import json
 import time
+from threading import Lock
 from typing import Optional, Tuple, Dict, Any
 from ..config import RATINGS_DATABASE_PATH, CACHE_DURATION_DAYS
 from ..helper import calculate_cache_size
 import xbmc, xbmcgui
 
+SCHEMA_VERSION = 1
+
 
 class RatingsDatabase:
     def __init__(self):
         self.db_path = RATINGS_DATABASE_PATH
+        self._lock = Lock()
+        # One connection for the lifetime of the object, shared by the ratings threads
+        self.conn = sqlite3.connect(self.db_path, timeout=60, check_same_thread=False)
         self._initialize_database()
 
     def _initialize_database(self) -> None:
-        """Create database tables if they don't exist."""
-        with sqlite3.connect(self.db_path, timeout=60) as conn:
-            conn.execute(
-                """
-                CREATE TABLE IF NOT EXISTS ratings (
-                    imdb_id TEXT,
-                    tmdb_id TEXT,
-                    ratings TEXT,
-                    last_updated TIMESTAMP,
-                    PRIMARY KEY (imdb_id, tmdb_id)
-                )
-            """
-            )
-            conn.execute(
+        """Create database tables and indexes, migrating older databases."""
+        with self._lock, self.conn:
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self._create_ratings_table(self.conn)
+            self.conn.execute(
                 """
                 CREATE TABLE IF NOT EXISTS id_mappings (
                     title TEXT,
@@ -36,52 +31,107 @@ class RatingsDatabase:
                     media_type TEXT,
                     imdb_id TEXT,
                     tmdb_id TEXT,
-                    last_updated TIMESTAMP,
+                    last_updated INTEGER,
                     PRIMARY KEY (title, year, media_type)
                 )
             """
             )
+            version = self.conn.execute("PRAGMA user_version").fetchone()[0]
+            if version < 1:
+                # Timestamps used to be stored as datetime strings
+                for table in ("ratings", "id_mappings"):
+                    self.conn.execute(
+                        f"""
+                        UPDATE {table} SET last_updated = CAST(strftime('%s', last_updated) AS INTEGER)
+                        WHERE typeof(last_updated) = 'text'
+                        """
+                    )
+            self.conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
 
-    def datetime_workaround(self, data, str_format):
-        try:
-            datetime_object = dt.datetime.strptime(data, str_format)
-        except:
-            datetime_object = dt.datetime(*(time.strptime(data, str_format)[0:6]))
-        return datetime_object
+    @staticmethod
+    def _create_ratings_table(conn) -> None:
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS ratings (
+                imdb_id TEXT,
+                tmdb_id TEXT,
+                ratings TEXT,
+                last_updated INTEGER,
+                PRIMARY KEY (imdb_id, tmdb_id)
+            )
+        """
+        )
+        # The primary key covers imdb_id lookups, tmdb_id needs its own index
+        conn.execute("CREATE INDEX IF NOT EXISTS ratings_tmdb_id ON ratings (tmdb_id)")
+
+    @staticmethod
+    def _expiry_cutoff() -> int:
+        return int(time.time()) - CACHE_DURATION_DAYS * 86400
 
     def get_cached_ratings(self, id_to_check: str) -> Optional[Dict[str, Any]]:
         """Get cached ratings if they exist and are not expired."""
-        with sqlite3.connect(self.db_path, timeout=60) as conn:
-            cursor = conn.cursor()
-            cursor.execute(
+        with self._lock:
+            result = self.conn.execute(
                 """
-                SELECT ratings, last_updated FROM ratings 
-                WHERE imdb_id=? OR tmdb_id=?
+                SELECT ratings FROM ratings
+                WHERE (imdb_id=? OR tmdb_id=?) AND last_updated >= ?
                 """,
-                (id_to_check, id_to_check),
-            )
-            result = cursor.fetchone()
-
-            if result:
-                ratings_data, last_updated = result
-                last_updated_date = self.datetime_workaround(
-                    last_updated, "%Y-%m-%d %H:%M:%S.%f"
-                )
-                if dt.datetime.now() - last_updated_date < dt.timedelta(
-                    days=CACHE_DURATION_DAYS
-                ):
-                    return json.loads(ratings_data)
+                (id_to_check, id_to_check, self._expiry_cutoff()),
+            ).fetchone()
+        if result:
+            return json.loads(result[0])
         return None
 
+    def get_cached_ratings_many(self, ids_to_check) -> Dict[str, Dict[str, Any]]:
+        """Get unexpired cached ratings for several ids in one query."""
+        ids_to_check = list(ids_to_check)
+        if not ids_to_check:
+            return {}
+        placeholders = ",".join("?" * len(ids_to_check))
+        with self._lock:
+            rows = self.conn.execute(
+                f"""
+                SELECT imdb_id, tmdb_id, ratings FROM ratings
+                WHERE (imdb_id IN ({placeholders}) OR tmdb_id IN ({placeholders}))
+                AND last_updated >= ?
+                """,
+                ids_to_check + ids_to_check + [self._expiry_cutoff()],
+            ).fetchall()
+        found = {}
+        for imdb_id, tmdb_id, ratings_data in rows:
+            ratings = json.loads(ratings_data)
+            for media_id in (imdb_id, tmdb_id):
+                if media_id and media_id in ids_to_check:
+                    found[media_id] = ratings
+        return found
+
     def update_ratings(self, primary_id: str, result: Dict[str, Any]) -> None:
         """Update or insert ratings data, using primary_id as fallback."""
+        self.update_ratings_many([(primary_id, result)])
+
+    def update_ratings_many(self, items) -> None:
+        """Update or insert (primary_id, result) pairs in one transaction."""
+        rows = [row for row in (self._ratings_row(*item) for item in items) if row]
+        if not rows:
+            return
+        with self._lock, self.conn:
+            self.conn.executemany(
+                """
+                INSERT OR REPLACE INTO ratings (imdb_id, tmdb_id, ratings, last_updated)
+                VALUES (?, ?, ?, ?)
+                """,
+                rows,
+            )
+
+    def _ratings_row(self, primary_id: str, result: Dict[str, Any]):
+        """Build the ratings row for result, using primary_id as fallback."""
         # Extract IDs from result
         imdb_id = result.get(
             "imdbid", primary_id if primary_id.startswith("tt") else None
         )
         tmdb_id = result.get("tmdbid", primary_id if primary_id.isdigit() else None)
         if not imdb_id and not tmdb_id:
-            return
+            return None
 
         imdb_id = imdb_id or ""
         tmdb_id = tmdb_id or ""
@@ -91,31 +141,21 @@ class RatingsDatabase:
         ratings_data.pop("imdbid", None)
         ratings_data.pop("tmdbid", None)
 
-        with sqlite3.connect(self.db_path, timeout=60) as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                """
-                INSERT OR REPLACE INTO ratings (imdb_id, tmdb_id, ratings, last_updated)
-                VALUES (?, ?, ?, ?)
-                """,
-                (imdb_id, tmdb_id, json.dumps(ratings_data), datetime.now()),
-            )
+        return (imdb_id, tmdb_id, json.dumps(ratings_data), int(time.time()))
 
     def get_cached_ids(
         self, title: str, year: str, media_type: str
     ) -> Tuple[Optional[str], Optional[str]]:
         """Get cached ID mappings."""
-        with sqlite3.connect(self.db_path, timeout=60) as conn:
-            cursor = conn.cursor()
-            cursor.execute(
+        with self._lock:
+            result = self.conn.execute(
                 """
-                SELECT imdb_id, tmdb_id FROM id_mappings 
+                SELECT imdb_id, tmdb_id FROM id_mappings
                 WHERE title=? AND year=? AND media_type=?
                 """,
                 (title, year, media_type),
-            )
-            result = cursor.fetchone()
-            return result if result else (None, None)
+            ).fetchone()
+        return result if result else (None, None)
 
     def cache_ids(
         self,
@@ -126,11 +166,10 @@ class RatingsDatabase:
         tmdb_id: Optional[str],
     ) -> None:
         """Cache ID mappings."""
-        with sqlite3.connect(self.db_path, timeout=60) as conn:
-            cursor = conn.cursor()
-            cursor.execute(
+        with self._lock, self.conn:
+            self.conn.execute(
                 """
-                INSERT OR REPLACE INTO id_mappings 
+                INSERT OR REPLACE INTO id_mappings
                 (title, year, media_type, imdb_id, tmdb_id, last_updated)
                 VALUES (?, ?, ?, ?, ?, ?)
                 """,
@@ -140,7 +179,7 @@ class RatingsDatabase:
                     media_type,
                     imdb_id,
                     tmdb_id,
-                    datetime.now(),
+                    int(time.time()),
                 ),
             )
 
@@ -171,21 +210,11 @@ class RatingsDatabase:
             if not dialog.yesno("Altus", "Are you sure you want to clear all ratings?"):
                 return
         try:
-            with sqlite3.connect(self.db_path, timeout=60) as conn:
-                cursor = conn.cursor()
-                cursor.execute("DROP TABLE IF EXISTS ratings")
-                cursor.execute(
-                    """
-                    CREATE TABLE IF NOT EXISTS ratings (
-                        imdb_id TEXT,
-                        tmdb_id TEXT,
-                        ratings TEXT,
-                        last_updated TIMESTAMP,
-                        PRIMARY KEY (imdb_id, tmdb_id)
-                    );
-                    """
-                )
-                cursor.execute("VACUUM")
+            with self._lock:
+                with self.conn:
+                    self.conn.execute("DROP TABLE IF EXISTS ratings")
+                    self._create_ratings_table(self.conn)
+                self.conn.execute("VACUUM")
                 home_window = xbmcgui.Window(10000)
                 from modules.monitors.ratings import RatingsMonitor
                 RatingsMonitor.clear_cached_props_static(home_window)
@@ -3,7 +3,7 @@ import json
 import os
 import hashlib
 import urllib.request as urllib
-from .config import RATINGS_DATABASE_PATH
+from .config import RATINGS_DATABASE_PATH, COLOR_CACHE_DATABASE_PATH
 from .search_utils import SEARCH_DATABASE_PATH
 
 ADDON = xbmcaddon.Addon()
@@ -79,8 +79,8 @@ def calculate_cache_size():
     ratings_db_size = 0
 
     # Calculate color cache size
-    if os.path.exists(COLOR_CACHE_FILE):
-        color_cache_size = os.path.getsize(COLOR_CACHE_FILE)
+    if os.path.exists(COLOR_CACHE_DATABASE_PATH):
+        color_cache_size = os.path.getsize(COLOR_CACHE_DATABASE_PATH)
         color_cache_mb = color_cache_size / (1024 * 1024)
         xbmc.executebuiltin(f"Skin.SetString(ColorCacheSize,{color_cache_mb:.2f} MB)")
 
@@ -137,12 +137,12 @@ def clear_color_cache(delete=False):
 
     if delete:
         try:
-            if os.path.exists(COLOR_CACHE_FILE):
-                with open(COLOR_CACHE_FILE, "w") as f:
-                    json.dump({}, f)
-                xbmc.log("Successfully cleared color cache", 2)
-                calculate_cache_size()
-                return True
+            from .databases.colors import ColorCacheDatabase
+
+            ColorCacheDatabase().clear()
+            xbmc.log("Successfully cleared color cache", 2)
+            calculate_cache_size()
+            return True
         except Exception as e:
             xbmc.log(f"Error clearing color cache: {str(e)}", 2)
             dialog = xbmcgui.Dialog()
@@ -6,10 +6,11 @@ import os
 from PIL import ImageFilter, Image, ImageOps, ImageEnhance, ImageStat
 import math
 import colorsys
-import json
 import time
+from collections import OrderedDict
 from .helper import *
 from .config import BLUR_CONTAINER, LOGO_CONTAINER, BLUR_RADIUS, BLUR_SATURATION
+from .databases.colors import ColorCacheDatabase
 
 OLD_IMAGE = ""
 OLD_LOGO = ""
@@ -19,8 +20,6 @@ try:
         os.makedirs(ADDON_DATA_IMG_PATH)
         os.makedirs(ADDON_DATA_IMG_TEMP_PATH)
         os.makedirs(BLUR_PATH)
-        with open(COLOR_CACHE_FILE, "w") as f:
-            json.dump({}, f, indent=2)
 except OSError as e:
     # fix for race condition
     if e.errno != os.errno.EEXIST:
@@ -29,10 +28,11 @@ except OSError as e:
 
 
 class ImageColorAnalyzer:
-    _memory_cache = {}  # In-memory cache to reduce reads
-    _cache_dirty = False  # Flag to track if we need to write
+    _memory_cache = OrderedDict()  # Bounded in-memory cache to reduce reads
+    _memory_cache_size = 200
     _last_write_time = 0  # Track when we last wrote to disk
     _pending_writes = {}  # Store pending cache entries
+    _store = None  # Shared ColorCacheDatabase
 
     def __init__(self, prop="listitem", file=None, radius=None, saturation=None):
         global OLD_IMAGE, OLD_LOGO
@@ -190,24 +190,33 @@ class ImageColorAnalyzer:
         param_string = f"{image_path}_{self.radius}_{self.saturation}"
         return md5hash(param_string)
 
+    @staticmethod
+    def _get_store():
+        if ImageColorAnalyzer._store is None:
+            ImageColorAnalyzer._store = ColorCacheDatabase()
+        return ImageColorAnalyzer._store
+
+    @staticmethod
+    def _remember_colors(cache_key, result):
+        memory_cache = ImageColorAnalyzer._memory_cache
+        memory_cache[cache_key] = result
+        memory_cache.move_to_end(cache_key)
+        while len(memory_cache) > ImageColorAnalyzer._memory_cache_size:
+            memory_cache.popitem(last=False)
+
     def get_cached_colors(self, cache_key):
-        """Get colors from memory cache first, then file cache"""
-        if cache_key in ImageColorAnalyzer._memory_cache:
-            return ImageColorAnalyzer._memory_cache[cache_key]
+        """Get colors from memory cache first, then the color cache database"""
+        result = ImageColorAnalyzer._memory_cache.get(cache_key)
+        if result:
+            ImageColorAnalyzer._memory_cache.move_to_end(cache_key)
+            return result
         try:
-            if not hasattr(ImageColorAnalyzer, "_loaded_cache"):
-                if os.path.exists(COLOR_CACHE_FILE):
-                    with open(COLOR_CACHE_FILE, "r") as f:
-                        ImageColorAnalyzer._loaded_cache = json.load(f)
-                else:
-                    ImageColorAnalyzer._loaded_cache = {}
-            result = ImageColorAnalyzer._loaded_cache.get(cache_key)
+            result = self._get_store().get(cache_key)
             if result:
-                ImageColorAnalyzer._memory_cache[cache_key] = result
+                self._remember_colors(cache_key, result)
             return result
         except Exception as e:
             xbmc.log(f"Error reading color cache: {str(e)}", 3)
-            ImageColorAnalyzer._loaded_cache = {}
         return None
 
     def cache_colors(self, cache_key):
@@ -221,9 +230,8 @@ class ImageColorAnalyzer:
                     "saturation": self.saturation,
                 },
             }
-            ImageColorAnalyzer._memory_cache[cache_key] = result
+            self._remember_colors(cache_key, result)
             ImageColorAnalyzer._pending_writes[cache_key] = result
-            ImageColorAnalyzer._cache_dirty = True
             current_time = time.time()
             write_interval = 300  # 5 minutes between writes
             if (
@@ -235,24 +243,13 @@ class ImageColorAnalyzer:
             xbmc.log(f"Error preparing cache: {str(e)}", 3)
 
     def _flush_cache_to_disk(self):
-        """Write the accumulated cache entries to disk"""
-        if not ImageColorAnalyzer._cache_dirty:
+        """Write the accumulated cache entries to the color cache database"""
+        if not ImageColorAnalyzer._pending_writes:
             return
         try:
-            if not hasattr(ImageColorAnalyzer, "_loaded_cache"):
-                if os.path.exists(COLOR_CACHE_FILE):
-                    with open(COLOR_CACHE_FILE, "r") as f:
-                        ImageColorAnalyzer._loaded_cache = json.load(f)
-                else:
-                    ImageColorAnalyzer._loaded_cache = {}
-            ImageColorAnalyzer._loaded_cache.update(ImageColorAnalyzer._pending_writes)
-            pending_count = len(ImageColorAnalyzer._pending_writes)
-            memory_count = len(ImageColorAnalyzer._memory_cache)
-            with open(COLOR_CACHE_FILE, "w") as f:
-                json.dump(ImageColorAnalyzer._loaded_cache, f, indent=2)
+            self._get_store().put_many(ImageColorAnalyzer._pending_writes)
             ImageColorAnalyzer._last_write_time = time.time()
             ImageColorAnalyzer._pending_writes.clear()
-            ImageColorAnalyzer._cache_dirty = False
         except Exception as e:
             xbmc.log(f"Error writing to color cache: {str(e)}", 3)
 
@@ -1,8 +1,11 @@
 import xbmc
 import xbmcgui
 from threading import Thread, Lock
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 import json
 import re
+import time
 from dataclasses import dataclass
 from typing import Optional, Tuple, Dict, Any
 from ..config import *
@@ -10,6 +13,10 @@ from ..databases import RatingsDatabase
 from ..apis import MDbListClient, TMDbClient
 
 CACHED_IDS_INDEX_PROP = "altus.cachedRatings.index"
+PREFETCH_RANGE = 5
+PREFETCH_WORKERS = 4
+MEMORY_CACHE_SIZE = 500
+MISS_CACHE_SECONDS = 300
 
 
 @dataclass
@@ -44,12 +51,22 @@ class RatingsMonitor:
         self.last_trailer_id = None
         self.current_ratings_thread = None
         self._rating_lock = Lock()
+        self.ratings_cache = OrderedDict()
+        self.ratings_misses = {}
+        self._cache_lock = Lock()
+        self.last_prefetch_id = None
+        self.prefetch_api_key = None
+        self.prefetch_running = False
+        self._prefetch_lock = Lock()
         self.config = ReleaseWindowConfig.from_skin_settings()
 
 
     def process_current_item(self) -> None:
         """Process the current media item."""
         self._check_smart_status_setting_changes()
+        if self.ratings_cache and not self.home_window.getProperty(CACHED_IDS_INDEX_PROP):
+            # Ratings were cleared from outside the service
+            self._clear_memory_cache()
         meta = self._get_current_item_meta()
         if not meta:
             return
@@ -57,6 +74,9 @@ class RatingsMonitor:
         if not media_id:
             return
         self._handle_trailer_update(media_id)
+        if media_id != self.last_prefetch_id:
+            self.last_prefetch_id = media_id
+            self._start_prefetch()
         if media_id != self.last_set_id or media_id != self.pending_id:
             self._process_ratings(media_id, meta)
 
@@ -65,6 +85,7 @@ class RatingsMonitor:
         if self.config.has_smart_status_settings_changes(current_config):
             self.config = current_config
             self.database.delete_all_ratings(silent=True)
+            self._clear_memory_cache()
             self.last_set_id = None
             self.pending_id = None
             self.last_trailer_id = None
@@ -79,6 +100,11 @@ class RatingsMonitor:
     def _process_ratings(self, media_id: str, meta: Dict[str, Any]) -> None:
         """Process ratings for the current item."""
         with self._rating_lock:
+            remembered = self._get_memory_cache(media_id)
+            if remembered:
+                self._update_window_properties(remembered)
+                self.last_set_id = media_id
+                return
             cached_ratings = self.home_window.getProperty(
                 f"altus.cachedRatings.{media_id}"
             )
@@ -87,6 +113,7 @@ class RatingsMonitor:
                 return
             cached_data = self.database.get_cached_ratings(media_id)
             if cached_data:
+                self._remember(cached_data, media_id)
                 self._set_cached_property(media_id, json.dumps(cached_data))
                 self._update_window_properties(cached_data)
                 self.last_set_id = cached_data.get("imdbid") or media_id
@@ -149,27 +176,165 @@ class RatingsMonitor:
     def _cache_ratings(self, primary_id: str, result: Dict[str, Any]) -> None:
         """Cache ratings in both database and window properties."""
         self.database.update_ratings(primary_id, result)
+        self._remember(result, primary_id, result.get("imdbid"), result.get("tmdbid"))
+        self._set_cached_properties(self._result_payloads(result))
 
-        imdb_id = result.get("imdbid")
-        tmdb_id = result.get("tmdbid")
+    @staticmethod
+    def _result_payloads(result: Dict[str, Any]) -> Dict[str, str]:
+        """Map the ids a result is known by to its cache property payload."""
         payload = json.dumps(result)
-
-        if imdb_id:
-            self._set_cached_property(imdb_id, payload)
-        if tmdb_id:
-            self._set_cached_property(tmdb_id, payload)
+        return {
+            media_id: payload
+            for media_id in (result.get("imdbid"), result.get("tmdbid"))
+            if media_id
+        }
 
     def _set_cached_property(self, media_id: str, payload: str) -> None:
         """Write a per-item cache property and register the id for later cleanup."""
-        self.home_window.setProperty(f"altus.cachedRatings.{media_id}", payload)
+        self._set_cached_properties({media_id: payload})
+
+    def _set_cached_properties(self, payloads: Dict[str, str]) -> None:
+        """Write per-item cache properties and register the ids with one index update."""
+        if not payloads:
+            return
+        for media_id, payload in payloads.items():
+            self.home_window.setProperty(f"altus.cachedRatings.{media_id}", payload)
         try:
             index_raw = self.home_window.getProperty(CACHED_IDS_INDEX_PROP)
             ids = set(json.loads(index_raw)) if index_raw else set()
-            if media_id not in ids:
-                ids.add(media_id)
+            if not ids.issuperset(payloads):
+                ids.update(payloads)
                 self.home_window.setProperty(CACHED_IDS_INDEX_PROP, json.dumps(list(ids)))
         except (ValueError, json.JSONDecodeError):
-            self.home_window.setProperty(CACHED_IDS_INDEX_PROP, json.dumps([media_id]))
+            self.home_window.setProperty(CACHED_IDS_INDEX_PROP, json.dumps(list(payloads)))
+
+    def _remember(self, result: Dict[str, Any], *media_ids) -> None:
+        """Keep ratings in the bounded in-memory map, dropping the least recently used."""
+        with self._cache_lock:
+            for media_id in media_ids:
+                if media_id:
+                    self.ratings_cache[media_id] = result
+                    self.ratings_cache.move_to_end(media_id)
+            while len(self.ratings_cache) > MEMORY_CACHE_SIZE:
+                self.ratings_cache.popitem(last=False)
+
+    def _get_memory_cache(self, media_id: str) -> Optional[Dict[str, Any]]:
+        with self._cache_lock:
+            result = self.ratings_cache.get(media_id)
+            if result is not None:
+                self.ratings_cache.move_to_end(media_id)
+            return result
+
+    def _clear_memory_cache(self) -> None:
+        with self._cache_lock:
+            self.ratings_cache.clear()
+            self.ratings_misses.clear()
+
+    def _remember_misses(self, media_ids) -> None:
+        """Skip ids MDbList had no ratings for until MISS_CACHE_SECONDS pass."""
+        expiry = time.monotonic() + MISS_CACHE_SECONDS
+        with self._cache_lock:
+            for media_id in media_ids:
+                self.ratings_misses[media_id] = expiry
+
+    def _is_recent_miss(self, media_id: str) -> bool:
+        with self._cache_lock:
+            expiry = self.ratings_misses.get(media_id)
+            if expiry is None:
+                return False
+            if expiry > time.monotonic():
+                return True
+            del self.ratings_misses[media_id]
+            return False
+
+    def _start_prefetch(self) -> None:
+        """Queue a batched ratings fetch for the items around focus."""
+        api_key = self.get_infolabel("Skin.String(mdblist_api_key)")
+        if not api_key:
+            return
+        with self._prefetch_lock:
+            # Only the latest focus matters, a running prefetch picks it up next
+            self.prefetch_api_key = api_key
+            if self.prefetch_running:
+                return
+            self.prefetch_running = True
+        thread = Thread(target=self._prefetch_thread)
+        thread.daemon = True
+        thread.start()
+
+    def _get_nearby_items(self) -> Dict[str, str]:
+        """Map ids of the items around focus without cached ratings to their media type."""
+        items = {}
+        for offset in range(-PREFETCH_RANGE, PREFETCH_RANGE + 1):
+            if not offset:
+                continue
+            prefix = f"Container.ListItem({offset})."
+            dbtype = self.get_infolabel(f"{prefix}DBTYPE").lower()
+            if dbtype not in ["movie", "tvshow", "episode", "season"]:
+                continue
+            imdb_id = self.get_infolabel(f"{prefix}IMDBNumber") or self.get_infolabel(
+                f"{prefix}Property(imdb)"
+            )
+            tmdb_id = self.get_infolabel(
+                f"{prefix}Property(TMDb_ID)"
+            ) or self.get_infolabel(f"{prefix}Property(tmdb)")
+            if imdb_id and imdb_id.startswith("tt"):
+                media_id = imdb_id
+            elif tmdb_id:
+                media_id = tmdb_id
+            else:
+                continue
+            if self._get_memory_cache(media_id) or self._is_recent_miss(media_id) or self.home_window.getProperty(
+                f"altus.cachedRatings.{media_id}"
+            ):
+                continue
+            items[media_id] = "movie" if dbtype == "movie" else "tv"
+        return items
+
+    def _prefetch_thread(self) -> None:
+        """Thread worker that fetches queued batches until none is left."""
+        while True:
+            with self._prefetch_lock:
+                api_key = self.prefetch_api_key
+                self.prefetch_api_key = None
+                if not api_key:
+                    self.prefetch_running = False
+                    return
+            try:
+                # Scanned here rather than on the monitor thread, the infolabels follow the latest focus
+                items = self._get_nearby_items()
+                if items:
+                    self._prefetch_batch(items, api_key)
+            except Exception as e:
+                xbmc.log(f"Error prefetching ratings: {str(e)}", xbmc.LOGERROR)
+
+    def _prefetch_batch(self, items: Dict[str, str], api_key: str) -> None:
+        """Load ratings for items from the database, fetch the rest and store them together."""
+        payloads = {}
+        cached = self.database.get_cached_ratings_many(items)
+        for media_id, ratings in cached.items():
+            self._remember(ratings, media_id)
+            payloads[media_id] = json.dumps(ratings)
+
+        missing = [media_id for media_id in items if media_id not in cached]
+        if missing:
+            self.mdblist_client.api_key = api_key
+            with ThreadPoolExecutor(max_workers=PREFETCH_WORKERS) as executor:
+                results = executor.map(
+                    lambda media_id: self.mdblist_client.get_ratings_from_api(
+                        media_id, items[media_id], config=self.config, persist=False
+                    ),
+                    missing,
+                )
+                fetched = [(media_id, result) for media_id, result in zip(missing, results) if result]
+            self._remember_misses(set(missing).difference(media_id for media_id, _ in fetched))
+            self.database.update_ratings_many(fetched)
+            for media_id, result in fetched:
+                self._remember(result, media_id, result.get("imdbid"), result.get("tmdbid"))
+                payloads.update(self._result_payloads(result))
+                payloads.setdefault(media_id, json.dumps(result))
+
+        self._set_cached_properties(payloads)
 
     def _update_window_properties(self, result: Dict[str, Any]) -> None:
         """Update window properties with new ratings data."""
@@ -7,12 +7,13 @@ from abc import ABC, abstractmethod
 from urllib.parse import quote_plus
 import os
 import time
-import hashlib
 import requests
 import json
+import sqlite3
 
 import xbmc
 import xbmcaddon
+import xbmcgui
 import xbmcvfs
 
 SCRIPT_ID = "script.module.autocompletion"
@@ -23,6 +24,16 @@ SETTING = PLUGIN_ADDON.getSetting
 ADDON_PATH = xbmcvfs.translatePath(SCRIPT_ADDON.getAddonInfo("path"))
 ADDON_ID = SCRIPT_ADDON.getAddonInfo("id")
 ADDON_DATA_PATH = xbmcvfs.translatePath(SCRIPT_ADDON.getAddonInfo("profile"))
+CACHE_DAYS = 7.0
+MAX_CACHE_ENTRIES = 1000
+DEBOUNCE_SECONDS = 0.3
+DEBOUNCE_PROPERTY = "autocompletion.latest"
+# serve suggestions filtered from a shorter cached query when at least this many still match
+PREFIX_REUSE_MIN = 5
+
+_CACHE = None
+_SESSION = None
+_DEBOUNCE_TOKEN = None
 
 
 def get_autocomplete_items(search_str, limit=10, provider=None):
@@ -85,10 +96,28 @@ class BaseProvider(ABC):
             yield li
 
     def fetch_data(self, search_str):
-        url = self.build_url(quote_plus(search_str))
-        result = get_JSON_response(url=self.BASE_URL.format(endpoint=url), headers=self.HEADERS, folder=self.FOLDER)
+        url = self.BASE_URL.format(endpoint=self.build_url(quote_plus(search_str)))
+        result = cache_lookup([url])
+        if result is None:
+            # typing "star war" after "star wa" can often be answered from the earlier response
+            suggestions = self.prefix_suggestions(search_str)
+            if len(suggestions) >= PREFIX_REUSE_MIN:
+                return suggestions
+            if not debounce(search_str):
+                # a newer keystroke does the request instead
+                return suggestions
+            result = get_JSON_response(url=url, headers=self.HEADERS, folder=self.FOLDER)
         return self.process_result(result)
 
+    def prefix_suggestions(self, search_str):
+        urls = [self.BASE_URL.format(endpoint=self.build_url(quote_plus(search_str[:i])))
+                for i in range(len(search_str) - 1, 0, -1)]
+        result = cache_lookup(urls)
+        if result is None:
+            return []
+        search_str = search_str.lower()
+        return [i for i in self.process_result(result) if isinstance(i, str) and i.lower().startswith(search_str)]
+
     def process_result(self, result):
         if not result or len(result) <= 1:
             return []
@@ -172,48 +201,202 @@ class LocalDictProvider(BaseProvider):
         if k >= 0:
             search_str = search_str[k + 1 :]
 
-        path = os.path.join(ADDON_PATH, "resources", "data", f"common_{self.language}.txt")
-        suggestions = []
+        cache = get_word_index(self.language)
+        # matches are one contiguous range of the word primary key, return the most common ones first
+        rows = cache.execute("SELECT word FROM words WHERE language = ? AND word >= ? AND word < ? ORDER BY rank LIMIT ?",
+                             (self.language, search_str, search_str + "\U0010ffff", int(self.limit) + 1)).fetchall()
+        return [i[0] for i in rows]
 
+
+def get_word_index(language):
+    """
+    return the cache connection with the word index for *language, words keyed for prefix search and ranked by frequency.
+    every keystroke runs in its own invocation, so the index is kept in cache.db and only rebuilt when common_<lang>.txt changes
+    """
+    path = os.path.join(ADDON_PATH, "resources", "data", f"common_{language}.txt")
+    stat = xbmcvfs.Stat(path)
+    source = f"{stat.st_size()}:{stat.st_mtime()}"
+    cache = get_cache()
+    row = cache.execute("SELECT source FROM word_sources WHERE language = ?", (language,)).fetchone()
+    if row is None or row[0] != source:
+        now = time.time()
         with xbmcvfs.File(path) as f:
-            for line in f.read().split('\n'):
-                if not line.startswith(search_str) or len(line) <= 2:
-                    continue
-                suggestions.append(line)
-                if len(suggestions) > int(self.limit):
-                    break
+            lines = f.read().split('\n')
+        entries = [(language, line, rank) for rank, line in enumerate(lines) if len(line) > 2]
+        cache.execute("BEGIN")
+        try:
+            cache.execute("DELETE FROM words WHERE language = ?", (language,))
+            cache.executemany("INSERT OR IGNORE INTO words VALUES (?, ?, ?)", entries)
+            cache.execute("INSERT OR REPLACE INTO word_sources VALUES (?, ?)", (language, source))
+            cache.execute("COMMIT")
+        except Exception:
+            cache.execute("ROLLBACK")
+            raise
+        log(f"built word index for {language}: {len(entries)} words. time: {float(time.time() - now)}")
+    return cache
 
-        return suggestions
+
+def _scan_local_dict(language, search_str, limit):
+    """
+    the previous per-keystroke lookup, kept as the baseline for benchmark_local_dict
+    """
+    path = os.path.join(ADDON_PATH, "resources", "data", f"common_{language}.txt")
+    suggestions = []
+    with xbmcvfs.File(path) as f:
+        for line in f.read().split('\n'):
+            if not line.startswith(search_str) or len(line) <= 2:
+                continue
+            suggestions.append(line)
+            if len(suggestions) > int(limit):
+                break
+    return suggestions
 
 
-def get_JSON_response(url="", cache_days=7.0, folder=False, headers=False):
+def benchmark_local_dict(language="en", text="the shawshank redemption", limit=10, rounds=5):
+    """
+    time LocalDictProvider per keystroke while typing *text, linear scan vs word index.
+    each keystroke is timed from a fresh cache connection as every keystroke is its own plugin invocation.
+    returns dict with one-off index build, mean and max latency in ms and whether both gave the same results
     """
-    get JSON response for *url, makes use of file cache.
+    global _CACHE
+    provider = LocalDictProvider(limit=limit)
+    provider.language = language
+    keystrokes = [text[:i] for i in range(1, len(text) + 1)]
+
+    get_cache().execute("DELETE FROM word_sources WHERE language = ?", (language,))
+    now = time.perf_counter()
+    get_word_index(language)
+    result = {"index_build_ms": (time.perf_counter() - now) * 1000}
+
+    same = True
+    for name in ("scan", "index"):
+        timings = []
+        for _ in range(rounds):
+            for search_str in keystrokes:
+                if _CACHE is not None:
+                    _CACHE.close()
+                    _CACHE = None
+                now = time.perf_counter()
+                if name == "scan":
+                    _scan_local_dict(language, search_str[search_str.rfind(" ") + 1 :], limit)
+                else:
+                    provider.fetch_data(search_str)
+                timings.append((time.perf_counter() - now) * 1000)
+        result[f"{name}_mean_ms"] = sum(timings) / len(timings)
+        result[f"{name}_max_ms"] = max(timings)
+    for search_str in keystrokes:
+        if provider.fetch_data(search_str) != _scan_local_dict(language, search_str[search_str.rfind(" ") + 1 :], limit):
+            same = False
+    result["same_results"] = same
+    log(f"benchmark_local_dict {language}: {result}")
+    return result
+
+
+def get_JSON_response(url="", cache_days=CACHE_DAYS, folder=False, headers=False):
+    """
+    get JSON response for *url, makes use of the response cache.
+    *folder is no longer used, all responses share one cache
     """
     now = time.time()
-    hashed_url = hashlib.md5(url.encode("utf-8")).hexdigest()
-    cache_path = xbmcvfs.translatePath(os.path.join(ADDON_DATA_PATH, folder) if folder else ADDON_DATA_PATH)
-    path = os.path.join(cache_path, f"{hashed_url}.txt")
-    cache_seconds = int(cache_days * 86400)
-    results = []
-
-    if xbmcvfs.exists(path) and ((now - os.path.getmtime(path)) < cache_seconds):
-        results = read_from_file(path)
-        log(f"loaded file for {url}. time: {float(time.time() - now)}")
+    results = cache_lookup([url], cache_days)
+
+    if results is not None:
+        log(f"loaded cached response for {url}. time: {float(time.time() - now)}")
     else:
         response = get_http(url, headers)
         try:
             results = json.loads(response)
             log(f"download {url}. time: {float(time.time() - now)}")
-            save_to_file(results, hashed_url, cache_path)
+            cache_store(url, results, cache_days)
         except Exception:
             log(f"Exception: Could not get new JSON data from {url}. Trying to fallback to cache")
             log(response)
-            results = read_from_file(path)
+            results = cache_lookup([url], None) or []
 
     return results
 
 
+def get_cache():
+    """
+    return connection to the response cache, a single sqlite file in the addon profile
+    """
+    global _CACHE
+    if _CACHE is None:
+        xbmcvfs.mkdirs(ADDON_DATA_PATH)
+        path = os.path.join(ADDON_DATA_PATH, "cache.db")
+        fresh = not xbmcvfs.exists(path)
+        _CACHE = sqlite3.connect(path, timeout=5, isolation_level=None)
+        _CACHE.execute("CREATE TABLE IF NOT EXISTS responses (url TEXT PRIMARY KEY, data TEXT, created REAL, accessed REAL)")
+        _CACHE.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)")
+        _CACHE.execute("CREATE TABLE IF NOT EXISTS words (language TEXT, word TEXT, rank INTEGER, PRIMARY KEY (language, word, rank)) WITHOUT ROWID")
+        _CACHE.execute("CREATE TABLE IF NOT EXISTS word_sources (language TEXT PRIMARY KEY, source TEXT)")
+        if fresh:
+            # drop the one file per url cache used before
+            for folder in ("Google", "Bing", "TMDB"):
+                xbmcvfs.rmdir(os.path.join(ADDON_DATA_PATH, folder, ""), force=True)
+    return _CACHE
+
+
+def cache_lookup(urls, cache_days=CACHE_DAYS):
+    """
+    return cached data for the first of *urls found, None if none is cached or younger than *cache_days
+    """
+    if not urls:
+        return None
+    now = time.time()
+    oldest = now - cache_days * 86400 if cache_days is not None else 0
+    try:
+        cache = get_cache()
+        rows = dict(cache.execute(f"SELECT url, data FROM responses WHERE created >= ? AND url IN ({','.join('?' * len(urls))})",
+                                  [oldest] + urls).fetchall())
+        for url in urls:
+            if url in rows:
+                cache.execute("UPDATE responses SET accessed = ? WHERE url = ?", (now, url))
+                return json.loads(rows[url])
+    except Exception as e:
+        log(f"cache lookup failed: {e}")
+    return None
+
+
+def cache_store(url, data, cache_days=CACHE_DAYS):
+    """
+    cache *data for *url, dropping expired entries and the least recently used ones over MAX_CACHE_ENTRIES
+    """
+    now = time.time()
+    try:
+        cache = get_cache()
+        cache.execute("INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?)", (url, json.dumps(data), now, now))
+        cache.execute("DELETE FROM responses WHERE created < ?", (now - cache_days * 86400,))
+        cache.execute("DELETE FROM responses WHERE url IN (SELECT url FROM responses ORDER BY accessed DESC LIMIT -1 OFFSET ?)",
+                      (MAX_CACHE_ENTRIES,))
+    except Exception as e:
+        log(f"cache store failed: {e}")
+
+
+def debounce(search_str):
+    """
+    wait briefly for further keystrokes, returns False if a newer search superseded *search_str.
+    every keystroke runs in its own invocation, so the latest search is kept in a home window property
+    """
+    global _DEBOUNCE_TOKEN
+    _DEBOUNCE_TOKEN = f"{time.time()}|{search_str}"
+    xbmcgui.Window(10000).setProperty(DEBOUNCE_PROPERTY, _DEBOUNCE_TOKEN)
+    if xbmc.Monitor().waitForAbort(DEBOUNCE_SECONDS):
+        return False
+    return not is_superseded()
+
+
+def is_superseded():
+    return _DEBOUNCE_TOKEN is not None and xbmcgui.Window(10000).getProperty(DEBOUNCE_PROPERTY) != _DEBOUNCE_TOKEN
+
+
+def get_session():
+    global _SESSION
+    if _SESSION is None:
+        _SESSION = requests.Session()
+    return _SESSION
+
+
 def get_http(url, headers):
     """
     fetches data from *url, returns it as a string
@@ -222,13 +405,14 @@ def get_http(url, headers):
     monitor = xbmc.Monitor()
     while (succeed < 2) and (not monitor.abortRequested()):
         try:
-            response = requests.get(url, headers=headers)
+            response = get_session().get(url, headers=headers, timeout=10)
             if not response.ok:
                 raise Exception
             return response.text
         except Exception:
             log(f"get_http: could not get data from {url}")
-            monitor.waitForAbort(1)
+            if monitor.waitForAbort(1) or is_superseded():
+                break
             succeed += 1
     return None
 
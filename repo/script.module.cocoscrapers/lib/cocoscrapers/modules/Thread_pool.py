@@ -1,19 +1,148 @@
-from concurrent.futures import ThreadPoolExecutor, wait
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from threading import Lock, local
+from time import time
+from urllib.parse import urlparse
 from cocoscrapers.modules import log_utils
+from cocoscrapers.modules.control import homeWindow, monitor
+
+# Host add-on signals, set on home window like "fs_filterless_search"
+CANCEL_PROPERTY = 'cocoscrapers.scrape_cancel'  # epoch seconds host stopped waiting on providers
+DEADLINE_PROPERTY = 'cocoscrapers.scrape_deadline'  # epoch seconds host will wait until
+
+MAX_WORKERS = 10  # global cap shared by every provider in the process
+MAX_PER_HOST = 3  # concurrent requests allowed against a single site
 
 # Init global thread pool
-tp = ThreadPoolExecutor(max_workers=10)
+tp = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix='cocoscrapers')
 _shutdown = False  # Track shutdown state
+_worker = local()  # Flags pool threads so nested calls run inline instead of waiting on their own pool
+
+
+def get_host(item):
+    # relative paths have no host, callers scraping them pass host= so they still share their site's cap
+    if isinstance(item, (tuple, list)):
+        item = next((i for i in item if isinstance(i, str) and '://' in i), '')
+    if not isinstance(item, str):
+        return ''
+    if '://' in item:
+        return urlparse(item).netloc
+    return '' if '/' in item else item  # bare domain passed as host=
+
+
+def get_property_time(name):
+    try:
+        return float(homeWindow.getProperty(name) or 0)
+    except ValueError:
+        return 0
+
+
+def get_deadline(started, timeout=None):
+    deadline = started + timeout if timeout else None
+    host_deadline = get_property_time(DEADLINE_PROPERTY)
+    if host_deadline > started and (not deadline or host_deadline < deadline):  # Older values are left over from a previous scrape
+        deadline = host_deadline
+    return deadline
+
+
+def is_cancelled(started):
+    return get_property_time(CANCEL_PROPERTY) >= started or monitor.abortRequested()
+
+
+class CancelledScrape(Exception):
+    pass
+
+
+class Scheduler:
+    """
+    Shares the global pool between providers. Tasks queue per host and are only handed to the pool
+    while the host is below its cap, so one slow site cannot hold every worker.
+    """
+    def __init__(self, executor, max_per_host=MAX_PER_HOST):
+        self._executor = executor
+        self._max_per_host = max_per_host
+        self._lock = Lock()
+        self._active = {}
+        self._pending = {}
+
+    def submit(self, host, started, func, *args):
+        future = Future()
+        task = (future, started, func, args)
+        with self._lock:
+            if self._active.get(host, 0) >= self._max_per_host:
+                self._pending.setdefault(host, deque()).append(task)
+                return future
+            self._active[host] = self._active.get(host, 0) + 1
+        self._dispatch(host, task)
+        return future
+
+    def _dispatch(self, host, task):
+        try:
+            self._executor.submit(self._run, host, *task)
+        except RuntimeError:  # Pool shut down with Kodi
+            task[0].cancel()
+            self._release(host)
+
+    def _run(self, host, future, started, func, args):
+        try:
+            if not future.set_running_or_notify_cancel():
+                return
+            if is_cancelled(started):
+                future.set_exception(CancelledScrape())
+                return
+            _worker.active = True
+            try:
+                future.set_result(func(*args))
+            except BaseException as exc:
+                future.set_exception(exc)
+            finally:
+                _worker.active = False
+        finally:
+            self._release(host)
+
+    def _release(self, host):
+        with self._lock:
+            queue = self._pending.get(host)
+            while queue:
+                task = queue.popleft()
+                if task[0].cancelled():
+                    continue
+                break
+            else:
+                self._pending.pop(host, None)
+                self._active[host] -= 1
+                if not self._active[host]:
+                    del self._active[host]
+                return
+        self._dispatch(host, task)
+
+
+scheduler = Scheduler(tp)
 
 
-def run_and_wait(func, iterable):
-    futures = []
-    for item in iterable:
-        # Submit each task to the thread pool
-        future = tp.submit(func, item)
-        futures.append(future)
-    # Wait for all tasks to complete
-    wait(futures)
+def run_and_wait(func, iterable, host=None, timeout=None):
+    """
+    Runs func for each item on the shared pool and blocks until done, deadline or host cancel.
+    Host defaults to the domain of each item when items are urls. Unfinished work is cancelled on return.
+    """
+    started = time()
+    if getattr(_worker, 'active', False):  # Already on a pool thread, waiting here could starve the pool
+        for item in iterable:
+            if is_cancelled(started):
+                break
+            func(item)
+        return
+    deadline = get_deadline(started, timeout)
+    pending = [scheduler.submit(get_host(host or item), started, func, item) for item in iterable]
+    while pending:
+        remaining = deadline - time() if deadline else 1.0
+        if remaining <= 0:
+            break
+        pending = wait(pending, timeout=min(remaining, 1.0))[1]
+        if is_cancelled(started):
+            break
+    for future in pending:
+        future.cancel()
 
 
 def run_and_wait_multi(func, iterable):
@@ -9,6 +9,21 @@ from collections import OrderedDict
 
 # ------------------------------------------------------------------------------- #
 
+_user_agents = None  # browsers.json parsed once per process, it is over 1MB
+
+
+def load_user_agents():
+    global _user_agents
+    if _user_agents is None:
+        with open(os.path.join(os.path.dirname(__file__), 'browsers.json'), 'r') as fp:
+            _user_agents = json.load(
+                fp,
+                object_pairs_hook=OrderedDict
+            )
+    return _user_agents
+
+# ------------------------------------------------------------------------------- #
+
 
 class User_Agent():
 
@@ -41,7 +56,7 @@ class User_Agent():
             for platform in user_agents['user_agents'][device_type]:
                 for browser in user_agents['user_agents'][device_type][platform]:
                     if re.search(re.escape(self.custom), ' '.join(user_agents['user_agents'][device_type][platform][browser])):
-                        self.headers = user_agents['headers'][browser]
+                        self.headers = OrderedDict(user_agents['headers'][browser])
                         self.headers['User-Agent'] = self.custom
                         self.cipherSuite = user_agents['cipherSuite'][browser]
                         return True
@@ -71,11 +86,7 @@ class User_Agent():
             sys.tracebacklimit = 0
             raise RuntimeError("Sorry you can't have mobile and desktop disabled at the same time.")
 
-        with open(os.path.join(os.path.dirname(__file__), 'browsers.json'), 'r') as fp:
-            user_agents = json.load(
-                fp,
-                object_pairs_hook=OrderedDict
-            )
+        user_agents = load_user_agents()
 
         if self.custom:
             if not self.tryMatchCustom(user_agents):
@@ -114,7 +125,7 @@ class User_Agent():
                 raise RuntimeError(f'Sorry "{self.browser}" browser was not found with a platform of "{self.platform}".')
 
             self.cipherSuite = user_agents['cipherSuite'][self.browser]
-            self.headers = user_agents['headers'][self.browser]
+            self.headers = OrderedDict(user_agents['headers'][self.browser])
 
             self.headers['User-Agent'] = random.SystemRandom().choice(filteredAgents[self.browser])
 
@@ -6,20 +6,189 @@
 import gzip
 from random import choice, randrange
 import re
-from sys import version_info
-from time import sleep
+from threading import Lock
+from time import sleep, time
 from cocoscrapers.modules import cache
 from cocoscrapers.modules import dom_parser
+from cocoscrapers.modules import mirrors
 from http import cookiejar
+from http.client import HTTPConnection, HTTPSConnection, HTTPResponse, HTTPException
 from html import unescape
 from io import BytesIO
 import urllib.request as urllib2
 from urllib.parse import quote_plus, urlencode, parse_qs, urlparse, urljoin
 from urllib.response import addinfourl
-from urllib.error import HTTPError
+from urllib.error import HTTPError, URLError
 
 
-def request(url, close=True, redirect=True, error=False, proxy=None, post=None, headers=None, mobile=False, XHR=False, limit=None,
+class _PooledHTTPResponse(HTTPResponse):
+	"""HTTPResponse that hands its connection back to the pool once the body has been fully read."""
+	pool_release = None
+	pool_complete = False
+
+	def _read_and_discard_trailer(self):
+		HTTPResponse._read_and_discard_trailer(self)
+		self.pool_complete = True # end of chunked body
+
+	def _close_conn(self):
+		complete = self.pool_complete or (not self.chunked and self.length == 0)
+		HTTPResponse._close_conn(self)
+		release, self.pool_release = self.pool_release, None
+		if release: release(complete and not self.will_close)
+
+
+class _PooledHTTPConnection(HTTPConnection):
+	response_class = _PooledHTTPResponse
+
+
+class _PooledHTTPSConnection(HTTPSConnection):
+	response_class = _PooledHTTPResponse
+
+
+class ConnectionPool:
+	"""Thread-safe per-host pool of idle keep-alive connections shared by all scraper threads."""
+	max_idle = 4 # idle connections kept per host
+	idle_timeout = 30 # seconds before an idle connection is dropped rather than reused
+
+	def __init__(self):
+		self.lock = Lock()
+		self.idle = {}
+		self.stats = {'requests': 0, 'connections': 0, 'reused': 0, 'stale': 0, 'handshakes': 0, 'handshake_time': 0.0}
+
+	def acquire(self, key):
+		now = time()
+		with self.lock:
+			self.stats['requests'] += 1
+			idle = self.idle.get(key)
+			while idle:
+				conn, released = idle.pop()
+				if conn.sock and now - released < self.idle_timeout:
+					self.stats['reused'] += 1
+					return conn
+				conn.close()
+		return None
+
+	def release(self, key, conn, reusable):
+		if not reusable or not conn.sock: return conn.close()
+		with self.lock:
+			idle = self.idle.setdefault(key, [])
+			if len(idle) >= self.max_idle: return conn.close()
+			idle.append((conn, time()))
+
+	def connect(self, conn, is_https):
+		start = time()
+		conn.connect()
+		with self.lock:
+			self.stats['connections'] += 1
+			if not is_https: return
+			self.stats['handshakes'] += 1 # TCP connect + TLS handshake
+			self.stats['handshake_time'] += time() - start
+
+	def add_stale(self):
+		with self.lock: self.stats['stale'] += 1
+
+	def get_stats(self):
+		with self.lock: return dict(self.stats)
+
+	def clear(self):
+		with self.lock:
+			idle, self.idle = self.idle, {}
+		for conns in idle.values():
+			for conn, released in conns: conn.close()
+
+POOL = ConnectionPool()
+
+def pool_stats():
+	return POOL.get_stats()
+
+
+class _PooledHandlerMixin:
+	def pooled_open(self, http_class, req, is_https, **http_conn_args):
+		if req._tunnel_host: return self.do_open(http_class, req, **http_conn_args) # proxied CONNECT, leave to urllib
+		host = req.host
+		if not host: raise URLError('no host given')
+		key = (is_https, host, id(http_conn_args.get('context')))
+		headers = dict(req.unredirected_hdrs)
+		headers.update(dict((k, v) for k, v in req.headers.items() if k not in headers))
+		headers['Connection'] = 'keep-alive'
+		headers = dict((name.title(), val) for name, val in headers.items())
+		for attempt in (0, 1):
+			conn = POOL.acquire(key) if not attempt else None
+			is_fresh = conn is None
+			try:
+				if is_fresh:
+					conn = http_class(host, timeout=req.timeout, **http_conn_args)
+					POOL.connect(conn, is_https)
+				else:
+					conn.timeout = req.timeout
+					conn.sock.settimeout(req.timeout)
+				conn.request(req.get_method(), req.selector, req.data, headers, encode_chunked=req.has_header('Transfer-encoding'))
+				response = conn.getresponse()
+				break
+			except (OSError, HTTPException) as err:
+				conn.close()
+				if not is_fresh: # server dropped an idle keep-alive connection so retry once on a new one
+					POOL.add_stale()
+					continue
+				raise URLError(err)
+		response.pool_release = lambda reusable: POOL.release(key, conn, reusable)
+		response.url = req.get_full_url()
+		response.msg = response.reason
+		return response
+
+
+class PooledHTTPHandler(_PooledHandlerMixin, urllib2.HTTPHandler):
+	def http_open(self, req):
+		return self.pooled_open(_PooledHTTPConnection, req, False)
+
+
+class PooledHTTPSHandler(_PooledHandlerMixin, urllib2.HTTPSHandler):
+	def __init__(self, context=None):
+		urllib2.HTTPSHandler.__init__(self, context=context or _default_ssl_context())
+
+	def https_open(self, req):
+		return self.pooled_open(_PooledHTTPSConnection, req, True, context=self._context)
+
+
+_ssl_contexts = {}
+
+def _default_ssl_context():
+	# building a context loads the CA store so share one rather than one per connection
+	if 'default' not in _ssl_contexts:
+		import ssl
+		_ssl_contexts['default'] = ssl.create_default_context()
+	return _ssl_contexts['default']
+
+def _unverified_ssl_context():
+	if 'unverified' not in _ssl_contexts:
+		import ssl
+		_ssl_contexts['unverified'] = ssl._create_unverified_context()
+	return _ssl_contexts['unverified']
+
+
+_openers = {}
+_openers_lock = Lock()
+
+def _get_opener(handlers=None, verifySsl=True):
+	"""Return an opener using pooled keep-alive handlers. Openers are local to the caller and never installed globally.
+	Openers without extra handlers (cookies, proxy, redirect) hold no per-request state so are cached and shared."""
+	https_handler = PooledHTTPSHandler(context=None if verifySsl else _unverified_ssl_context())
+	if handlers: return urllib2.build_opener(PooledHTTPHandler(), https_handler, *handlers)
+	with _openers_lock:
+		if verifySsl not in _openers: _openers[verifySsl] = urllib2.build_opener(PooledHTTPHandler(), https_handler)
+		return _openers[verifySsl]
+
+
+def request(url, *args, **kwargs):
+	domain = mirrors.watched_host(url) if url else None
+	if not domain: return _request(url, *args, **kwargs)
+	start = time() ; result = None
+	try:
+		result = _request(url, *args, **kwargs)
+		return result
+	finally: mirrors.record(domain, time() - start, bool(result)) # feeds mirror ranking for providers using mirrors.base_link
+
+def _request(url, close=True, redirect=True, error=False, proxy=None, post=None, headers=None, mobile=False, XHR=False, limit=None,
 					referer=None, cookie=None, compression=True, output='', timeout='30', verifySsl=True, flare=True, ignoreErrors=None, as_bytes=False):
 	try:
 		if not url: return None
@@ -32,44 +201,11 @@ def request(url, close=True, redirect=True, error=False, proxy=None, post=None,
 
 		handlers = []
 		if proxy is not None:
-			handlers += [urllib2.ProxyHandler({'http':'%s' % (proxy)}), urllib2.HTTPHandler]
-			opener = urllib2.build_opener(*handlers)
-			urllib2.install_opener(opener)
+			handlers += [urllib2.ProxyHandler({'http':'%s' % (proxy)})]
 
 		if output == 'cookie' or output == 'extended' or close is not True:
-			cookies = cookiejar.LWPCookieJar()
-			handlers += [urllib2.HTTPHandler(), urllib2.HTTPSHandler(), urllib2.HTTPCookieProcessor(cookies)]
-			opener = urllib2.build_opener(*handlers)
-			urllib2.install_opener(opener)
-
-		if not verifySsl and version_info >= (2, 7, 12):
-			try:
-				import ssl
-				ssl_context = ssl._create_unverified_context()
-				handlers += [urllib2.HTTPSHandler(context=ssl_context)]
-				opener = urllib2.build_opener(*handlers)
-				urllib2.install_opener(opener)
-			except:
-				from cocoscrapers.modules import log_utils
-				log_utils.error()
-
-		if verifySsl and ((2, 7, 8) < version_info < (2, 7, 12)):
-			try:
-				import ssl
-				try:
-					import _ssl
-					CERT_NONE = _ssl.CERT_NONE
-				except Exception:
-					CERT_NONE = ssl.CERT_NONE
-				ssl_context = ssl.create_default_context()
-				ssl_context.check_hostname = False
-				ssl_context.verify_mode = CERT_NONE
-				handlers += [urllib2.HTTPSHandler(context=ssl_context)]
-				opener = urllib2.build_opener(*handlers)
-				urllib2.install_opener(opener)
-			except:
-				from cocoscrapers.modules import log_utils
-				log_utils.error()
+			cookies = cookiejar.LWPCookieJar() # scoped to this request only
+			handlers += [urllib2.HTTPCookieProcessor(cookies)]
 
 		try: headers.update(headers)
 		except: headers = {}
@@ -98,15 +234,15 @@ def request(url, close=True, redirect=True, error=False, proxy=None, post=None,
 				http_error_301 = http_error_302
 				http_error_303 = http_error_302
 				http_error_307 = http_error_302
-			opener = urllib2.build_opener(NoRedirectHandler())
-			urllib2.install_opener(opener)
+			handlers += [NoRedirectHandler()]
 			try: del headers['Referer']
 			except: pass
 
+		opener = _get_opener(handlers, verifySsl)
 		req = urllib2.Request(url, data=post)
 		_add_request_header(req, headers)
 		try:
-			response = urllib2.urlopen(req, timeout=int(timeout))
+			response = opener.open(req, timeout=int(timeout))
 		except HTTPError as error_response:# if HTTPError, using "as response" will be reset after entire Exception code runs and throws error around line 247 as "local variable 'response' referenced before assignment", re-assign it
 			response = error_response
 			try: ignore = ignoreErrors and (int(response.code) == ignoreErrors or int(response.code) in ignoreErrors)
@@ -149,7 +285,7 @@ def request(url, close=True, redirect=True, error=False, proxy=None, post=None,
 						headers['Cookie'] = cf
 						req = urllib2.Request(url, data=post)
 						_add_request_header(req, headers)
-						response = urllib2.urlopen(req, timeout=int(timeout))
+						response = opener.open(req, timeout=int(timeout))
 					else:
 						if error is False:
 							from cocoscrapers.modules import log_utils
@@ -214,7 +350,7 @@ def request(url, close=True, redirect=True, error=False, proxy=None, post=None,
 			headers['Cookie'] = su
 			req = urllib2.Request(url, data=post)
 			_add_request_header(req, headers)
-			response = urllib2.urlopen(req, timeout=int(timeout))
+			response = opener.open(req, timeout=int(timeout))
 			if limit == '0': result = response.read(224 * 1024)
 			elif limit is not None: result = response.read(int(limit) * 1024)
 			else: result = response.read(5242880)
@@ -257,7 +393,7 @@ def _basic_request(url, headers=None, post=None, method='GET', timeout='30', lim
 		except: headers = {}
 		req = urllib2.Request(url, data=post, method=method)
 		_add_request_header(req, headers)
-		response = urllib2.urlopen(req, timeout=int(timeout))
+		response = _get_opener().open(req, timeout=int(timeout))
 		return _get_result(response, limit, ret_code)
 	except:
 		from cocoscrapers.modules import log_utils
@@ -373,7 +509,7 @@ class cfcookie:
 			req = urllib2.Request(netloc)
 			_add_request_header(req, headers)
 
-			try: response = urllib2.urlopen(req, timeout=int(timeout))
+			try: response = _get_opener().open(req, timeout=int(timeout))
 			except HTTPError as response:
 				result = response.read(5242880)
 				try: encoding = response.headers["Content-Encoding"]
@@ -401,13 +537,11 @@ class cfcookie:
 				sleep(6)
 
 			cookies = cookiejar.LWPCookieJar()
-			handlers = [urllib2.HTTPHandler(), urllib2.HTTPSHandler(), urllib2.HTTPCookieProcessor(cookies)]
-			opener = urllib2.build_opener(*handlers)
-			opener = urllib2.install_opener(opener)
+			opener = _get_opener([urllib2.HTTPCookieProcessor(cookies)])
 			try:
 				req = urllib2.Request(query)
 				_add_request_header(req, headers)
-				response = urllib2.urlopen(req, timeout=int(timeout))
+				response = opener.open(req, timeout=int(timeout))
 			except: pass
 			cookie = '; '.join(['%s=%s' % (i.name, i.value) for i in cookies])
 			if 'cf_clearance' in cookie: self.cookie = cookie
@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+"""
+	CocoScrapers Module
+	Mirror domain health. Latency and failures per domain are kept in cache.db so every scrape shares them,
+	providers ask for their domains ranked fastest first and anything failing is skipped until re-probed.
+"""
+
+from threading import Lock, Thread, Timer, local
+from time import time, perf_counter
+from urllib.parse import urlparse
+from cocoscrapers.modules.cache import get_connection, get_connection_cursor
+
+TTL = 1800 # seconds before a mirror is re-probed in the background
+FAIL_LIMIT = 2 # consecutive failures before a mirror is skipped until its next good probe
+PROBE_TIMEOUT = 5
+EWMA_WEIGHT = 0.3 # weight of newest latency sample
+FLUSH_DELAY = 2 # seconds samples are held in memory so a provider run is written in one transaction
+
+_lock = Lock()
+_probing = set()
+_watched = set() # domains this process has ranked, client.request only records these
+_probe = local()
+_pending = [] # samples waiting for flush, client.request must not wait on cache.db
+_flush_timer = None
+
+
+def _execute(sql, args=(), fetch=False, many=False):
+	dbcon = get_connection()
+	dbcur = get_connection_cursor(dbcon)
+	try:
+		dbcur.execute('''CREATE TABLE IF NOT EXISTS mirror_health (domain TEXT, provider TEXT, latency REAL, failures INTEGER,
+			total_requests INTEGER, total_failures INTEGER, checked INTEGER, UNIQUE(domain));''')
+		if many: dbcur.executemany(sql, args)
+		else: dbcur.execute(sql, args)
+		if fetch: return dbcur.fetchall()
+		dbcur.connection.commit()
+	finally:
+		dbcur.close() ; dbcon.close()
+
+
+def get_health(domains):
+	try:
+		rows = _execute('''SELECT * FROM mirror_health WHERE domain IN (%s)''' % ','.join('?' * len(domains)), tuple(domains), fetch=True)
+	except:
+		from cocoscrapers.modules import log_utils
+		log_utils.error()
+		rows = []
+	return {i['domain']: i for i in rows}
+
+
+def record(domain, latency, ok, provider=''):
+	"""Queues a sample in memory, written by flush() shortly after so scraper threads never block on cache.db"""
+	global _flush_timer
+	with _lock:
+		_pending.append((domain, provider, None if not ok else latency, 0 if ok else 1, 0 if ok else 1, int(time()), 1 - EWMA_WEIGHT, EWMA_WEIGHT))
+		if _flush_timer: return
+		_flush_timer = Timer(FLUSH_DELAY, flush)
+		_flush_timer.start()
+
+
+def flush():
+	global _flush_timer
+	with _lock:
+		rows = _pending[:]
+		del _pending[:]
+		if _flush_timer: _flush_timer.cancel()
+		_flush_timer = None
+	if not rows: return
+	try:
+		_execute('''INSERT INTO mirror_health VALUES (?, ?, ?, ?, 1, ?, ?) ON CONFLICT(domain) DO UPDATE SET
+			provider=CASE WHEN excluded.provider != '' THEN excluded.provider ELSE provider END,
+			latency=CASE WHEN excluded.failures THEN latency WHEN latency IS NULL THEN excluded.latency ELSE latency * ? + excluded.latency * ? END,
+			failures=CASE WHEN excluded.failures THEN failures + 1 ELSE 0 END,
+			total_requests=total_requests + 1, total_failures=total_failures + excluded.total_failures, checked=excluded.checked''',
+			rows, many=True)
+	except:
+		from cocoscrapers.modules import log_utils
+		log_utils.error()
+
+
+def watched_host(url):
+	"""Returns the domain of url when it belongs to a ranked mirror and is not a probe, used by client.request"""
+	if not _watched or getattr(_probe, 'active', False): return None
+	try: domain = urlparse(url).netloc
+	except: return None
+	return domain if domain in _watched else None
+
+
+def probe(provider, domains, check=None):
+	"""Times a small request to each domain. check is text a real page must contain so parked domains count as failed."""
+	from cocoscrapers.modules import client
+	_probe.active = True
+	try:
+		for domain in domains:
+			start = perf_counter()
+			try: result = client.request('https://%s' % domain, limit=1, timeout=PROBE_TIMEOUT)
+			except: result = None
+			ok = bool(result) and (not check or check.lower() in result.lower())
+			record(domain, perf_counter() - start, ok, provider)
+	finally:
+		_probe.active = False
+		flush() # already off the scrape path so write now rather than waiting on the timer
+		with _lock: _probing.difference_update(domains)
+
+
+def probe_async(provider, domains, check=None):
+	with _lock:
+		domains = [i for i in domains if i not in _probing]
+		if not domains: return
+		_probing.update(domains)
+	Thread(target=probe, args=(provider, domains, check), daemon=True).start()
+
+
+def ranked(provider, domains, check=None):
+	"""
+	Returns domains healthy fastest first, then unknown in listed order. Failing mirrors are dropped
+	unless every mirror is failing. Stale or unknown domains are re-probed in the background.
+	"""
+	with _lock: _watched.update(domains)
+	health = get_health(domains)
+	now = int(time())
+	stale = [i for i in domains if i not in health or now - health[i]['checked'] > TTL]
+	if stale: probe_async(provider, stale, check)
+	healthy, unknown, failing = [], [], []
+	for domain in domains:
+		row = health.get(domain)
+		if not row or row['latency'] is None and not row['failures']: unknown.append(domain)
+		elif row['failures'] >= FAIL_LIMIT: failing.append(domain)
+		else: healthy.append(domain)
+	healthy.sort(key=lambda i: health[i]['latency'] if health[i]['latency'] is not None else PROBE_TIMEOUT)
+	return (healthy + unknown) or failing
+
+
+def base_link(provider, domains, check=None, scheme='https'):
+	return '%s://%s' % (scheme, ranked(provider, domains, check)[0])
+
+
+def stats():
+	flush()
+	try: rows = _execute('''SELECT * FROM mirror_health ORDER BY provider, latency''', fetch=True)
+	except: rows = []
+	lines = ['%-14s %-24s %8s %5s %6s %6s %s' % ('provider', 'domain', 'ms', 'fails', 'reqs', 'errors', 'checked')]
+	now = int(time())
+	for i in rows:
+		latency = '%8.0f' % (i['latency'] * 1000) if i['latency'] is not None else '%8s' % '-'
+		lines.append('%-14s %-24s %s %5d %6d %6d %ds ago' % (i['provider'], i['domain'], latency, i['failures'], i['total_requests'], i['total_failures'], now - i['checked']))
+	return '\n'.join(lines)
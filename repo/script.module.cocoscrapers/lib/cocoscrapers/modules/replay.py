@@ -0,0 +1,235 @@
+# -*- coding: utf-8 -*-
+"""
+	CocoScrapers Module
+	Offline record/replay of provider http traffic and a parse benchmark over the saved fixtures.
+"""
+
+from hashlib import md5
+from json import dumps as jsdumps, loads as jsloads
+import os.path
+from time import perf_counter
+import tracemalloc
+from cocoscrapers.modules import client, log_utils, mirrors, source_utils
+from cocoscrapers.modules.control import dataPath, existsPath, joinPath, makeDirs
+
+FIXTURE_PATH = joinPath(dataPath, 'replay')
+
+# Search meta run through every provider. Record and benchmark use the same cases so every fixture gets hit.
+CASES = (
+	('movie', {'title': 'Oppenheimer', 'aliases': [], 'year': '2023', 'imdb': 'tt15398776'}),
+	('episode', {'tvshowtitle': 'The Office', 'title': 'Diversity Day', 'aliases': [{'title': 'The Office US', 'country': 'us'}],
+				'year': '2005', 'imdb': 'tt0386676', 'season': '1', 'episode': '2'}),
+	('season', {'tvshowtitle': 'The Office', 'aliases': [{'title': 'The Office US', 'country': 'us'}],
+				'year': '2005', 'imdb': 'tt0386676', 'season': '1', 'episode': '2'}),
+	('show', {'tvshowtitle': 'The Office', 'aliases': [{'title': 'The Office US', 'country': 'us'}],
+				'year': '2005', 'imdb': 'tt0386676', 'season': '1', 'episode': '2'}))
+TOTAL_SEASONS = 9
+
+
+def fixture_key(method, url, params=None):
+	if params: url = '%s?%s' % (url, jsdumps(params, sort_keys=True))
+	return md5(('%s %s' % (method, url)).encode('utf-8')).hexdigest()
+
+
+class Fixtures:
+	def __init__(self, path=FIXTURE_PATH):
+		self.path = path
+		if not existsPath(path): makeDirs(path)
+
+	def _file(self, key):
+		return os.path.join(self.path, '%s.json' % key)
+
+	def get(self, key):
+		try:
+			with open(self._file(key), 'r', encoding='utf-8') as f: return jsloads(f.read())
+		except (IOError, ValueError): return None
+
+	def set(self, key, value):
+		with open(self._file(key), 'w', encoding='utf-8') as f: f.write(jsdumps(value))
+
+
+class _ReplayResponse:
+	"""Minimal stand in for requests.Response built from a fixture"""
+	def __init__(self, url, status_code, text):
+		self.url = url
+		self.status_code = status_code
+		self.text = text or ''
+		self.content = self.text.encode('utf-8')
+		self.ok = status_code < 400
+		self.headers = {}
+
+	def json(self):
+		return jsloads(self.text)
+
+	def raise_for_status(self):
+		if not self.ok:
+			import requests
+			raise requests.HTTPError('%s replay' % self.status_code, response=self)
+
+
+class Replay:
+	"""
+	Patches client.request, requests.Session.request (requests.get, provider sessions and cfscrape all route through it)
+	and mirror ranking while active. mode="record" passes through to the network and saves each reply, mode="replay" serves
+	saved replies only and returns None/404 for anything missing so no request ever leaves the box.
+	"""
+	def __init__(self, mode='replay', path=FIXTURE_PATH):
+		self.mode = mode
+		self.fixtures = Fixtures(path)
+		self.hits = self.misses = 0
+		self._saved = []
+
+	def __enter__(self):
+		import requests
+		self._patch(client, 'request', self._client_request(client.request))
+		self._patch(requests.Session, 'request', self._session_request(requests.Session.request))
+		self._patch(mirrors, 'ranked', lambda provider, domains, check=None: list(domains)) # listed order so fixture urls stay stable
+		if self.mode == 'replay': self._patch(mirrors, 'record', lambda *args, **kwargs: None) # keep replayed misses out of mirror health
+		return self
+
+	def __exit__(self, *args):
+		for obj, name, func in reversed(self._saved): setattr(obj, name, func)
+		self._saved = []
+
+	def _patch(self, obj, name, func):
+		self._saved.append((obj, name, getattr(obj, name)))
+		setattr(obj, name, func)
+
+	def _client_request(self, request):
+		def wrapper(url, *args, **kwargs):
+			output = kwargs.get('output', '')
+			key = fixture_key('client:%s' % output, url, kwargs.get('post'))
+			if self.mode == 'record':
+				result = request(url, *args, **kwargs)
+				if output == 'extended' and result: value = [result[0], result[1], dict(result[2] or {})]
+				elif isinstance(result, bytes): value = result.decode('utf-8', errors='replace')
+				else: value = result
+				self.fixtures.set(key, {'url': url, 'output': output, 'value': value})
+				return result
+			fixture = self.fixtures.get(key)
+			if not fixture:
+				self.misses += 1
+				return None
+			self.hits += 1
+			value = fixture['value']
+			if output == 'extended' and value: return (value[0], value[1], value[2], {}, '')
+			return value
+		return wrapper
+
+	def _session_request(self, request):
+		def wrapper(session, method, url, *args, **kwargs):
+			key = fixture_key('session:%s' % method.upper(), url, kwargs.get('params'))
+			if self.mode == 'record':
+				response = request(session, method, url, *args, **kwargs)
+				self.fixtures.set(key, {'url': url, 'status_code': response.status_code, 'text': response.text})
+				return response
+			fixture = self.fixtures.get(key)
+			if not fixture:
+				self.misses += 1
+				return _ReplayResponse(url, 404, '')
+			self.hits += 1
+			return _ReplayResponse(url, fixture['status_code'], fixture['text'])
+		return wrapper
+
+
+class _RowCounter:
+	"""Counts release rows each provider pushes through TitleMatcher"""
+	names = ('check_title', 'filter_season_pack', 'filter_show_pack')
+
+	def __init__(self):
+		self.count = 0
+		self._saved = []
+
+	def __enter__(self):
+		for name in self.names:
+			func = getattr(source_utils.TitleMatcher, name)
+			self._saved.append((name, func))
+			setattr(source_utils.TitleMatcher, name, self._wrap(func))
+		return self
+
+	def __exit__(self, *args):
+		for name, func in self._saved: setattr(source_utils.TitleMatcher, name, func)
+		self._saved = []
+
+	def _wrap(self, func):
+		def wrapper(matcher, release_title):
+			self.count += 1 # GIL makes this close enough across provider threads
+			return func(matcher, release_title)
+		return wrapper
+
+
+def get_providers(names=None):
+	from importlib import import_module
+	from cocoscrapers.sources_cocoscrapers import torrents
+	providers = []
+	for name in sorted(torrents.__all__):
+		if names and name not in names: continue
+		try: providers.append((name, import_module('cocoscrapers.sources_cocoscrapers.torrents.%s' % name).source))
+		except: log_utils.error('replay import failed: %s' % name)
+	return providers
+
+
+def supports(provider, case):
+	if case == 'movie': return getattr(provider, 'hasMovies', True)
+	if case == 'episode': return getattr(provider, 'hasEpisodes', True)
+	return getattr(provider, 'pack_capable', False)
+
+
+def run_case(provider, case, data):
+	source = provider()
+	if case in ('movie', 'episode'): return source.sources(data, []) or []
+	return source.sources_packs(data, [], search_series=case == 'show', total_seasons=TOTAL_SEASONS) or []
+
+
+def record(path=FIXTURE_PATH, names=None):
+	"""Runs every provider against the network once and saves each reply for later replay"""
+	with Replay('record', path):
+		for name, provider in get_providers(names):
+			for case, data in CASES:
+				if not supports(provider, case): continue
+				try: run_case(provider, case, dict(data))
+				except: log_utils.error('replay record failed: %s %s' % (name, case))
+
+
+def benchmark(path=FIXTURE_PATH, names=None, repeat=1):
+	"""
+	Replays saved fixtures through every provider in torrents.__all__.
+	Returns list of dicts with per provider and case parse time, rows matched, results kept and tracemalloc peak.
+	"""
+	report = []
+	with Replay('replay', path) as replay:
+		for name, provider in get_providers(names):
+			for case, data in CASES:
+				if not supports(provider, case): continue
+				timings, rows, kept, peak = [], 0, 0, 0
+				for i in range(repeat):
+					replay.hits = replay.misses = 0
+					with _RowCounter() as counter:
+						tracemalloc.start()
+						start = perf_counter()
+						try: results = run_case(provider, case, dict(data))
+						except:
+							log_utils.error('replay benchmark failed: %s %s' % (name, case))
+							results = []
+						timings.append(perf_counter() - start)
+						peak = max(peak, tracemalloc.get_traced_memory()[1])
+						tracemalloc.stop()
+					rows, kept = counter.count, len(results)
+				report.append({'provider': name, 'case': case, 'seconds': min(timings), 'rows': rows, 'kept': kept,
+							'peak_kb': peak // 1024, 'fixtures': replay.hits, 'missing': replay.misses})
+	return report
+
+
+def format_report(report):
+	lines = ['%-16s %-8s %9s %6s %6s %9s %8s' % ('provider', 'case', 'ms', 'rows', 'kept', 'peak_kb', 'missing')]
+	for i in report:
+		lines.append('%-16s %-8s %9.1f %6d %6d %9d %8d' % (i['provider'], i['case'], i['seconds'] * 1000, i['rows'], i['kept'], i['peak_kb'], i['missing']))
+	return '\n'.join(lines)
+
+
+def run_benchmark(path=FIXTURE_PATH):
+	report = benchmark(path)
+	text = format_report(report)
+	log_utils.log('#STATS - replay benchmark\n%s' % text)
+	with open(os.path.join(path, 'benchmark.json'), 'w', encoding='utf-8') as f: f.write(jsdumps(report, indent=1))
+	return text
@@ -4,6 +4,7 @@
 """
 
 import re
+from functools import cached_property
 from string import printable
 from cocoscrapers.modules import cleantitle
 from cocoscrapers.modules.undesirables import Undesirables
@@ -129,51 +130,7 @@ def aliases_to_array(aliases, filter=None):
 		return []
 
 def check_title(title, aliases, release_title, hdlr, year, years=None): # non pack file title check, single eps and movies
-	if years: # for movies only, scraper to pass None for episodes
-		if not any(value in release_title for value in years): return False
-	else: 
-		if not re.search(r'%s' % hdlr, release_title, re.I): return False
-	aliases = aliases_to_array(aliases)
-	title_list = []
-	title_list_append = title_list.append
-	if aliases:
-		for item in aliases:
-			try:
-				alias = item.replace('&', 'and').replace(year, '')
-				if years: # for movies only, scraper to pass None for episodes
-					for i in years: alias = alias.replace(i, '')
-				if alias in title_list: continue
-				title_list_append(alias)
-			except:
-				from cocoscrapers.modules import log_utils
-				log_utils.error()
-	try:
-		
-		title = title.replace('&', 'and').replace(year, '') # year only in meta title if an addon custom query added it
-		if title not in title_list: title_list_append(title)
-		release_title = re.sub(r'([(])(?=((19|20)[0-9]{2})).*?([)])', '\\2', release_title) #remove parenthesis only if surrounding a 4 digit date
-		t = re.split(r'%s' % hdlr, release_title, 1, re.I)[0].replace(year, '').replace('&', 'and')
-		if years:
-			for i in years: t = t.split(i)[0]
-		t = re.split(r'2160p|216op|4k|1080p|1o8op|108op|1o80p|720p|72op|480p|48op', t, 1, re.I)[0]
-		cleantitle_t = cleantitle.get(t)
-		if all(cleantitle.get(i) != cleantitle_t for i in title_list): return False
-
-# filter to remove episode ranges that should be picked up in "filter_season_pack()" ex. "s01e01-08"
-		if hdlr != year: # equal for movies but not for shows
-			range_regex = (
-					r's\d{1,3}e\d{1,3}[-.]e\d{1,3}',
-					r's\d{1,3}e\d{1,3}[-.]\d{1,3}(?!p|bit|gb)(?!\d{1,3})',
-					r's\d{1,3}[-.]e\d{1,3}[-.]e\d{1,3}',
-					r'season[.-]?\d{1,3}[.-]?ep[.-]?\d{1,3}[-.]ep[.-]?\d{1,3}',
-					r'season[.-]?\d{1,3}[.-]?episode[.-]?\d{1,3}[-.]episode[.-]?\d{1,3}') # may need to add "to", "thru"
-			for regex in range_regex:
-				if bool(re.search(regex, release_title, re.I)): return False
-		return True
-	except:
-		from cocoscrapers.modules import log_utils
-		log_utils.error()
-		return False
+	return TitleMatcher(title, aliases, year, hdlr=hdlr, years=years).check_title(release_title)
 
 def remove_lang(release_info, check_foreign_audio):
 	if not release_info: return False
@@ -194,23 +151,134 @@ def remove_undesirables(release_info, undesirables):
 	if any(value in release_info for value in undesirables): return True
 
 def filter_season_pack(show_title, aliases, year, season, release_title):
-	aliases = aliases_to_array(aliases)
-	title_list = []
-	title_list_append = title_list.append
-	if aliases:
-		for item in aliases:
+	return TitleMatcher(show_title, aliases, year, season=season).filter_season_pack(release_title)
+
+def filter_show_pack(show_title, aliases, imdb, year, season, release_title, total_seasons):
+	return TitleMatcher(show_title, aliases, year, season=season, total_seasons=total_seasons).filter_show_pack(release_title)
+
+
+# patterns below do not depend on the search so are compiled once on import
+_DATE_PARENS_RE = re.compile(r'([(])(?=((19|20)[0-9]{2})).*?([)])') # parenthesis only if surrounding a 4 digit date
+_RES_SPLIT_RE = re.compile(r'2160p|216op|4k|1080p|1o8op|108op|1o80p|720p|72op|480p|48op', re.I)
+
+# episode ranges that should be picked up in "filter_season_pack()" ex. "s01e01-08"
+_TITLE_EP_RANGE_RE = tuple(re.compile(i, re.I) for i in (
+		r's\d{1,3}e\d{1,3}[-.]e\d{1,3}',
+		r's\d{1,3}e\d{1,3}[-.]\d{1,3}(?!p|bit|gb)(?!\d{1,3})',
+		r's\d{1,3}[-.]e\d{1,3}[-.]e\d{1,3}',
+		r'season[.-]?\d{1,3}[.-]?ep[.-]?\d{1,3}[-.]ep[.-]?\d{1,3}',
+		r'season[.-]?\d{1,3}[.-]?episode[.-]?\d{1,3}[-.]episode[.-]?\d{1,3}')) # may need to add "to", "thru"
+
+# single episodes ONLY (returned in single ep scrape), keep episode ranges as season packs
+_SEASON_EP_SINGLE_RE = tuple(re.compile(i) for i in (
+		r's\d{1,3}e\d{1,3}[-.](?!\d{2,3}[-.])(?!e\d{1,3})(?!\d{2}gb)',
+		r'season[.-]?\d{1,3}[.-]?ep[.-]?\d{1,3}[-.](?!\d{2,3}[-.])(?!e\d{1,3})(?!\d{2}gb)',
+		r'season[.-]?\d{1,3}[.-]?episode[.-]?\d{1,3}[-.](?!\d{2,3}[-.])(?!e\d{1,3})(?!\d{2}gb)'))
+
+# identify episode ranges
+_SEASON_EP_RANGE_RE = tuple(re.compile(i) for i in (
+		r's\d{1,3}e(\d{1,3})[-.]e(\d{1,3})',
+		r's\d{1,3}e(\d{1,3})[-.](\d{1,3})(?!p|bit|gb)(?!\d{1,3})',
+		r's\d{1,3}[-.]e(\d{1,3})[-.]e(\d{1,3})',
+		r'season[.-]?\d{1,3}[.-]?ep[.-]?(\d{1,3})[-.]ep[.-]?(\d{1,3})',
+		r'season[.-]?\d{1,3}[.-]?episode[.-]?(\d{1,3})[-.]episode[.-]?(\d{1,3})')) # may need to add "to", "thru"
+
+_SHOW_PACK_EXCLUDE_RE = tuple(re.compile(i) for i in (
+# single episodes(returned in single ep scrape)
+		r's\d{1,3}e\d{1,3}',
+		r's[0-3]{1}[0-9]{1}[.-]e\d{1,2}',
+		r's\d{1,3}[.-]\d{1,3}e\d{1,3}',
+		r'season[.-]?\d{1,3}[.-]?ep[.-]?\d{1,3}',
+		r'season[.-]?\d{1,3}[.-]?episode[.-]?\d{1,3}',
+# season ranges that do not begin at 1
+		r'(?:season|seasons|s)[.-]?(?:0?[2-9]{1}|[1-3]{1}[0-9]{1})(?:[.-]?to[.-]?|[.-]?thru[.-]?|[.-])(?:season|seasons|s|)[.-]?(?:0?[3-9]{1}(?!\d{2}p)|[1-3]{1}[0-9]{1}(?!\d{2}p))', # seasons.5-6, seasons5.to.6, seasons.5.thru.6, season.2-9.s02-s09.1080p
+# single seasons - returned in seasonPack scrape
+		r'season[.-]?([1-9]{1})[.-]0{1}\1[.-]?complete', # "season.1.01.complete" when 2nd number matches the fiirst group with leading 0
+		r'season[.-]?([2-9]{1})[.-](?:[0-9]+)[.-]?complete', # "season.9.10.complete" when first number is >1 followed by 2 digit number
+		r'season[.-]?\d{1,2}[.-]s\d{1,2}', # season.02.s02
+		r'season[.-]?\d{1,2}[.-]complete', # season.02.complete
+		r'season[.-]?\d{1,2}[.-]\d{3,4}p{0,1}', # "season.02.1080p" and no seperator "season02.1080p"
+		r'season[.-]?\d{1,2}[.-](?!thru|to|\d{1,2}[.-])', # "season.02." or "season.1" not followed by "to", "thru", or another single or 2 digit number then a dot(which would be a range)
+		r'season[.-]?\d{1,2}[.]?$', # end of line ex."season.1", "season.01", "season01" can also have trailing dot or end of line(dash would be a range)
+		r'season[.-]?\d{1,2}[.-](?:19|20)[0-9]{2}', # single season followed by 4 digit year ex."season.1.1971", "season.01.1971", or "season01.1971"
+		r'season[.-]?\d{1,2}[.-]\d{3}[.-]{1,2}(?:19|20)[0-9]{2}', # single season followed by 3 digits then 4 digit year ex."season.1.004.1971" or "season.01.004.1971" (comic book format)
+		r'(?<!thru)(?<!to)(?<!\d{2})[.-]s\d{2}[.-]complete', # ".s01.complete" not preceded by "thru", "to", or 2 digit number
+		r'(?<!thru)(?<!to)(?<!s\d{2})[.-]s\d{2}(?![.-]thru)(?![.-]to)(?![.-]s\d{2})(?![.-]\d{2}[.-])', # .s02. not preceded by "thru", "to", or "s01". Not followed by ".thru", ".to", ".s02", "-s02", ".02.", or "-02."
+# spelled out single seasons
+		'|'.join(
+			[r'complete[.-]%s[.-]season' % x for x in season_ordinal_list] +
+			[r'complete[.-]%s[.-]season' % x for x in season_ordinal2_list] +
+			[r'season[.-]%s' % x for x in season_list])))
+
+_SHOW_PACK_SPLIT = ('.all.seasons', 'seasons', 'season', 'the.complete', 'complete', 'all.torrent', 'total.series', 'tv.series', 'series', 'edited', 's1', 's01') #s1 or s01 used so show pack only kept that begin with 1
+
+
+class TitleMatcher:
+	"""
+	Title and pack matching for a single search. Build once per scrape from the search meta then call per release row,
+	the cleaned alias set, compiled regexes and season range strings are only worked out on creation.
+	"""
+	def __init__(self, title, aliases, year, hdlr=None, years=None, season=None, total_seasons=None):
+		self.title = title
+		self.year = year
+		self.hdlr = hdlr
+		self.years = years
+		self.season = season
+		self.total_seasons = total_seasons
+		self.aliases = aliases_to_array(aliases)
+
+	@cached_property
+	def title_keys(self):
+		return self._clean_keys(self.title, self.aliases, self.year, self.years, pack=False)
+
+	@cached_property
+	def pack_keys(self):
+		return self._clean_keys(self.title, self.aliases, self.year, None, pack=True)
+
+	@cached_property
+	def hdlr_re(self):
+		return re.compile(r'%s' % self.hdlr, re.I)
+
+	@cached_property
+	def show_ranges(self):
+		return self._show_pack_ranges(self.total_seasons)
+
+	@cached_property
+	def show_split(self):
+		return _SHOW_PACK_SPLIT + (self.year,)
+
+	@staticmethod
+	def _clean_keys(title, aliases, year, years, pack):
+		title_list = []
+		title_list_append = title_list.append
+		for item in aliases or ():
 			try:
-				alias = item.replace('!', '').replace('(', '').replace(')', '').replace('&', 'and').replace(year, '')
+				if pack: alias = item.replace('!', '').replace('(', '').replace(')', '').replace('&', 'and').replace(year, '')
+				else: alias = item.replace('&', 'and').replace(year, '')
+				if years: # for movies only, scraper to pass None for episodes
+					for i in years: alias = alias.replace(i, '')
 				if alias in title_list: continue
 				title_list_append(alias)
 			except:
 				from cocoscrapers.modules import log_utils
 				log_utils.error()
-	try:
-		# show_title = show_title.replace('!', '').replace('(', '').replace(')', '').replace('&', 'and')
-		show_title = show_title.replace('!', '').replace('(', '').replace(')', '').replace('&', 'and').replace(year, '') # year only in meta title if an addon custom query added it
-		if show_title not in title_list: title_list_append(show_title)
-
+		try:
+			# year only in meta title if an addon custom query added it
+			if pack: title = title.replace('!', '').replace('(', '').replace(')', '').replace('&', 'and').replace(year, '')
+			else: title = title.replace('&', 'and').replace(year, '')
+			if title not in title_list: title_list_append(title)
+		except:
+			from cocoscrapers.modules import log_utils
+			log_utils.error()
+			return frozenset() # nothing can match, same as failing every row
+		return frozenset(cleantitle.get(i) for i in title_list)
+
+	@cached_property
+	def season_pack(self):
+		"""
+		Returns (split_list, string_list, range_regexes) for the search season
+		"""
+		season, year = self.season, self.year
 		season_fill = season.zfill(2)
 		season_check = '.s%s.' % season
 		season_fill_check = '.s%s.' % season_fill
@@ -221,301 +289,111 @@ def filter_season_pack(show_title, aliases, year, season, release_title):
 		season_full_fill_check_ns = '.season%s.' % season_fill
 		split_list = (season_check, season_fill_check, season_fill_checke, '.' + season + '.season', 'total.season', 'season', 'the.complete', 'complete', year)
 		string_list = (season_check, season_fill_check, season_fill_checke, season_full_check, season_full_check_ns, season_full_fill_check, season_full_fill_check_ns)
+# season ranges - returned in showPack scrape, plus non conforming season and specific crap
+		range_regex = tuple(re.compile(i) for i in (
+			season_check.rstrip('.') + r'[.-]s([2-9]{1}|[1-3]{1}[0-9]{1})(?:[.-]|$)', # ex. ".s1-s9.", .s1-s39.
+			season_fill_check.rstrip('.') + r'[.-]s\d{2}(?:[.-]|$)', # ".s01-s09.", .s01-s39.
+			season_fill_check.rstrip('.') + r'[.-]\d{2}(?:[.-]|$)', # ".s01.09."
+			r'\Ws\d{2}\W%s' % season_fill_check.lstrip('.'), # may need more reverse ranges
+			season_full_check.rstrip('.') + r'[.-]to[.-]([2-9]{1}|[1-3]{1}[0-9]{1})(?:[.-]|$)', # ".season.1.to.9.", ".season.1.to.39"
+			season_full_check.rstrip('.') + r'[.-]season[.-]([2-9]{1}|[1-3]{1}[0-9]{1})(?:[.-]|$)', # ".season.1.season.9.", ".season.1.season.39"
+			season_full_check.rstrip('.') + r'[.-]([2-9]{1}|[1-3]{1}[0-9]{1})(?:[.-]|$)', # "season.1.9.", "season.1.39.
+			season_full_check.rstrip('.') + r'[.-]\d{1}[.-]\d{1,2}(?:[.-]|$)', # "season.1.9.09."
+			season_full_check.rstrip('.') + r'[.-]\d{3}[.-](?:19|20)[0-9]{2}(?:[.-]|$)', # single season followed by 3 digit followed by 4 digit year ex."season.1.004.1971"
+			season_full_fill_check.rstrip('.') + r'[.-]\d{3}[.-]\d{3}(?:[.-]|$)', # 2 digit season followed by 3 digit dash range ex."season.10.001-025."
+			season_full_fill_check.rstrip('.') + r'[.-]season[.-]\d{2}(?:[.-]|$)')) # 2 digit season followed by 2 digit season range ex."season.01-season.09."
+		return split_list, string_list, range_regex
+
+	@staticmethod
+	def _show_pack_ranges(total_seasons):
+		"""
+		Returns ordered tuple of (match_dotted_title, use_last_match, ((range_string, last_season), ...)) groups.
+		Order matches the original filter chain, first group with any hit decides last_season.
+		"""
+		seasons = range(2, int(total_seasons) + 1)
+# range type ex "1.2.3.4" or "1.2.3.and.4" (dots or dashes)
+		dot_season_ranges = []
+		all_seasons = '1'
+		for i in seasons:
+			dot_season_ranges.append((all_seasons + '.and.%s' % i, i))
+			all_seasons += '.%s' % i
+			dot_season_ranges.append((all_seasons, i))
+		groups = [(True, True, tuple(dot_season_ranges))]
+# "1.to.9", "01.to.09", "s1.to.s9", "s01.to.s09" plus their "thru" (dots or dashes), "-" and "~" forms
+		for start_season, fmt in (('1', '%s'), ('01', '%02d'), ('s1', 's%s'), ('s01', 's%02d')):
+			to_season_ranges = tuple((start_season + '.to.' + fmt % i, i) for i in seasons)
+			groups.append((True, False, to_season_ranges))
+			groups.append((True, False, tuple((r.replace('to', 'thru'), i) for r, i in to_season_ranges)))
+			groups.append((False, False, tuple((r.replace('.to.', '-'), i) for r, i in to_season_ranges)))
+			groups.append((False, False, tuple((r.replace('.to.', '~'), i) for r, i in to_season_ranges)))
+# "s01.s09" 2 digit range filtering (dots)
+		groups.append((False, False, tuple((r.replace('.to.', '.'), i) for r, i in to_season_ranges)))
+		return tuple(groups)
+
+	def check_title(self, release_title): # non pack file title check, single eps and movies
+		years = self.years
+		if years: # for movies only, scraper to pass None for episodes
+			if not any(value in release_title for value in years): return False
+		else:
+			if not self.hdlr_re.search(release_title): return False
+		try:
+			release_title = _DATE_PARENS_RE.sub('\\2', release_title)
+			t = self.hdlr_re.split(release_title, 1)[0].replace(self.year, '').replace('&', 'and')
+			if years:
+				for i in years: t = t.split(i)[0]
+			t = _RES_SPLIT_RE.split(t, 1)[0]
+			if cleantitle.get(t) not in self.title_keys: return False
+			if self.hdlr != self.year: # equal for movies but not for shows
+				for regex in _TITLE_EP_RANGE_RE:
+					if regex.search(release_title): return False
+			return True
+		except:
+			from cocoscrapers.modules import log_utils
+			log_utils.error()
+			return False
 
-		release_title = release_title_format(release_title)
-		t = release_title.replace('-', '.')
-		for i in split_list: t = t.split(i)[0]
-		cleantitle_t = cleantitle.get(t)
-		if all(cleantitle.get(x) != cleantitle_t for x in title_list): return False, 0, 0
-
-# remove single episodes ONLY (returned in single ep scrape), keep episode ranges as season packs
-		episode_regex = (
-				r's\d{1,3}e\d{1,3}[-.](?!\d{2,3}[-.])(?!e\d{1,3})(?!\d{2}gb)',
-				r'season[.-]?\d{1,3}[.-]?ep[.-]?\d{1,3}[-.](?!\d{2,3}[-.])(?!e\d{1,3})(?!\d{2}gb)',
-				r'season[.-]?\d{1,3}[.-]?episode[.-]?\d{1,3}[-.](?!\d{2,3}[-.])(?!e\d{1,3})(?!\d{2}gb)')
-		for item in episode_regex:
-			if bool(re.search(item, release_title)): return False, 0, 0
-
-# return and identify episode ranges
-		range_regex = (
-				r's\d{1,3}e(\d{1,3})[-.]e(\d{1,3})',
-				r's\d{1,3}e(\d{1,3})[-.](\d{1,3})(?!p|bit|gb)(?!\d{1,3})',
-				r's\d{1,3}[-.]e(\d{1,3})[-.]e(\d{1,3})',
-				r'season[.-]?\d{1,3}[.-]?ep[.-]?(\d{1,3})[-.]ep[.-]?(\d{1,3})',
-				r'season[.-]?\d{1,3}[.-]?episode[.-]?(\d{1,3})[-.]episode[.-]?(\d{1,3})') # may need to add "to", "thru"
-		for regex in range_regex:
-			match = re.search(regex, release_title)
-			if match:
-				# from cocoscrapers.modules import log_utils
-				# log_utils.log('pack episode range found -- > release_title=%s' % release_title)
-				episode_start = int(match.group(1))
-				episode_end = int(match.group(2))
-				return True, episode_start, episode_end
-
-# remove season ranges - returned in showPack scrape, plus non conforming season and specific crap
-		rt = release_title.replace('-', '.')
-		if any(i in rt for i in string_list):
-			for item in (
-				season_check.rstrip('.') + r'[.-]s([2-9]{1}|[1-3]{1}[0-9]{1})(?:[.-]|$)', # ex. ".s1-s9.", .s1-s39.
-				season_fill_check.rstrip('.') + r'[.-]s\d{2}(?:[.-]|$)', # ".s01-s09.", .s01-s39.
-				season_fill_check.rstrip('.') + r'[.-]\d{2}(?:[.-]|$)', # ".s01.09."
-				r'\Ws\d{2}\W%s' % season_fill_check.lstrip('.'), # may need more reverse ranges
-				season_full_check.rstrip('.') + r'[.-]to[.-]([2-9]{1}|[1-3]{1}[0-9]{1})(?:[.-]|$)', # ".season.1.to.9.", ".season.1.to.39"
-				season_full_check.rstrip('.') + r'[.-]season[.-]([2-9]{1}|[1-3]{1}[0-9]{1})(?:[.-]|$)', # ".season.1.season.9.", ".season.1.season.39"
-				season_full_check.rstrip('.') + r'[.-]([2-9]{1}|[1-3]{1}[0-9]{1})(?:[.-]|$)', # "season.1.9.", "season.1.39.
-				season_full_check.rstrip('.') + r'[.-]\d{1}[.-]\d{1,2}(?:[.-]|$)', # "season.1.9.09."
-				season_full_check.rstrip('.') + r'[.-]\d{3}[.-](?:19|20)[0-9]{2}(?:[.-]|$)', # single season followed by 3 digit followed by 4 digit year ex."season.1.004.1971"
-				season_full_fill_check.rstrip('.') + r'[.-]\d{3}[.-]\d{3}(?:[.-]|$)', # 2 digit season followed by 3 digit dash range ex."season.10.001-025."
-				season_full_fill_check.rstrip('.') + r'[.-]season[.-]\d{2}(?:[.-]|$)' # 2 digit season followed by 2 digit season range ex."season.01-season.09."
-					):
-				if bool(re.search(item, release_title)): return False, 0, 0
-			return True, 0, 0
-		return False, 0, 0
-	except:
-		from cocoscrapers.modules import log_utils
-		log_utils.error()
-		return True
-
-def filter_show_pack(show_title, aliases, imdb, year, season, release_title, total_seasons):
-	aliases = aliases_to_array(aliases)
-	title_list = []
-	title_list_append = title_list.append
-	if aliases:
-		for item in aliases:
-			try:
-				alias = item.replace('!', '').replace('(', '').replace(')', '').replace('&', 'and').replace(year, '')
-				if alias in title_list: continue
-				title_list_append(alias)
-			except:
-				from cocoscrapers.modules import log_utils
-				log_utils.error()
-	try:
-		# show_title = show_title.replace('!', '').replace('(', '').replace(')', '').replace('&', 'and')
-		show_title = show_title.replace('!', '').replace('(', '').replace(')', '').replace('&', 'and').replace(year, '') # year only in meta title if an addon custom query added it
-		if show_title not in title_list: title_list_append(show_title)
-
-		split_list = ('.all.seasons', 'seasons', 'season', 'the.complete', 'complete', 'all.torrent', 'total.series', 'tv.series', 'series', 'edited', 's1', 's01', year)#s1 or s01 used so show pack only kept that begin with 1
-		release_title = release_title_format(release_title)
-		t = release_title.replace('-', '.')
-		for i in split_list: t = t.split(i)[0]
-		cleantitle_t = cleantitle.get(t)
-		if all(cleantitle.get(x) != cleantitle_t for x in title_list): return False, 0
-
-# remove single episodes(returned in single ep scrape)
-		episode_regex = (
-				r's\d{1,3}e\d{1,3}',
-				r's[0-3]{1}[0-9]{1}[.-]e\d{1,2}',
-				r's\d{1,3}[.-]\d{1,3}e\d{1,3}',
-				r'season[.-]?\d{1,3}[.-]?ep[.-]?\d{1,3}',
-				r'season[.-]?\d{1,3}[.-]?episode[.-]?\d{1,3}')
-		for item in episode_regex:
-			if bool(re.search(item, release_title)):
-				return False, 0
-
-# remove season ranges that do not begin at 1
-		season_range_regex = (
-				r'(?:season|seasons|s)[.-]?(?:0?[2-9]{1}|[1-3]{1}[0-9]{1})(?:[.-]?to[.-]?|[.-]?thru[.-]?|[.-])(?:season|seasons|s|)[.-]?(?:0?[3-9]{1}(?!\d{2}p)|[1-3]{1}[0-9]{1}(?!\d{2}p))',) # seasons.5-6, seasons5.to.6, seasons.5.thru.6, season.2-9.s02-s09.1080p
-		for item in season_range_regex:
-			if bool(re.search(item, release_title)):
-				return False, 0
-
-# remove single seasons - returned in seasonPack scrape
-		season_regex = (
-				r'season[.-]?([1-9]{1})[.-]0{1}\1[.-]?complete', # "season.1.01.complete" when 2nd number matches the fiirst group with leading 0
-				r'season[.-]?([2-9]{1})[.-](?:[0-9]+)[.-]?complete', # "season.9.10.complete" when first number is >1 followed by 2 digit number
-				r'season[.-]?\d{1,2}[.-]s\d{1,2}', # season.02.s02
-				r'season[.-]?\d{1,2}[.-]complete', # season.02.complete
-				r'season[.-]?\d{1,2}[.-]\d{3,4}p{0,1}', # "season.02.1080p" and no seperator "season02.1080p"
-				r'season[.-]?\d{1,2}[.-](?!thru|to|\d{1,2}[.-])', # "season.02." or "season.1" not followed by "to", "thru", or another single or 2 digit number then a dot(which would be a range)
-				r'season[.-]?\d{1,2}[.]?$', # end of line ex."season.1", "season.01", "season01" can also have trailing dot or end of line(dash would be a range)
-				r'season[.-]?\d{1,2}[.-](?:19|20)[0-9]{2}', # single season followed by 4 digit year ex."season.1.1971", "season.01.1971", or "season01.1971"
-				r'season[.-]?\d{1,2}[.-]\d{3}[.-]{1,2}(?:19|20)[0-9]{2}', # single season followed by 3 digits then 4 digit year ex."season.1.004.1971" or "season.01.004.1971" (comic book format)
-				r'(?<!thru)(?<!to)(?<!\d{2})[.-]s\d{2}[.-]complete', # ".s01.complete" not preceded by "thru", "to", or 2 digit number
-				r'(?<!thru)(?<!to)(?<!s\d{2})[.-]s\d{2}(?![.-]thru)(?![.-]to)(?![.-]s\d{2})(?![.-]\d{2}[.-])' # .s02. not preceded by "thru", "to", or "s01". Not followed by ".thru", ".to", ".s02", "-s02", ".02.", or "-02."
-				)
-		for item in season_regex:
-			if bool(re.search(item, release_title)):
-				return False, 0
-
-
-# remove spelled out single seasons
-		season_regex = ()
-		season_regex += tuple([r'complete[.-]%s[.-]season' % x for x in season_ordinal_list])
-		season_regex += tuple([r'complete[.-]%s[.-]season' % x for x in season_ordinal2_list])
-		season_regex += tuple([r'season[.-]%s' % x for x in season_list]) 
-		for item in season_regex:
-			if bool(re.search(item, release_title)):
-				return False, 0
-
+	def filter_season_pack(self, release_title):
+		try:
+			split_list, string_list, range_regex = self.season_pack
+			release_title = release_title_format(release_title)
+			t = release_title.replace('-', '.')
+			for i in split_list: t = t.split(i)[0]
+			if cleantitle.get(t) not in self.pack_keys: return False, 0, 0
+			for regex in _SEASON_EP_SINGLE_RE:
+				if regex.search(release_title): return False, 0, 0
+			for regex in _SEASON_EP_RANGE_RE:
+				match = regex.search(release_title)
+				if match: return True, int(match.group(1)), int(match.group(2))
+			rt = release_title.replace('-', '.')
+			if any(i in rt for i in string_list):
+				for regex in range_regex:
+					if regex.search(release_title): return False, 0, 0
+				return True, 0, 0
+			return False, 0, 0
+		except:
+			from cocoscrapers.modules import log_utils
+			log_utils.error()
+			return True
 
+	def filter_show_pack(self, release_title):
+		try:
+			release_title = release_title_format(release_title)
+			t = release_title.replace('-', '.')
+			for i in self.show_split: t = t.split(i)[0]
+			if cleantitle.get(t) not in self.pack_keys: return False, 0
+			for regex in _SHOW_PACK_EXCLUDE_RE:
+				if regex.search(release_title): return False, 0
 # from here down we don't filter out, we set and pass "last_season" it covers for the range and addon can filter it so the db will have full valid showPacks.
-# set last_season for range type ex "1.2.3.4" or "1.2.3.and.4" (dots or dashes)
-		dot_release_title = release_title.replace('-', '.')
-		dot_season_ranges = []
-		all_seasons = '1'
-		season_count = 2
-		while season_count <= int(total_seasons):
-			dot_season_ranges.append(all_seasons + '.and.%s' % str(season_count))
-			all_seasons += '.%s' % str(season_count)
-			dot_season_ranges.append(all_seasons)
-			season_count += 1
-		if any(i in dot_release_title for i in dot_season_ranges):
-			keys = [i for i in dot_season_ranges if i in dot_release_title]
-			last_season = int(keys[-1].split('.')[-1])
-			return True, last_season
-
-
-
-# "1.to.9" type range filter (dots or dashes)
-		to_season_ranges = []
-		start_season = '1'
-		season_count = 2
-		while season_count <= int(total_seasons):
-			to_season_ranges.append(start_season + '.to.%s' % str(season_count))
-			season_count += 1
-		if any(i in dot_release_title for i in to_season_ranges):
-			keys = [i for i in to_season_ranges if i in dot_release_title]
-			last_season = int(keys[0].split('to.')[1])
-			return True, last_season
-
-# "1.thru.9" range filter (dots or dashes)
-		thru_ranges = [i.replace('to', 'thru') for i in to_season_ranges]
-		if any(i in dot_release_title for i in thru_ranges):
-			keys = [i for i in thru_ranges if i in dot_release_title]
-			last_season = int(keys[0].split('thru.')[1])
-			return True, last_season
-
-# "1-9" range filter
-		dash_ranges = [i.replace('.to.', '-') for i in to_season_ranges]
-		if any(i in release_title for i in dash_ranges):
-			keys = [i for i in dash_ranges if i in release_title]
-			last_season = int(keys[0].split('-')[1])
-			return True, last_season
-
-# "1~9" range filter
-		tilde_ranges = [i.replace('.to.', '~') for i in to_season_ranges]
-		if any(i in release_title for i in tilde_ranges):
-			keys = [i for i in tilde_ranges if i in release_title]
-			last_season = int(keys[0].split('~')[1])
-			return True, last_season
-
-
-
-# "01.to.09" 2 digit range filter (dots or dashes)
-		to_season_ranges = []
-		start_season = '01'
-		season_count = 2
-		while season_count <= int(total_seasons):
-			to_season_ranges.append(start_season + '.to.%s' % '0' + str(season_count) if int(season_count) < 10 else start_season + '.to.%s' % str(season_count))
-			season_count += 1
-		if any(i in dot_release_title for i in to_season_ranges):
-			keys = [i for i in to_season_ranges if i in dot_release_title]
-			last_season = int(keys[0].split('to.')[1])
-			return True, last_season
-
-# "01.thru.09" 2 digit range filter (dots or dashes)
-		thru_ranges = [i.replace('to', 'thru') for i in to_season_ranges]
-		if any(i in dot_release_title for i in thru_ranges):
-			keys = [i for i in thru_ranges if i in dot_release_title]
-			last_season = int(keys[0].split('thru.')[1])
-			return True, last_season
-
-# "01-09" 2 digit range filtering
-		dash_ranges = [i.replace('.to.', '-') for i in to_season_ranges]
-		if any(i in release_title for i in dash_ranges):
-			keys = [i for i in dash_ranges if i in release_title]
-			last_season = int(keys[0].split('-')[1])
-			return True, last_season
-
-# "01~09" 2 digit range filtering
-		tilde_ranges = [i.replace('.to.', '~') for i in to_season_ranges]
-		if any(i in release_title for i in tilde_ranges):
-			keys = [i for i in tilde_ranges if i in release_title]
-			last_season = int(keys[0].split('~')[1])
-			return True, last_season
-
-
-
-# "s1.to.s9" single digit range filter (dots or dashes)
-		to_season_ranges = []
-		start_season = 's1'
-		season_count = 2
-		while season_count <= int(total_seasons):
-			to_season_ranges.append(start_season + '.to.s%s' % str(season_count))
-			season_count += 1
-		if any(i in dot_release_title for i in to_season_ranges):
-			keys = [i for i in to_season_ranges if i in dot_release_title]
-			last_season = int(keys[0].split('to.s')[1])
-			return True, last_season
-
-# "s1.thru.s9" single digit range filter (dots or dashes)
-		thru_ranges = [i.replace('to', 'thru') for i in to_season_ranges]
-		if any(i in dot_release_title for i in thru_ranges):
-			keys = [i for i in thru_ranges if i in dot_release_title]
-			last_season = int(keys[0].split('thru.s')[1])
-			return True, last_season
-
-# "s1-s9" single digit range filtering (dashes)
-		dash_ranges = [i.replace('.to.', '-') for i in to_season_ranges]
-		if any(i in release_title for i in dash_ranges):
-			keys = [i for i in dash_ranges if i in release_title]
-			last_season = int(keys[0].split('-s')[1])
-			return True, last_season
-
-# "s1~s9" single digit range filtering (dashes)
-		tilde_ranges = [i.replace('.to.', '~') for i in to_season_ranges]
-		if any(i in release_title for i in tilde_ranges):
-			keys = [i for i in tilde_ranges if i in release_title]
-			last_season = int(keys[0].split('~s')[1])
-			return True, last_season
-
-
-
-# "s01.to.s09"  2 digit range filter (dots or dash)
-		to_season_ranges = []
-		start_season = 's01'
-		season_count = 2
-		while season_count <= int(total_seasons):
-			to_season_ranges.append(start_season + '.to.s%s' % '0' + str(season_count) if int(season_count) < 10 else start_season + '.to.s%s' % str(season_count))
-			season_count += 1
-		if any(i in dot_release_title for i in to_season_ranges):
-			keys = [i for i in to_season_ranges if i in dot_release_title]
-			last_season = int(keys[0].split('to.s')[1])
-			return True, last_season
-
-# "s01.thru.s09" 2 digit  range filter (dots or dashes)
-		thru_ranges = [i.replace('to', 'thru') for i in to_season_ranges]
-		if any(i in dot_release_title for i in thru_ranges):
-			keys = [i for i in thru_ranges if i in dot_release_title]
-			last_season = int(keys[0].split('thru.s')[1])
-			return True, last_season
-
-# "s01-s09" 2 digit  range filtering (dashes)
-		dash_ranges = [i.replace('.to.', '-') for i in to_season_ranges]
-		if any(i in release_title for i in dash_ranges):
-			keys = [i for i in dash_ranges if i in release_title]
-			last_season = int(keys[0].split('-s')[1])
-			return True, last_season
-
-# "s01~s09" 2 digit  range filtering (dashes)
-		tilde_ranges = [i.replace('.to.', '~') for i in to_season_ranges]
-		if any(i in release_title for i in tilde_ranges):
-			keys = [i for i in tilde_ranges if i in release_title]
-			last_season = int(keys[0].split('~s')[1])
-			return True, last_season
-
-# "s01.s09" 2 digit  range filtering (dots)
-		dot_ranges = [i.replace('.to.', '.') for i in to_season_ranges]
-		if any(i in release_title for i in dot_ranges):
-			keys = [i for i in dot_ranges if i in release_title]
-			last_season = int(keys[0].split('.s')[1])
-			return True, last_season
-
-		return True, total_seasons
-	except:
-		from cocoscrapers.modules import log_utils
-		log_utils.error()
-		# return True, total_seasons
+			dot_release_title = release_title.replace('-', '.')
+			for dotted, use_last, ranges in self.show_ranges:
+				text = dot_release_title if dotted else release_title
+				keys = [last_season for i, last_season in ranges if i in text]
+				if keys: return True, keys[-1] if use_last else keys[0]
+			return True, self.total_seasons
+		except:
+			from cocoscrapers.modules import log_utils
+			log_utils.error()
+			# return True, total_seasons
 
 def info_from_name(release_title, title, year, hdlr=None, episode_title=None, season=None, pack=None):
 	try:
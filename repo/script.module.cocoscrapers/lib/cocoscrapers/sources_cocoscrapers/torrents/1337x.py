@@ -8,8 +8,9 @@ import re
 from urllib.parse import quote, unquote_plus
 from cocoscrapers.modules import client
 from cocoscrapers.modules import source_utils
+from cocoscrapers.modules.Thread_pool import run_and_wait
 from cocoscrapers.modules import log_utils
-from cocoscrapers.modules import workers
+from cocoscrapers.modules import mirrors
 from time import time
 
 
@@ -41,6 +42,7 @@ class source:
 		self.items_append = self.items.append
 		try:
 			startTime = time()
+			self.base_link = mirrors.base_link('1337x', self.domains)
 			self.aliases = data['aliases']
 			self.year = data['year']
 			if 'tvshowtitle' in data:
@@ -61,24 +63,9 @@ class source:
 			# log_utils.log('urls = %s' % urls)
 			self.undesirables = source_utils.get_undesirables()
 			self.check_foreign_audio = source_utils.check_foreign_audio()
-			# from cocoscrapers.modules.Thread_pool import run_and_wait
-			# from functools import partial
-			# bound_get_items = partial(self.get_items)
-			# run_and_wait(bound_get_items, urls)
-			# bound_get_sources = partial(self.get_sources)
-			# run_and_wait(bound_get_sources, self.items)
-			threads = []
-			append = threads.append
-			for url in urls:
-				append(workers.Thread(self.get_items, url))
-			[i.start() for i in threads]
-			[i.join() for i in threads]
-			threads2 = []
-			append2 = threads2.append
-			for i in self.items:
-				append2(workers.Thread(self.get_sources, i))
-			[i.start() for i in threads2]
-			[i.join() for i in threads2]
+			self.matcher = source_utils.TitleMatcher(self.title, self.aliases, self.year, hdlr=self.hdlr)
+			run_and_wait(self.get_items, urls)
+			run_and_wait(self.get_sources, self.items)
 			logged = False
 			for quality in self.item_totals:
 				if self.item_totals[quality] > 0:
@@ -111,7 +98,7 @@ class source:
 				if '__cf_email__' in name: continue
 				name = source_utils.clean_name(name)
 
-				if not source_utils.check_title(self.title, self.aliases, name, self.hdlr, self.year): continue
+				if not self.matcher.check_title(name): continue
 				name_info = source_utils.info_from_name(name, self.title, self.year, self.hdlr, self.episode_title)
 				if source_utils.remove_lang(name_info, self.check_foreign_audio): continue
 				if self.undesirables and source_utils.remove_undesirables(name_info, self.undesirables): continue
@@ -54,6 +54,7 @@ class source:
 			_INFO = re.compile(r'💾.*')
 			undesirables = source_utils.get_undesirables()
 			check_foreign_audio = source_utils.check_foreign_audio()
+			matcher = source_utils.TitleMatcher(title, aliases, year, hdlr=hdlr)
 		except:
 			source_utils.scraper_error('COMET')
 			return sources
@@ -66,7 +67,7 @@ class source:
 
 				name = source_utils.clean_name(file_title[0])
 
-				if not source_utils.check_title(title, aliases, name.replace('.(Archie.Bunker', ''), hdlr, year): continue
+				if not matcher.check_title(name.replace('.(Archie.Bunker', '')): continue
 				name_info = source_utils.info_from_name(name, title, year, hdlr, episode_title)
 				if source_utils.remove_lang(name_info, check_foreign_audio): continue
 				if undesirables and source_utils.remove_undesirables(name_info, undesirables): continue
@@ -107,6 +108,7 @@ class source:
 			_INFO = re.compile(r'💾.*') # _INFO = re.compile(r'👤.*')
 			undesirables = source_utils.get_undesirables()
 			check_foreign_audio = source_utils.check_foreign_audio()
+			matcher = source_utils.TitleMatcher(title, aliases, year, season=season, total_seasons=total_seasons)
 		except:
 			source_utils.scraper_error('COMET')
 			return sources
@@ -122,13 +124,13 @@ class source:
 				episode_start, episode_end = 0, 0
 				if not search_series:
 					if not bypass_filter:
-						valid, episode_start, episode_end = source_utils.filter_season_pack(title, aliases, year, season, name.replace('.(Archie.Bunker', ''))
+						valid, episode_start, episode_end = matcher.filter_season_pack(name.replace('.(Archie.Bunker', ''))
 						if not valid: continue
 					package = 'season'
 
 				elif search_series:
 					if not bypass_filter:
-						valid, last_season = source_utils.filter_show_pack(title, aliases, imdb, year, season, name.replace('.(Archie.Bunker', ''), total_seasons)
+						valid, last_season = matcher.filter_show_pack(name.replace('.(Archie.Bunker', ''))
 						if not valid: continue
 					else: last_season = total_seasons
 					package = 'show'
@@ -44,6 +44,7 @@ class source:
 			if not rows: return sources
 			undesirables = source_utils.get_undesirables()
 			check_foreign_audio = source_utils.check_foreign_audio()
+			matcher = source_utils.TitleMatcher(title, aliases, year, hdlr=hdlr)
 		except:
 			source_utils.scraper_error('EZTV')
 			return sources
@@ -68,7 +69,7 @@ class source:
 				name = ''.join(link[1].partition('[eztv]')[:2]).replace(' Torrent: Magnet Link', '')
 				name = source_utils.clean_name(name)
 
-				if not source_utils.check_title(title, aliases, name, hdlr, year): continue
+				if not matcher.check_title(name): continue
 				name_info = source_utils.info_from_name(name, title, year, hdlr, episode_title)
 				if source_utils.remove_lang(name_info, check_foreign_audio): continue
 				if undesirables and source_utils.remove_undesirables(name_info, undesirables): continue
@@ -120,6 +121,7 @@ class source:
 			if not rows: return
 			undesirables = source_utils.get_undesirables()
 			check_foreign_audio = source_utils.check_foreign_audio()
+			matcher = source_utils.TitleMatcher(title, aliases, year, season=season_x, total_seasons=total_seasons)
 		except:
 			source_utils.scraper_error('EZTV')
 			return sources
@@ -146,7 +148,7 @@ class source:
 
 				episode_start, episode_end = 0, 0
 				if not bypass_filter:
-					valid, episode_start, episode_end = source_utils.filter_season_pack(title, aliases, year, season_x, name)
+					valid, episode_start, episode_end = matcher.filter_season_pack(name)
 					if not valid: continue
 				package = 'season'
 
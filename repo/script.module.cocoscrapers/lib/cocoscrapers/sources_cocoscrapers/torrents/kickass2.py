@@ -6,10 +6,10 @@
 
 import re
 from urllib.parse import quote_plus, unquote_plus
-from cocoscrapers.modules import cache
+from cocoscrapers.modules import mirrors
 from cocoscrapers.modules import client
 from cocoscrapers.modules import source_utils
-from cocoscrapers.modules import workers
+from cocoscrapers.modules.Thread_pool import run_and_wait
 from cocoscrapers.modules import log_utils
 from time import time
 
@@ -39,21 +39,9 @@ class source:
 	@property
 	def base_link(self):
 		if not self._base_link:
-			self._base_link = cache.get(self.__get_base_url, 120, 'https://%s' % self.domains[0])
+			self._base_link = mirrors.base_link('kickass2', self.domains, check='Kickass')
 		return self._base_link
 
-	def __get_base_url(self, fallback):
-		for domain in self.domains:
-			try:
-				url = 'https://%s' % domain
-				result = client.request(url, limit=1, timeout=5)
-				try: result = re.search('r<title>(.+?)</title>', result, re.I).group(1)
-				except: result = None
-				if result and 'Kickass' in result: return url
-			except:
-				source_utils.scraper_error('KICKASS2')
-		return fallback
-
 	def sources(self, data, hostDict):
 		self.sources = []
 		if not data: return self.sources
@@ -81,16 +69,8 @@ class source:
 			# log_utils.log('urls = %s' % urls)
 			self.undesirables = source_utils.get_undesirables()
 			self.check_foreign_audio = source_utils.check_foreign_audio()
-			# from cocoscrapers.modules.Thread_pool import run_and_wait
-			# from functools import partial
-			# bound_get_sources = partial(self.get_sources)
-			# run_and_wait(bound_get_sources, urls)
-			threads = []
-			append = threads.append
-			for url in urls:
-				append(workers.Thread(self.get_sources, url))
-			[i.start() for i in threads]
-			[i.join() for i in threads]
+			self.matcher = source_utils.TitleMatcher(self.title, self.aliases, self.year, hdlr=self.hdlr)
+			run_and_wait(self.get_sources, urls)
 			logged = False
 			for quality in self.item_totals:
 				if self.item_totals[quality] > 0:
@@ -123,7 +103,7 @@ class source:
 				hash = re.search(r'btih:(.*?)&', url, re.I).group(1)
 				name = source_utils.clean_name(unquote_plus(url.split('&dn=')[1])) # some links on kickass dbl encoded
 
-				if not source_utils.check_title(self.title, self.aliases, name, self.hdlr, self.year): continue
+				if not self.matcher.check_title(name): continue
 				name_info = source_utils.info_from_name(name, self.title, self.year, self.hdlr, self.episode_title)
 				if source_utils.remove_lang(name_info, self.check_foreign_audio): continue
 				if self.undesirables and source_utils.remove_undesirables(name_info, self.undesirables): continue
@@ -168,6 +148,7 @@ class source:
 			self.season_xx = self.season_x.zfill(2)
 			self.undesirables = source_utils.get_undesirables()
 			self.check_foreign_audio = source_utils.check_foreign_audio()
+			self.matcher = source_utils.TitleMatcher(self.title, self.aliases, self.year, season=self.season_x, total_seasons=self.total_seasons)
 
 			query = re.sub(r'[^A-Za-z0-9\s\.-]+', '', self.title)
 			if search_series:
@@ -178,20 +159,8 @@ class source:
 				queries = [
 							self.tvsearch.format(quote_plus(query + ' S%s' % self.season_xx)),
 							self.tvsearch.format(quote_plus(query + ' Season %s' % self.season_x))]
-			# from cocoscrapers.modules.Thread_pool import run_and_wait
-			# from functools import partial
-			# bound_get_sources_packs = partial(self.get_sources_packs)
-			# links = []
-			# for url in queries:
-			# 	links.append('%s%s' % (self.base_link, url))
-			# run_and_wait(bound_get_sources_packs, links)
-			threads = []
-			append = threads.append
-			for url in queries:
-				link = '%s%s' % (self.base_link, url)
-				append(workers.Thread(self.get_sources_packs, link))
-			[i.start() for i in threads]
-			[i.join() for i in threads]
+			links = ['%s%s' % (self.base_link, url) for url in queries]
+			run_and_wait(self.get_sources_packs, links)
 			logged = False
 			for quality in self.item_totals:
 				if self.item_totals[quality] > 0:
@@ -226,13 +195,13 @@ class source:
 				episode_start, episode_end = 0, 0
 				if not self.search_series:
 					if not self.bypass_filter:
-						valid, episode_start, episode_end = source_utils.filter_season_pack(self.title, self.aliases, self.year, self.season_x, name)
+						valid, episode_start, episode_end = self.matcher.filter_season_pack(name)
 						if not valid: continue
 					package = 'season'
 
 				elif self.search_series:
 					if not self.bypass_filter:
-						valid, last_season = source_utils.filter_show_pack(self.title, self.aliases, self.imdb, self.year, self.season_x, name, self.total_seasons)
+						valid, last_season = self.matcher.filter_show_pack(name)
 						if not valid: continue
 					else: last_season = self.total_seasons
 					package = 'show'
@@ -8,8 +8,8 @@ from json import loads as jsloads
 import re
 from urllib.parse import quote
 from cocoscrapers.modules import client, source_utils
+from cocoscrapers.modules.Thread_pool import run_and_wait
 from cocoscrapers.modules import log_utils
-from cocoscrapers.modules import workers
 from time import time
 
 
@@ -61,6 +61,7 @@ class source:
 				return sources
 			undesirables = source_utils.get_undesirables()
 			check_foreign_audio = source_utils.check_foreign_audio()
+			matcher = source_utils.TitleMatcher(title, aliases, year, hdlr=hdlr, years=years)
 		except:
 			source_utils.scraper_error('PIRATEBAY')
 			return sources
@@ -70,7 +71,7 @@ class source:
 				hash = file['info_hash']
 				name = source_utils.clean_name(file['name'])
 
-				if not source_utils.check_title(title, aliases, name, hdlr, year, years): continue
+				if not matcher.check_title(name): continue
 				name_info = source_utils.info_from_name(name, title, year, hdlr, episode_title)
 				if source_utils.remove_lang(name_info, check_foreign_audio): continue
 				if undesirables and source_utils.remove_undesirables(name_info, undesirables): continue
@@ -127,6 +128,7 @@ class source:
 			self.season_xx = self.season_x.zfill(2)
 			self.undesirables = source_utils.get_undesirables()
 			self.check_foreign_audio = source_utils.check_foreign_audio()
+			self.matcher = source_utils.TitleMatcher(self.title, self.aliases, self.year, season=self.season_x, total_seasons=self.total_seasons)
 
 			query = re.sub(r'[^A-Za-z0-9\s\.-]+', '', self.title)
 			if search_series:
@@ -137,20 +139,8 @@ class source:
 				queries = [
 						self.search_link % quote(query + ' S%s' % self.season_xx),
 						self.search_link % quote(query + ' Season %s' % self.season_x)]
-			# from cocoscrapers.modules.Thread_pool import run_and_wait
-			# from functools import partial
-			# bound_get_sources_packs = partial(self.get_sources_packs)
-			# links = []
-			# for url in queries:
-			# 	links.append('%s%s' % (self.base_link, url))
-			# run_and_wait(bound_get_sources_packs, links)
-			threads = []
-			thrds_append = threads.append
-			for url in queries:
-				link = '%s%s' % (self.base_link, url)
-				thrds_append(workers.Thread(self.get_sources_packs, link))
-			[i.start() for i in threads]
-			[i.join() for i in threads]
+			links = ['%s%s' % (self.base_link, url) for url in queries]
+			run_and_wait(self.get_sources_packs, links)
 			logged = False
 			for quality in self.item_totals:
 				if self.item_totals[quality] > 0:
@@ -182,13 +172,13 @@ class source:
 				episode_start, episode_end = 0, 0
 				if not self.search_series:
 					if not self.bypass_filter:
-						valid, episode_start, episode_end = source_utils.filter_season_pack(self.title, self.aliases, self.year, self.season_x, name)
+						valid, episode_start, episode_end = self.matcher.filter_season_pack(name)
 						if not valid: continue
 					package = 'season'
 
 				elif self.search_series:
 					if not self.bypass_filter:
-						valid, last_season = source_utils.filter_show_pack(self.title, self.aliases, self.imdb, self.year, self.season_x, name, self.total_seasons)
+						valid, last_season = self.matcher.filter_show_pack(name)
 						if not valid: continue
 					else: last_season = self.total_seasons
 					package = 'show'
@@ -50,6 +50,7 @@ class source:
 				hdlr = year
 				url = '%s%s' % (self.base_link, self.movieSearch_link)
 				params = {'type': 'search', 'limit': 100, 'categories': 2000, 'query': title.lower()}
+			matcher = source_utils.TitleMatcher(title, aliases, year, hdlr=hdlr)
 
 			try:
 				results = requests.get(url, params=params, headers=self.headers, timeout=self.timeout)
@@ -64,7 +65,7 @@ class source:
 		for file in files:
 			try:
 				name = source_utils.clean_name(file['title'])
-				if not source_utils.check_title(title, aliases, name.replace('.(Archie.Bunker', ''), hdlr, year): continue
+				if not matcher.check_title(name.replace('.(Archie.Bunker', '')): continue
 				name_info = source_utils.info_from_name(name, title, year, hdlr, episode_title)
 				if file.get('protocol') == 'usenet':
 					url = file.get('downloadUrl')
@@ -102,10 +103,10 @@ class source:
 		try:
 			title = data['tvshowtitle'].replace('&', 'and').replace('Special Victims Unit', 'SVU').replace('/', ' ')
 			aliases = data['aliases']
-			imdb = data['imdb']
 			year = data['year']
 			season = data['season']
 			url = '%s%s' % (self.base_link, self.tvSearch_link)
+			matcher = source_utils.TitleMatcher(title, aliases, year, season=season, total_seasons=total_seasons)
 			files = self._queue.get(timeout=self.timeout + 1)
 		except:
 			source_utils.scraper_error('PROWLARR')
@@ -118,13 +119,13 @@ class source:
 				episode_start, episode_end = 0, 0
 				if not search_series:
 					if not bypass_filter:
-						valid, episode_start, episode_end = source_utils.filter_season_pack(title, aliases, year, season, name.replace('.(Archie.Bunker', ''))
+						valid, episode_start, episode_end = matcher.filter_season_pack(name.replace('.(Archie.Bunker', ''))
 						if not valid: continue
 					package = 'season'
 
 				elif search_series:
 					if not bypass_filter:
-						valid, last_season = source_utils.filter_show_pack(title, aliases, imdb, year, season, name.replace('.(Archie.Bunker', ''), total_seasons)
+						valid, last_season = matcher.filter_show_pack(name.replace('.(Archie.Bunker', ''))
 						if not valid: continue
 					else: last_season = total_seasons
 					package = 'show'
@@ -8,7 +8,8 @@ import re
 import json
 from urllib.parse import quote_plus
 from time import time
-from cocoscrapers.modules import cfscrape, source_utils, workers, log_utils
+from cocoscrapers.modules import mirrors, source_utils, log_utils
+from cocoscrapers.modules.Thread_pool import run_and_wait
 
 
 class source:
@@ -20,18 +21,14 @@ class source:
     def __init__(self):
         self.language = ["en"]
         # Main + fallback mirrors
-        self.base_links = [
-            "https://torrentgalaxy.one",
-            "https://torrentgalaxy.space",
-            "https://torrentgalaxy.info",
-        ]
+        self.domains = ["torrentgalaxy.one", "torrentgalaxy.space", "torrentgalaxy.info"]
         self.search_link = "/get-posts/keywords:%s:format:json/"
         self.headers = {
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:102.0) Gecko/20100101 Firefox/102.0"
         }
         self.item_totals = {"4K": 0, "1080p": 0, "720p": 0, "SD": 0, "CAM": 0}
         self.min_seeders = 0
-        self.base_link = self.base_links[0]  # default
+        self.base_link = "https://%s" % self.domains[0]  # default
 
     def _size_from_bytes(self, size_bytes):
         try:
@@ -54,6 +51,7 @@ class source:
 
         try:
             startTime = time()
+            from cocoscrapers.modules import cfscrape  # only pulled in when this provider runs
             scraper = cfscrape.create_scraper()
             aliases = data.get("aliases", [])
             year = data.get("year")
@@ -81,15 +79,19 @@ class source:
                 search_term = imdb if imdb else quote_plus(title)
 
             posts = []
-            for base in self.base_links:
+            for domain in mirrors.ranked("torrentgalaxy", self.domains):  # fastest healthy mirror first
+                base = "https://%s" % domain
+                start = time()
                 try:
-                    url = f"{base.rstrip('/')}{self.search_link % search_term}"
+                    url = f"{base}{self.search_link % search_term}"
                     result = scraper.get(url, headers=self.headers, timeout=10).text
                     data_json = json.loads(result)
                     posts = data_json.get("results", []) or data_json.get("data", [])
+                    mirrors.record(domain, time() - start, True, "torrentgalaxy")
                     self.base_link = base  # keep the working mirror
                     break  # success
                 except Exception as e:
+                    mirrors.record(domain, time() - start, False, "torrentgalaxy")
                     log_utils.log(f"TGX mirror failed ({base}): {e}")
                     continue
 
@@ -99,6 +101,7 @@ class source:
 
             undesirables = source_utils.get_undesirables()
             check_foreign_audio = source_utils.check_foreign_audio()
+            matcher = source_utils.TitleMatcher(title, aliases, year, hdlr=hdlr, years=years)
 
         except Exception as e:
             log_utils.log(f"TGX main fetch failed: {e}")
@@ -120,7 +123,7 @@ class source:
                 magnet = f"magnet:?xt=urn:btih:{hash_str}"
                 dsize, isize = self._size_from_bytes(size_bytes)
 
-                if not source_utils.check_title(title, aliases, name, hdlr, year, years):
+                if not matcher.check_title(name):
                     continue
 
                 name_info = source_utils.info_from_name(name, title, year, hdlr, episode_title)
@@ -178,7 +181,7 @@ class source:
         self.sources_append = self.sources.append
         try:
             startTime = time()
-            scraper = cfscrape.create_scraper()
+            self.base_link = mirrors.base_link("torrentgalaxy", self.domains)
             self.search_series = search_series
             self.total_seasons = total_seasons
             self.bypass_filter = bypass_filter
@@ -196,6 +199,9 @@ class source:
             self.season_xx = self.season_x.zfill(2)
             self.undesirables = source_utils.get_undesirables()
             self.check_foreign_audio = source_utils.check_foreign_audio()
+            self.matcher = source_utils.TitleMatcher(
+                self.title, self.aliases, self.year, season=self.season_x, total_seasons=self.total_seasons
+            )
 
             query = re.sub(r"[^A-Za-z0-9\s\.-]+", "", self.title)
             if search_series:
@@ -209,12 +215,8 @@ class source:
                     self.search_link % quote_plus(query + f" Season {self.season_x}"),
                 ]
 
-            threads = []
-            for url in queries:
-                link = self.base_link.rstrip("/") + url
-                threads.append(workers.Thread(self.get_sources_packs, link))
-            [i.start() for i in threads]
-            [i.join() for i in threads]
+            links = [self.base_link.rstrip("/") + url for url in queries]
+            run_and_wait(self.get_sources_packs, links)
 
             logged = False
             for quality in self.item_totals:
@@ -239,6 +241,7 @@ class source:
 
     def get_sources_packs(self, link):
         try:
+            from cocoscrapers.modules import cfscrape
             scraper = cfscrape.create_scraper()
             result = scraper.get(link, headers=self.headers, timeout=10).text
             if not result:
@@ -268,16 +271,12 @@ class source:
 
                 if not self.bypass_filter:
                     if self.search_series:
-                        valid, last_season = source_utils.filter_show_pack(
-                            self.title, self.aliases, self.imdb, self.year, self.season_x, name, self.total_seasons
-                        )
+                        valid, last_season = self.matcher.filter_show_pack(name)
                         if not valid:
                             continue
                         package = "show"
                     else:
-                        valid, episode_start, episode_end = source_utils.filter_season_pack(
-                            self.title, self.aliases, self.year, self.season_x, name
-                        )
+                        valid, episode_start, episode_end = self.matcher.filter_season_pack(name)
                         if not valid:
                             continue
                         package = "season"
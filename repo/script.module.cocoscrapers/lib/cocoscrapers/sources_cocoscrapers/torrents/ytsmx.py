@@ -45,6 +45,7 @@ class source:
 			torrents = files.get('data').get('movies')[0].get('torrents')
 			undesirables = source_utils.get_undesirables()
 			check_foreign_audio = source_utils.check_foreign_audio()
+			matcher = source_utils.TitleMatcher(title, aliases, year, hdlr=hdlr, years=years)
 		except:
 			source_utils.scraper_error('YTSMX')
 			return sources
@@ -57,7 +58,7 @@ class source:
 				name = '%s.[%s].[%s].[YTS.MX]' % (title_long, quality, type)
 				url = 'magnet:?xt=urn:btih:%s&dn=%s' % (hash, name)
 
-				if not source_utils.check_title(title, aliases, name, hdlr, year, years): continue
+				if not matcher.check_title(name): continue
 				name_info = source_utils.info_from_name(name, title, year, hdlr)
 				if source_utils.remove_lang(name_info, check_foreign_audio): continue
 				if undesirables and source_utils.remove_undesirables(name_info, undesirables): continue
@@ -97,6 +97,37 @@ elif action == 'tools_uploadLogFile':
 	from cocoscrapers.modules import log_utils
 	log_utils.upload_LogFile()
 
+elif action == 'tools_replayRecord':
+	from cocoscrapers.modules import replay
+	replay.record()
+	control.notification(message='Provider fixtures saved for replay')
+
+elif action == 'tools_replayBenchmark':
+	from cocoscrapers.modules import replay
+	from cocoscrapers.windows.textviewer import TextViewerXML
+	windows = TextViewerXML('textviewer.xml', control.addonPath(), heading='[B]Replay Benchmark[/B]', text=replay.run_benchmark())
+	windows.run()
+	del windows
+
+elif action == 'tools_viewMirrorHealth':
+	from cocoscrapers.modules import mirrors
+	from cocoscrapers.windows.textviewer import TextViewerXML
+	windows = TextViewerXML('textviewer.xml', control.addonPath(), heading='[B]Mirror Health[/B]', text=mirrors.stats())
+	windows.run()
+	del windows
+
+elif action == 'tools_coldStart':
+	from cocoscrapers.modules import coldstart
+	from cocoscrapers.windows.textviewer import TextViewerXML
+	windows = TextViewerXML('textviewer.xml', control.addonPath(), heading='[B]Cold Start[/B]', text=coldstart.format_report(coldstart.measure()))
+	windows.run()
+	del windows
+
+elif action == 'tools_benchmarkMatcher':
+	from cocoscrapers.modules import matcher_benchmark
+	result = matcher_benchmark.benchmark_matcher(int(params.get('count', 10000)))
+	control.notification(message='Legacy: %.2fs  Matcher: %.2fs' % (result['legacy'], result['matcher']))
+
 elif action == 'plexAuth':
 	from cocoscrapers.modules import plex
 	plex.Plex().auth()
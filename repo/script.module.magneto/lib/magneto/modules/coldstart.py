@@ -0,0 +1,58 @@
+"""
+	Fenomscrapers Module
+	Cold start cost of the scraper tree. Kodi runs each call in a fresh interpreter, so the package is dropped
+	from sys.modules and re-imported, then providers are loaded the way sources() does for a scrape.
+	cfscrape, pyaes and pyparsing should only show up in the last stage, when a Cloudflare challenge is met.
+"""
+
+import os
+import sys
+from time import perf_counter
+import tracemalloc
+
+PACKAGE = 'magneto'
+HEAVY = ('cfscrape', 'pyaes', 'pyparsing', 'requests', 'sqlite3')
+
+
+def _rss_kb():
+	try:
+		with open('/proc/self/statm', 'r') as f: return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') // 1024
+	except: return None # not available on Windows
+
+
+def _heavy():
+	return set(i for i in sys.modules if any(x in i.split('.') for x in HEAVY))
+
+
+def _purge():
+	for name in [i for i in sys.modules if i == PACKAGE or i.startswith(PACKAGE + '.') or i.split('.')[0] in ('pyaes', 'pyparsing')]:
+		del sys.modules[name]
+
+
+def _stage(name, func):
+	heavy, rss = _heavy(), _rss_kb()
+	tracemalloc.start()
+	start = perf_counter()
+	func()
+	elapsed = perf_counter() - start
+	peak = tracemalloc.get_traced_memory()[1]
+	tracemalloc.stop()
+	after = _rss_kb()
+	return {'stage': name, 'ms': elapsed * 1000, 'alloc_kb': peak // 1024, 'rss_kb': after - rss if rss is not None else None,
+			'loaded': sorted(set(i.split('.')[-1] if i.startswith(PACKAGE) else i.split('.')[0] for i in _heavy() - heavy))}
+
+
+def measure():
+	from importlib import import_module
+	_purge()
+	report = [_stage('import', lambda: import_module(PACKAGE))]
+	report.append(_stage('providers', lambda: import_module(PACKAGE).sources(ret_all=True)))
+	report.append(_stage('cloudflare', lambda: import_module('%s.modules.cfscrape' % PACKAGE).create_scraper()))
+	return report
+
+
+def format_report(report):
+	lines = ['%-11s %9s %9s %9s  %s' % ('stage', 'ms', 'alloc_kb', 'rss_kb', 'newly loaded')]
+	for i in report:
+		lines.append('%-11s %9.1f %9d %9s  %s' % (i['stage'], i['ms'], i['alloc_kb'], '-' if i['rss_kb'] is None else i['rss_kb'], ', '.join(i['loaded']) or '-'))
+	return '\n'.join(lines)
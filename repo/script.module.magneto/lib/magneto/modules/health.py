@@ -1,8 +1,13 @@
+import csv
+import json
 import requests
 from concurrent.futures import ThreadPoolExecutor as Pool, as_completed
-from time import monotonic
+from math import ceil
+from sqlite3 import dbapi2 as database
+from time import localtime, monotonic, strftime, time
 import xbmc, xbmcaddon, xbmcgui
 from magneto import sources as fs_sources
+from magneto.modules.control import addonPath, dataPath, existsPath, joinPath, makeFile, setting as getSetting
 
 log = xbmc.log
 Addon = xbmcaddon.Addon
@@ -96,3 +101,155 @@ def magneto():
 	dialog.close()
 	select(f"{heading} - {data['rootname']}", items, useDetails=True)
 
+
+# Benchmark: N iterations over configured ids, samples kept in benchmark.db for history and export
+bench_db = joinPath(dataPath, 'benchmark.db')
+bench_path = joinPath(dataPath, 'benchmark')
+bench_fields = ('run_id', 'provider', 'case', 'imdb', 'iteration', 'latency', 'error', 'results')
+total_seasons = 10 # passed to show pack filters, the benchmark only needs the search to run
+
+def _bench_connection():
+	if not existsPath(dataPath): makeFile(dataPath)
+	dbcon = database.connect(bench_db, timeout=60)
+	dbcon.execute('''CREATE TABLE IF NOT EXISTS runs (run_id INTEGER PRIMARY KEY AUTOINCREMENT, started INTEGER, iterations INTEGER, ids TEXT, elapsed REAL)''')
+	dbcon.execute('''CREATE TABLE IF NOT EXISTS samples (run_id INTEGER, provider TEXT, "case" TEXT, imdb TEXT, iteration INTEGER,
+		latency REAL, error INTEGER, results INTEGER)''')
+	dbcon.execute('''CREATE INDEX IF NOT EXISTS samples_run ON samples (run_id)''')
+	return dbcon
+
+def percentile(values, pct):
+	"""Nearest rank percentile of a non empty list"""
+	values = sorted(values)
+	return values[max(0, min(len(values), ceil(pct / 100 * len(values))) - 1)]
+
+def bench_ids():
+	"""
+	health.benchmark.ids is a comma separated list. Movies are plain IMDb ids,
+	episodes are imdb:season:episode and also run the season and show pack searches.
+	"""
+	ids = getSetting('health.benchmark.ids', 'tt0120903,tt0386676:1:2')
+	return [i.strip() for i in ids.split(',') if i.strip()]
+
+def bench_meta(item):
+	imdb, _, episode = item.partition(':')
+	result = requests.get(movie_year_check_url % imdb, timeout=5).json()
+	meta = next(i for i in result['d'] if i['id'] == imdb)
+	title, year = meta.get('l'), str(meta.get('y'))
+	if not episode: return [('movie', {'imdb': imdb, 'title': title, 'aliases': [], 'year': year})]
+	season, _, episode = episode.partition(':')
+	data = {'imdb': imdb, 'tvshowtitle': title, 'title': '', 'aliases': [], 'year': year, 'season': season, 'episode': episode or '1'}
+	return [('episode', data), ('season', data), ('show', data)]
+
+def bench_sample(name, provider, case, data, iteration):
+	start_time = monotonic()
+	try:
+		module = provider()
+		if case in ('movie', 'episode'): results = module.sources(dict(data), {})
+		else: results = module.sources_packs(dict(data), {}, search_series=case == 'show', total_seasons=total_seasons)
+		error = results is None
+	except Exception as e:
+		log('%s: %s benchmark error %s' % (heading.upper(), name.upper(), e), 1)
+		results, error = None, True
+	return (name, case, data['imdb'], iteration, round(monotonic() - start_time, 3), int(error), len(results or []))
+
+def _bench_cases(provider, case):
+	if case == 'movie': return provider.hasMovies
+	if case == 'episode': return provider.hasEpisodes
+	return provider.pack_capable
+
+def benchmark(iterations=None, ids=None):
+	"""Runs every provider against every id N times, stores each sample and returns the run id"""
+	iterations = iterations or int(getSetting('health.benchmark.iterations', '3'))
+	ids = ids or bench_ids()
+	dialog.create('%s Benchmark' % heading, 'Please Wait...')
+	dialog.update(0, 'Fetching Metadata...')
+	cases = []
+	for item in ids:
+		try: cases += bench_meta(item)
+		except Exception as e: log('%s: benchmark id %s skipped %s' % (heading.upper(), item, e), 1)
+	providers = fs_sources(ret_all=True)
+	jobs = [(name, provider, case, data) for case, data in cases for name, provider in providers if _bench_cases(provider, case)]
+	if not jobs:
+		dialog.close()
+		return notification(heading, 'Nothing to benchmark', time=3000)
+	started, samples, total = monotonic(), [], len(jobs) * iterations
+	for iteration in range(1, iterations + 1):
+		with Pool(len(providers) or 1) as pool:
+			futures = [pool.submit(bench_sample, *job, iteration) for job in jobs]
+			for future in as_completed(futures):
+				sample = future.result()
+				samples.append(sample)
+				line1 = 'Iteration: %d of %d' % (iteration, iterations)
+				line2 = 'Source: %s (%s)  %.3fs' % (sample[0].upper(), sample[1], sample[4])
+				dialog.update(int(len(samples) / total * 100), '[CR]'.join((line1, line2)))
+		if dialog.iscanceled(): break
+	dialog.update(100, 'Saving Results...')
+	dbcon = _bench_connection()
+	try:
+		run_id = dbcon.execute('''INSERT INTO runs (started, iterations, ids, elapsed) VALUES (?, ?, ?, ?)''',
+			(int(time()), iteration, ','.join(ids), round(monotonic() - started, 3))).lastrowid
+		dbcon.executemany('''INSERT INTO samples VALUES (?, ?, ?, ?, ?, ?, ?, ?)''', [(run_id, *i) for i in samples])
+		dbcon.commit()
+	finally: dbcon.close()
+	dialog.close()
+	return run_id
+
+def get_samples(run_id):
+	dbcon = _bench_connection()
+	try: return dbcon.execute('''SELECT * FROM samples WHERE run_id=? ORDER BY provider, "case", iteration''', (run_id,)).fetchall()
+	finally: dbcon.close()
+
+def get_runs():
+	dbcon = _bench_connection()
+	try: return dbcon.execute('''SELECT * FROM runs ORDER BY run_id DESC''').fetchall()
+	finally: dbcon.close()
+
+def bench_report(samples):
+	"""Per provider and case: p50/p95/max latency, error rate and mean results. Slowest p95 first."""
+	groups = {}
+	for i in samples: groups.setdefault((i[1], i[2]), []).append(i)
+	report = []
+	for (provider, case), rows in groups.items():
+		latency = [i[5] for i in rows]
+		report.append({'provider': provider, 'case': case, 'runs': len(rows), 'p50': percentile(latency, 50), 'p95': percentile(latency, 95),
+			'max': max(latency), 'error_rate': round(sum(i[6] for i in rows) / len(rows), 3), 'results': round(sum(i[7] for i in rows) / len(rows), 1)})
+	report.sort(key=lambda k: k['p95'], reverse=True)
+	return report
+
+def format_report(report):
+	lines = ['%-16s %-8s %5s %8s %8s %8s %6s %8s' % ('provider', 'case', 'runs', 'p50', 'p95', 'max', 'errors', 'results')]
+	for i in report:
+		lines.append('%-16s %-8s %5d %8.3f %8.3f %8.3f %5.0f%% %8.1f' % (
+			i['provider'], i['case'], i['runs'], i['p50'], i['p95'], i['max'], i['error_rate'] * 100, i['results']))
+	return '\n'.join(lines)
+
+def bench_export(run_id):
+	"""Writes the raw samples as csv and the report as json, returns the folder"""
+	if not existsPath(bench_path): makeFile(bench_path)
+	samples = get_samples(run_id)
+	with open(joinPath(bench_path, 'run_%d.csv' % run_id), 'w', newline='', encoding='utf-8') as f:
+		writer = csv.writer(f)
+		writer.writerow(bench_fields)
+		writer.writerows(samples)
+	with open(joinPath(bench_path, 'run_%d.json' % run_id), 'w', encoding='utf-8') as f:
+		json.dump({'run_id': run_id, 'report': bench_report(samples)}, f, indent=1)
+	return bench_path
+
+def bench_view(run_id):
+	from magneto.modules.textviewer import TextViewerXML
+	text = format_report(bench_report(get_samples(run_id)))
+	text += '\n\nExported to %s' % bench_export(run_id)
+	windows = TextViewerXML('textviewer.xml', addonPath(), heading='[B]%s Benchmark - Run %d[/B]' % (heading, run_id), text=text)
+	windows.run()
+	del windows
+
+def run_benchmark():
+	run_id = benchmark()
+	if run_id: bench_view(run_id)
+
+def benchmark_history():
+	runs = get_runs()
+	if not runs: return notification(heading, 'No benchmark runs saved', time=3000)
+	items = ['Run %d  |  %s  |  x%d  |  %.1fs  |  %s' % (i[0], strftime('%Y-%m-%d %H:%M', localtime(i[1])), i[2], i[4], i[3]) for i in runs]
+	choice = select('%s Benchmark History' % heading, items)
+	if choice > -1: bench_view(runs[choice][0])
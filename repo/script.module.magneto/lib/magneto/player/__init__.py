@@ -1,7 +1,8 @@
 #import sys
 import json
 import time
-from threading import Thread
+from collections import deque
+from threading import Condition, Thread
 from . import cinemeta, kore, settings
 from .window_base import open_window, create_window
 logger = kore.logger
@@ -34,12 +35,56 @@ def videoplayer(url, listitem, close_action=None):
 	if callable(close_action): close_action()
 	return player
 
+def source_key(item):
+	return item.get('infoHash') or item.get('url') or item.get('filename')
+
+class ResultChannel:
+	'''
+	Providers put result batches as they parse them, duplicates are dropped on arrival.
+	Consumers get whatever arrived since their last call, waking as soon as a batch lands.
+	'''
+	def __init__(self, providers, timeout):
+		self.pending, self.results = list(providers), []
+		self.deadline = time.monotonic() + timeout
+		self._batches, self._seen, self._condition = deque(), set(), Condition()
+
+	def put(self, provider, batch):
+		with self._condition:
+			seen, seen_add = self._seen, self._seen.add
+			batch = [i for i in batch if not ((key := source_key(i)) in seen or seen_add(key))]
+			if not batch: return
+			self.results.extend(batch)
+			self._batches.append(batch)
+			self._condition.notify_all()
+
+	def close(self, provider):
+		with self._condition:
+			if provider in self.pending: self.pending.remove(provider)
+			self._condition.notify_all()
+
+	@property
+	def done(self):
+		return not self.pending or time.monotonic() >= self.deadline
+
+	def get(self, timeout):
+		with self._condition:
+			if not self._batches and not self.done: self._condition.wait(timeout)
+			batch = [i for b in self._batches for i in b]
+			self._batches.clear()
+		return batch
+
+	def snapshot(self):
+		'''All results so far, later get() calls only return what arrives after this'''
+		with self._condition:
+			self._batches.clear()
+			return list(self.results)
+
 class MagnetoPlayer:
 	def __init__(self):
 		self.params = {}
 		self.sources, self.remove_scrapers = [], ['external']
 		self.threads, self.providers, self.internal_scraper_names = [], [], []
-		self.clear_properties, self.progress_dialog = True, None
+		self.clear_properties, self.progress_dialog, self.channel = True, None, None
 		self.sources_total = self.sources_4k = self.sources_1080p = self.sources_720p = self.sources_sd = 0
 		self.count_tuple = (
 			('sources_4k', '2160p', self._quality_length), ('sources_4k', '4K', self._quality_length),
@@ -80,10 +125,13 @@ class MagnetoPlayer:
 		if self.prepare_internal_scrapers():
 			self.providers.extend(self.internal_sources())
 			if not self.providers: return notification('No Providers', 2000)
-			threads = (Thread(target=self.activate_providers, args=(i[0], i[1]), name=i[2]) for i in self.providers)
+			self.channel = ResultChannel((i[2] for i in self.providers), self.scraper_timeout)
+			threads = (Thread(target=self.activate_providers, args=(i[0], i[1], i[2]), name=i[2]) for i in self.providers)
 			self.threads.extend(threads)
 			for i in self.threads: i.start()
-			if self.active_internal_scrapers: self.scrapers_dialog()
+			# autoplay needs the full list, the results window opens on the first 1080p/4K and streams the rest
+			if self.active_internal_scrapers: self.scrapers_dialog(wait_all=self.autoplay)
+			self.sources = self.channel.snapshot()
 			results.extend(self.sources)
 		else: logger('', 'prepare_internal_scrapers failed')
 		if results: return self.play_source(results)
@@ -108,21 +156,23 @@ class MagnetoPlayer:
 #		except: pass
 #		return source_dict
 
-	def activate_providers(self, module_type, function):
-		sources = function().results(self.search_info)
-		sleep(400)
-		if sources: self.sources.extend(sources)
+	def activate_providers(self, module_type, function, name):
+		try: function().results(self.search_info, self.channel)
+		except Exception as e: logger(name, str(e))
+		finally: self.channel.close(name)
 
-	def scrapers_dialog(self):
-		scraper_list, _threads = self.providers, self.threads
+	def scrapers_dialog(self, wait_all=True):
+		scraper_list, channel = self.providers, self.channel
 		self.internal_scrapers = self._get_active_scraper_names(scraper_list)
 		if not self.internal_scrapers: return
 		monitor = kore.monitor
 		start_time = time.monotonic()
-		while remaining_providers := [x.name for x in _threads if x.is_alive() is True]:
+		while remaining_providers := list(channel.pending):
 			try:
 				if self.progress_dialog.iscanceled() or monitor.abortRequested(): break
-				self._process_internal_results()
+				batch = channel.get(self.sleep_time / 1000)
+				if batch: self._sources_quality_count(batch)
+				if not wait_all and (self.sources_4k or self.sources_1080p): break
 				current_progress = max((time.monotonic() - start_time), 0)
 				line1 = ', '.join(remaining_providers).upper()
 				percent = int((current_progress/float(self.scraper_timeout))*100)
@@ -135,7 +185,6 @@ class MagnetoPlayer:
 					line1,
 					percent
 				)
-				sleep(self.sleep_time)
 				if percent >= 100: break
 			except: return self._kill_progress_dialog()
 		try: del monitor
@@ -153,6 +202,7 @@ class MagnetoPlayer:
 			window_format=window_format,
 			window_id=window_number,
 			results=results,
+			channel=self.channel,
 			meta=self.meta,
 			priority_language=self.priority_language,
 			scraper_settings=self.scraper_settings
@@ -238,15 +288,6 @@ class MagnetoPlayer:
 	def _sources_quality_count(self, sources):
 		for item in self.count_tuple: setattr(self, item[0], getattr(self, item[0]) + item[2](sources, item[1]))
 
-	def _process_internal_results(self):
-		for i in self.internal_scrapers:
-			win_property = get_property(int_window_prop % i)
-			if win_property in ('checked', '', None): continue
-			try: sources = json.loads(win_property)
-			except: continue
-			set_property(int_window_prop % i, 'checked')
-			self._sources_quality_count(sources)
-
 	def _get_quality_rank(self, quality):
 		return quality_ranks[quality]
 
@@ -1,6 +1,5 @@
-import json
 import requests
-from .kore import logger, get_setting, set_property, int_window_prop
+from .kore import logger, get_setting
 
 public_instance = (
 	'https://aiostreams.stremio.ru',
@@ -10,35 +9,40 @@ public_instance = (
 	'https://aiostreamsfortheweebsstable.midnightignite.me'
 )
 
-def internal_results(provider, sources):
-	set_property(int_window_prop % provider, json.dumps(sources))
-
 class source:
 	timeout = 30
+	batch_size = 25 # results handed to the channel at a time so the window can start rendering
 	scrape_provider = 'aiostreams'
-	def results(self, info):
+	def results(self, info, channel=None):
 		try:
-			self.sources, self.errors = [], []
+			self.sources, self.errors, self.channel, self.emitted = [], [], channel, 0
 			sources_append = self.sources.append
-			if not all(self.auth): return internal_results(self.scrape_provider, self.sources)
+			if not all(self.auth): return self.sources
 			self.mediatype, title = info.get('mediatype'), info.get('title', '')
 			self.season, self.episode = info.get('season'), info.get('episode')
 			if 'timeout' in info: self.timeout = info['timeout'] - 1
 			self.scrape_results = self.search(info['imdb_id'])
-			if not self.scrape_results: return internal_results(self.scrape_provider, self.sources)
+			if not self.scrape_results: return self.sources
 			for item in self.scrape_results:
 				if 'p2p' in item['type']: continue
 				item.pop('sources', None)
 				file = {'scrape_provider': self.scrape_provider, **item.pop('parsedFile', {})}
 				try: file.update(item)
 				except: pass
-				else: sources_append(file)
+				else:
+					sources_append(file)
+					if len(self.sources) - self.emitted >= self.batch_size: self.emit()
 		except Exception as e: logger(f"Magneto {self.scrape_provider} Exception", f"{e}")
 		if self.errors: logger(self.scrape_provider, f"{self.errors}")
 		logger(self.scrape_provider, f"{title} : {self.elapsed}s, {len(self.sources)}, {len(self.scrape_results)}")
-		internal_results(self.scrape_provider, self.sources)
+		self.emit()
 		return self.sources
 
+	def emit(self):
+		if not self.channel or len(self.sources) == self.emitted: return
+		self.channel.put(self.scrape_provider, self.sources[self.emitted:])
+		self.emitted = len(self.sources)
+
 	def search(self, imdb):
 		if self.mediatype == 'movie': params = {'type': 'movie', 'id': '%s' % imdb}
 		else: params = {'type': 'series', 'id': '%s:%s:%s' % (imdb, self.season, self.episode)}
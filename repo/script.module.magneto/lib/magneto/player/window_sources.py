@@ -35,6 +35,8 @@ class SourcesResults(BaseDialog):
 		self.window_id = kwargs.get('window_id', 2000)
 		self.filter_window_id = 2100
 		self.results = kwargs.get('results')
+		self.channel = kwargs.get('channel')
+		self.closed = False
 		self.info_highlights_dict = kwargs.get('scraper_settings')
 		self.priority_language = kwargs.get('priority_language')
 		self.meta = kwargs.get('meta')
@@ -51,9 +53,11 @@ class SourcesResults(BaseDialog):
 		self.add_items(self.window_id, self.item_list)
 		self.add_items(self.filter_window_id, self.filter_list)
 		self.setFocusId(self.window_id)
+		if self.channel: Thread(target=self.stream_results).start()
 
 	def run(self):
 		self.doModal()
+		self.closed = True
 		self.clearProperties()
 		hide_busy_dialog()
 		return self.selected
@@ -114,9 +118,30 @@ class SourcesResults(BaseDialog):
 #			if choice == 'results_info':
 			return self.results_info(chosen_listitem)
 
-	def make_items(self, filtered_list=None):
+	def stream_results(self):
+		while not self.closed:
+			batch = self.channel.get(0.25)
+			if batch: self.add_results(batch)
+			elif self.channel.done: break
+
+	def add_results(self, batch):
+		items = self.make_items(batch, len(self.item_list) + 1)
+		if not items: return
+		self.results.extend(batch)
+		qualities = set(i.getProperty('quality') for i in self.item_list)
+		self.item_list.extend(items)
+		self.total_results = string(len(self.item_list))
+		if not self.filter_applied:
+			self.add_items(self.window_id, items)
+			self.setProperty('total_results', self.total_results)
+		if any(not i.getProperty('quality') in qualities for i in items):
+			self.make_filter_items()
+			self.reset_window(self.filter_window_id)
+			self.add_items(self.filter_window_id, self.filter_list)
+
+	def make_items(self, batch=None, start=1):
 		def builder(results):
-			for count, item in enumerate(results, 1):
+			for count, item in enumerate(results, start):
 				try:
 					get = item.get
 					scrape_provider = get('scrape_provider')
@@ -172,7 +197,7 @@ class SourcesResults(BaseDialog):
 				except: pass
 		try:
 			_language = re.compile(rf"(multi|{self.priority_language})", flags=re.I)
-			if filtered_list: return list(builder(filtered_list))
+			if batch: return list(builder(batch))
 			self.item_list = list(builder(self.results))
 			self.total_results = string(len(self.item_list))
 		except: pass
@@ -129,3 +129,18 @@ elif action == 'tools_uploadLogFile':
 elif action == 'healthCheck':
 	from magneto.modules.health import magneto
 	magneto()
+
+elif action == 'healthBenchmark':
+	from magneto.modules.health import run_benchmark
+	run_benchmark()
+
+elif action == 'healthBenchmarkHistory':
+	from magneto.modules.health import benchmark_history
+	benchmark_history()
+
+elif action == 'coldStart':
+	from magneto.modules import coldstart
+	from magneto.modules.textviewer import TextViewerXML
+	windows = TextViewerXML('textviewer.xml', control.addonPath(), heading='[B]Cold Start[/B]', text=coldstart.format_report(coldstart.measure()))
+	windows.run()
+	del windows
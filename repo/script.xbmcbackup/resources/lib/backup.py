@@ -5,12 +5,14 @@ import xbmc
 import xbmcgui
 import xbmcvfs
 import os.path
+from concurrent.futures import ThreadPoolExecutor
 from . import utils as utils
 from datetime import datetime
 from . vfs import XBMCFileSystem, DropboxFileSystem, ZipFileSystem
 from . progressbar import BackupProgressBar
 from resources.lib.guisettings import GuiSettingsManager
-from resources.lib.extractor import ZipExtractor
+from resources.lib.manifest import BackupManifest
+from resources.lib.transfer import TransferQueue
 
 
 def folderSort(aKey):
@@ -27,8 +29,6 @@ class XbmcBackup:
     Backup = 0
     Restore = 1
 
-    ZIP_TEMP_PATH = None
-
     # list of dirs for the "simple" file selection
     simple_directory_list = ['addons', 'addon_data', 'database', 'game_saves', 'playlists', 'profiles', 'thumbnails', 'config']
 
@@ -47,10 +47,11 @@ class XbmcBackup:
 
     restore_point = None
     skip_advanced = False   # if we should check for the existance of advancedsettings in the restore
+    resume_files = None
 
     def __init__(self):
         self.xbmc_vfs = XBMCFileSystem(xbmcvfs.translatePath('special://home'))
-        self.ZIP_TEMP_PATH = xbmcvfs.translatePath(utils.getSetting('zip_temp_path'))
+        self.resume_files = set()
 
         self.configureRemote()
         utils.log(utils.getString(30046))
@@ -69,7 +70,7 @@ class XbmcBackup:
     def remoteConfigured(self):
         result = True
 
-        if(self.remote_base_path == "" or not xbmcvfs.exists(self.ZIP_TEMP_PATH)):
+        if(self.remote_base_path == ""):
             result = False
 
         return result
@@ -110,6 +111,10 @@ class XbmcBackup:
     def skipAdvanced(self):
         self.skip_advanced = True
 
+    def resumeFrom(self, restoredFiles):
+        # files already written by an interrupted restore are not copied again
+        self.resume_files.update(restoredFiles)
+
     def backup(self, progressOverride=False):
         shouldContinue = self._setupVFS(self.Backup, progressOverride)
 
@@ -125,35 +130,12 @@ class XbmcBackup:
 
             utils.log(utils.getString(30051))
             utils.log('File Selection Type: ' + str(utils.getSetting('backup_selection_type')))
-            allFiles = []
 
-            if(utils.getSettingInt('backup_selection_type') == 0):
-                # read in a list of the directories to backup
-                selectedDirs = self._readBackupConfig(utils.addon_dir() + "/resources/data/default_files.json")
-
-                # simple mode - get file listings for all enabled directories
-                for aDir in self.simple_directory_list:
-                    # if this dir enabled
-                    if(utils.getSettingBool('backup_' + aDir)):
-                        # get a file listing and append it to the allfiles array
-                        allFiles.append(self._addBackupDir(aDir, selectedDirs[aDir]['root'], selectedDirs[aDir]['dirs']))
-            else:
-                # advanced mode - load custom paths
-                selectedDirs = self._readBackupConfig(utils.data_dir() + "/custom_paths.json")
-
-                # get the set names
-                keys = list(selectedDirs.keys())
-
-                # go through the custom sets
-                for aKey in keys:
-                    # get the set
-                    aSet = selectedDirs[aKey]
-
-                    # get file listing and append
-                    allFiles.append(self._addBackupDir(aKey, aSet['root'], aSet['dirs']))
+            # the sets are known before walking so the validation file is written before any files move
+            backupSets = self._readBackupSets()
 
             # create a validation file for backup rotation
-            writeCheck = self._createValidationFile(allFiles)
+            writeCheck = self._createValidationFile([{"name": aSet[0], "source": aSet[1]} for aSet in backupSets])
 
             if(not writeCheck):
                 # we may not be able to write to this destination for some reason
@@ -164,48 +146,59 @@ class XbmcBackup:
 
             orig_base_path = self.remote_vfs.root_path
 
-            # backup all the files
-            self.transferLeft = self.transferSize
-            for fileGroup in allFiles:
-                self.xbmc_vfs.set_root(xbmcvfs.translatePath(fileGroup['source']))
-                self.remote_vfs.set_root(fileGroup['dest'] + fileGroup['name'])
-                filesCopied = self._copyFiles(fileGroup['files'], self.xbmc_vfs, self.remote_vfs)
+            # the directory walk feeds the transfer queue, files are copied while the rest of the tree is still being listed
+            transfers = self._createTransfers(self.xbmc_vfs, self.remote_vfs)
+            manifest = None
+
+            if(self._incrementalEnabled()):
+                # only changed files are sent, into the shared object store
+                manifest = BackupManifest(self.remote_base_path)
+                manifest.loadPrevious(self._loadLastManifest())
 
-                if(not filesCopied):
-                    utils.showNotification(utils.getString(30092))
-                    utils.log(utils.getString(30092))
+            for setName, root, dirs in backupSets:
+                if(transfers.cancelled):
+                    break
+
+                if(manifest is not None):
+                    manifest.addSet(setName, root)
+                    self._addBackupDir(setName, root, dirs, lambda aFile: self._queueIncremental(transfers, manifest, setName, aFile))
+                else:
+                    self.remote_vfs.set_root(orig_base_path + setName)
+                    self._addBackupDir(setName, root, dirs, lambda aFile: self._queueFile(transfers, self.xbmc_vfs, self.remote_vfs, aFile))
+
+            if(not transfers.finish()):
+                utils.showNotification(utils.getString(30092))
+                utils.log(utils.getString(30092))
+
+            if(manifest is not None and not transfers.cancelled):
+                # files whose object never finished uploading are left out rather than pointing at a missing object
+                for aFile in manifest.confirm(transfers.completed):
+                    utils.log("Upload failed, leaving out of manifest: " + aFile)
+
+                # an incomplete manifest would restore a partial system
+                self._writeManifest(manifest, orig_base_path)
 
             # reset remote and xbmc vfs
             self.xbmc_vfs.set_root("special://home/")
             self.remote_vfs.set_root(orig_base_path)
 
             if(utils.getSettingBool("compress_backups")):
-                fileManager = FileManager(self.xbmc_vfs)
-
-                # send the zip file to the real remote vfs
-                zip_name = os.path.join(self.ZIP_TEMP_PATH, self.remote_vfs.root_path[:-1] + ".zip")
-                self.remote_vfs.cleanup()
-                self.xbmc_vfs.rename(os.path.join(self.ZIP_TEMP_PATH, "xbmc_backup_temp.zip"), zip_name)
-                fileManager.addFile(zip_name)
-
-                # set root to data dir home and reset remote
-                self.xbmc_vfs.set_root(self.ZIP_TEMP_PATH)
+                # closing the archive writes its directory and finishes the upload
+                zip_name = self.saved_remote_vfs.root_path + self.remote_vfs.root_path[:-1] + ".zip"
+                fileCopied = self.remote_vfs.cleanup()
                 self.remote_vfs = self.saved_remote_vfs
 
-                # update the amount to transfer
-                self.transferSize = fileManager.fileSize()
-                self.transferLeft = self.transferSize
-                fileCopied = self._copyFiles(fileManager.getFiles(), self.xbmc_vfs, self.remote_vfs)
-
-                if(not fileCopied):
+                if(transfers.cancelled):
+                    # don't leave a partial archive where it looks like a backup
+                    self.remote_vfs.rmfile(zip_name)
+                elif(not fileCopied):
                     # zip archive copy filed, inform the user
                     shouldContinue = xbmcgui.Dialog().ok(utils.getString(30089), '%s\n%s' % (utils.getString(30090), utils.getString(30091)))
 
-                # delete the temp zip file
-                self.xbmc_vfs.rmfile(zip_name)
-
             # remove old backups
-            self._rotateBackups()
+            if(self._rotateBackups() and self.remote_vfs.exists(self.remote_base_path + BackupManifest.OBJECT_DIR)):
+                # drop stored files no remaining backup refers to
+                self._pruneObjects()
 
             # close any files
             self._closeVFS()
@@ -218,42 +211,20 @@ class XbmcBackup:
 
             # catch for if the restore point is actually a zip file
             if(self.restore_point.split('.')[-1] == 'zip'):
-                self.progressBar.updateProgress(2, utils.getString(30088))
-                utils.log("copying zip file: " + self.restore_point)
-
-                # set root to data dir home
-                self.xbmc_vfs.set_root(self.ZIP_TEMP_PATH)
-                restore_path = os.path.join(self.ZIP_TEMP_PATH, self.restore_point)
-                if(not self.xbmc_vfs.exists(restore_path)):
-                    # copy just this file from the remote vfs
-                    self.transferSize = self.remote_vfs.fileSize(self.remote_base_path + self.restore_point)
-                    zipFile = []
-                    zipFile.append({'file': self.remote_base_path + self.restore_point, 'size': self.transferSize, 'is_dir': False})
-
-                    # set transfer size
-                    self.transferLeft = self.transferSize
-                    self._copyFiles(zipFile, self.remote_vfs, self.xbmc_vfs)
-                else:
-                    utils.log("zip file exists already")
-
-                # extract the zip file
-                zip_vfs = ZipFileSystem(restore_path, 'r')
-                extractor = ZipExtractor()
-
-                if(not extractor.extract(zip_vfs, self.ZIP_TEMP_PATH, self.progressBar)):
-                    # we had a problem extracting the archive, delete everything
-                    zip_vfs.cleanup()
-                    self.xbmc_vfs.rmfile(restore_path)
-
+                self.progressBar.updateProgress(2, utils.getString(30100))
+                utils.log("reading zip file: " + self.restore_point)
+
+                # files are extracted straight out of the remote archive as they are restored
+                try:
+                    zip_vfs = ZipFileSystem(self.remote_vfs.openRead(self.remote_base_path + self.restore_point), 'r')
+                except Exception as anError:
+                    utils.log("Error opening zip archive: " + str(anError))
                     xbmcgui.Dialog().ok(utils.getString(30010), utils.getString(30101))
                     return
 
-                zip_vfs.cleanup()
-
-                self.progressBar.updateProgress(0, utils.getString(30049) + "......")
-                # set the new remote vfs and fix xbmc path
-                self.remote_vfs = XBMCFileSystem(os.path.join(self.ZIP_TEMP_PATH, self.restore_point.split(".")[0]))
-                self.xbmc_vfs.set_root(xbmcvfs.translatePath("special://home/"))
+                # the archive becomes the remote vfs, its entries start with the backup folder name
+                self.remote_vfs = zip_vfs
+                self.remote_vfs.set_root(self.restore_point.split(".")[0])
 
             # for restores remote path must exist
             if(not self.remote_vfs.exists(self.remote_vfs.root_path)):
@@ -269,8 +240,20 @@ class XbmcBackup:
             allFiles = []
             fileManager = FileManager(self.remote_vfs)
 
+            manifestData = None
+            advancedSettings = self.remote_vfs.root_path + "config/advancedsettings.xml"
+            if(valFile.get('incremental')):
+                # incremental backups only hold a manifest, files live in the object store
+                manifestData = self._readRemoteJson(self.remote_vfs.root_path + BackupManifest.MANIFEST_NAME)
+
+                if(manifestData is None):
+                    xbmcgui.Dialog().ok(utils.getString(30010), '%s\n%s' % (utils.getString(30045), self.remote_vfs.root_path + BackupManifest.MANIFEST_NAME))
+                    return
+
+                advancedSettings = self._manifestObject(manifestData, 'config', 'advancedsettings.xml')
+
             # check for the existance of an advancedsettings file
-            if(self.remote_vfs.exists(self.remote_vfs.root_path + "config/advancedsettings.xml") and not self.skip_advanced):
+            if(advancedSettings is not None and self.remote_vfs.exists(advancedSettings) and not self.skip_advanced):
                 # let the user know there is an advanced settings file present
                 restartXbmc = xbmcgui.Dialog().yesno(utils.getString(30038), "%s\n%s\n%s" % (utils.getString(30039), utils.getString(30040), utils.getString(30041)))
 
@@ -278,8 +261,11 @@ class XbmcBackup:
                     # add only this file to the file list
                     self.transferSize = 1
                     self.transferLeft = 1
-                    fileManager.addFile(self.remote_vfs.root_path + "config/advancedsettings.xml")
-                    self._copyFiles(fileManager.getFiles(), self.remote_vfs, self.xbmc_vfs)
+                    if(manifestData is not None):
+                        self._copyFile(self.remote_vfs, self.xbmc_vfs, advancedSettings, xbmcvfs.translatePath("special://home/userdata/advancedsettings.xml"))
+                    else:
+                        fileManager.addFile(advancedSettings)
+                        self._copyFiles(fileManager.getFiles(), self.remote_vfs, self.xbmc_vfs)
 
                     # let the service know to resume this backup on startup
                     self._createResumeBackupFile()
@@ -305,7 +291,11 @@ class XbmcBackup:
             else:
                 selectedSets = [restoreSets.index(n) for n in selectedSets if n in restoreSets]  # if set name not found just skip it
 
-            if(selectedSets is not None):
+            if(selectedSets is not None and manifestData is not None):
+                if(not self._restoreIncremental(valFile, manifestData, selectedSets)):
+                    return
+
+            elif(selectedSets is not None):
 
                 # go through each of the directories in the backup and write them to the correct location
                 for index in selectedSets:
@@ -326,11 +316,14 @@ class XbmcBackup:
                         xbmcgui.Dialog().ok(utils.getString(30010), '%s\n%s' % (utils.getString(30045), self.remote_vfs.root_path + aDir['name']))
 
                 # restore all the files
-                self.transferLeft = self.transferSize
+                transfers = self._createTransfers(self.remote_vfs, self.xbmc_vfs)
                 for fileGroup in allFiles:
                     self.remote_vfs.set_root(fileGroup['source'])
                     self.xbmc_vfs.set_root(fileGroup['dest'])
-                    self._copyFiles(fileGroup['files'], self.remote_vfs, self.xbmc_vfs)
+                    self._queueFiles(transfers, fileGroup['files'], self.remote_vfs, self.xbmc_vfs)
+
+                if(not self._finishRestore(transfers)):
+                    return
 
             # update the Kodi settings - if we can
             if('system_settings' in valFile and restoreSettings):
@@ -341,11 +334,8 @@ class XbmcBackup:
             self.progressBar.updateProgress(99, "Clean up operations .....")
 
             if(self.restore_point.split('.')[-1] == 'zip'):
-                # delete the zip file and the extracted directory
-                self.xbmc_vfs.rmfile(os.path.join(self.ZIP_TEMP_PATH, self.restore_point))
-                xbmc.sleep(1000)
-                self.xbmc_vfs.rmdir(self.remote_vfs.clean_path(os.path.join(self.ZIP_TEMP_PATH, self.restore_point.split(".")[0])))
-                xbmc.sleep(1000)
+                # close the remote archive
+                self.remote_vfs.cleanup()
 
             # call update addons to refresh everything
             xbmc.executebuiltin('UpdateLocalAddons')
@@ -363,20 +353,21 @@ class XbmcBackup:
         # append backup folder name
         progressBarTitle = utils.getString(30010) + " - "
         if(mode == self.Backup and self.remote_vfs.root_path != ''):
+            backupName = time.strftime("%Y%m%d%H%M") + utils.getSetting('backup_suffix').strip()
+
             if(utils.getSettingBool("compress_backups")):
-                # delete old temp file
-                zip_path = os.path.join(self.ZIP_TEMP_PATH, 'xbmc_backup_temp.zip')
-                if(self.xbmc_vfs.exists(zip_path)):
-                    if(not self.xbmc_vfs.rmfile(zip_path)):
-                        # we had some kind of error deleting the old file
-                        xbmcgui.Dialog().ok(utils.getString(30010), '%s\n%s' % (utils.getString(30096), utils.getString(30097)))
-                        return False
+                # the archive is written straight to the remote as files are added, nothing is staged locally
+                zipStream = self.remote_vfs.openWrite(self.remote_vfs.root_path + backupName + ".zip")
+
+                if(zipStream is None):
+                    xbmcgui.Dialog().ok(utils.getString(30089), '%s\n%s' % (utils.getString(30090), utils.getString(30091)))
+                    return False
 
                 # save the remote file system and use the zip vfs
                 self.saved_remote_vfs = self.remote_vfs
-                self.remote_vfs = ZipFileSystem(zip_path, "w")
+                self.remote_vfs = ZipFileSystem(zipStream, "w")
 
-            self.remote_vfs.set_root(self.remote_vfs.root_path + time.strftime("%Y%m%d%H%M") + utils.getSetting('backup_suffix').strip() + "/")
+            self.remote_vfs.set_root(self.remote_vfs.root_path + backupName + "/")
             progressBarTitle = progressBarTitle + utils.getString(30023) + ": " + utils.getString(30016)
         elif(mode == self.Restore and self.restore_point is not None and self.remote_vfs.root_path != ''):
             if(self.restore_point.split('.')[-1] != 'zip'):
@@ -389,7 +380,6 @@ class XbmcBackup:
 
         utils.log(utils.getString(30047) + ": " + self.xbmc_vfs.root_path)
         utils.log(utils.getString(30048) + ": " + self.remote_vfs.root_path)
-        utils.log(utils.getString(30152) + ": " + utils.getSetting('zip_temp_path'))
 
         # setup the progress bar
         self.progressBar = BackupProgressBar(progressOverride)
@@ -408,8 +398,24 @@ class XbmcBackup:
         window.setProperty(utils.__addon_id__ + ".running", "")
 
     def _copyFiles(self, fileList, source, dest):
-        result = True
+        transfers = self._createTransfers(source, dest)
+        self._queueFiles(transfers, fileList, source, dest)
+
+        return transfers.finish()
+
+    def _createTransfers(self, source, dest):
+        # parallel copies are capped by whichever side handles the fewest at once
+        workers = max(1, min(utils.getSettingInt('transfer_threads'), source.MAX_TRANSFERS, dest.MAX_TRANSFERS))
 
+        return TransferQueue(self._copyFile, workers, self._transferProgress, self.progressBar.checkCancel)
+
+    def _transferProgress(self, transfers):
+        # totals come from the queue so the percentage keeps up while the walk is still adding files
+        self.transferSize = max(transfers.totalSize, 1)
+        self.transferLeft = transfers.totalSize - transfers.doneSize
+        self._updateProgress('%s remaining (%d/%d files)\nwriting %s' % (utils.diskString(self.transferLeft), transfers.doneFiles, transfers.totalFiles, os.path.basename(transfers.current)))
+
+    def _queueFiles(self, transfers, fileList, source, dest):
         utils.log("Source: " + source.root_path)
         utils.log("Destination: " + dest.root_path)
 
@@ -418,32 +424,40 @@ class XbmcBackup:
             dest.mkdir(dest.root_path)
 
         for aFile in fileList:
-            if(not self.progressBar.checkCancel()):
-                if(utils.getSettingBool('verbose_logging')):
-                    utils.log('Writing file: ' + aFile['file'])
+            if(transfers.cancelled):
+                break
 
-                if(aFile['is_dir']):
-                    self._updateProgress('%s remaining\nwriting %s' % (utils.diskString(self.transferLeft), os.path.basename(aFile['file'][len(source.root_path):]) + "/"))
-                    dest.mkdir(dest.root_path + aFile['file'][len(source.root_path):])
-                else:
-                    self._updateProgress('%s remaining\nwriting %s' % (utils.diskString(self.transferLeft), os.path.basename(aFile['file'][len(source.root_path):])))
-                    self.transferLeft = self.transferLeft - aFile['size']
+            self._queueFile(transfers, source, dest, aFile)
 
-                    # copy the file
-                    wroteFile = self._copyFile(source, dest, aFile['file'], dest.root_path + aFile['file'][len(source.root_path):])
+    def _queueFile(self, transfers, source, dest, aFile):
+        destFile = dest.root_path + aFile['file'][len(source.root_path):]
 
-                    # if result is still true but this file failed
-                    if(not wroteFile and result):
-                        utils.log("Failed to write " + aFile['file'])
-                        result = False
+        if(utils.getSettingBool('verbose_logging')):
+            utils.log('Writing file: ' + aFile['file'])
 
-        return result
+        if(aFile['is_dir']):
+            # directories are made right away so they exist before the files in them are copied
+            dest.mkdir(destFile)
+        elif(destFile in self.resume_files):
+            utils.log('Skipping ' + destFile + ', restored before Kodi closed')
+        else:
+            transfers.put(source, dest, aFile['file'], destFile, aFile['size'])
+
+    def _finishRestore(self, transfers):
+        transfers.finish()
+
+        if(transfers.aborted):
+            # Kodi is closing, pick up after the last copied file on the next start
+            self.resume_files.update(transfers.completed)
+            self._createResumeBackupFile()
+
+        return not transfers.aborted
 
     def _copyFile(self, source, dest, sourceFile, destFile):
         result = True
 
-        if(isinstance(source, DropboxFileSystem)):
-            # if copying from cloud storage we need the file handle, use get_file
+        if(isinstance(source, (DropboxFileSystem, ZipFileSystem))):
+            # if copying from cloud storage or an archive we need the file handle, use get_file
             result = source.get_file(sourceFile, destFile)
         else:
             # copy using normal method
@@ -451,9 +465,202 @@ class XbmcBackup:
 
         return result
 
-    def _addBackupDir(self, folder_name, root_path, dirList):
+    def _incrementalEnabled(self):
+        # zip archives are always full backups
+        return utils.getSettingBool('incremental_backups') and not utils.getSettingBool('compress_backups')
+
+    def _queueIncremental(self, transfers, manifest, setName, aFile):
+        path = aFile['file'][len(self.xbmc_vfs.root_path):]
+
+        if(aFile['is_dir']):
+            manifest.addDir(setName, path)
+            return
+
+        entry = manifest.addFile(setName, path, aFile['file'])
+        if(entry is None):
+            transfers.failed(aFile['file'])
+            return
+
+        # unchanged files and content already stored by another set are not sent again
+        if(manifest.hasObject(entry[3])):
+            return
+
+        if(manifest.isUnverified(entry[3]) and self.remote_vfs.exists(manifest.objectPath(entry[3]))):
+            manifest.stored(entry[3])
+            return
+
+        if(utils.getSettingBool('verbose_logging')):
+            utils.log('Writing file: ' + aFile['file'])
+
+        for aDir in manifest.objectDirs(entry[3]):
+            self.remote_vfs.mkdir(aDir)
+
+        # queued content found again in this run isn't sent twice, it only counts as stored once the copy succeeds
+        manifest.queue(entry[3])
+        transfers.put(self.xbmc_vfs, self.remote_vfs, aFile['file'], manifest.objectPath(entry[3]), aFile['size'])
+
+    def _writeManifest(self, manifest, backupPath):
+        # writing the manifest last is what makes this backup restorable
+        manifestData = manifest.toDict(backupPath[len(self.remote_base_path):-1])
+
+        if(self._writeRemoteJson(manifestData, backupPath + BackupManifest.MANIFEST_NAME)):
+            manifestData['remote'] = self.remote_base_path
+            with xbmcvfs.File(xbmcvfs.translatePath(utils.data_dir() + BackupManifest.MANIFEST_NAME), 'w') as f:
+                f.write(json.dumps(manifestData))
+
+    def _restoreIncremental(self, valFile, manifestData, selectedSets):
+        manifest = BackupManifest(self.remote_base_path)
+        restoreFiles = []
+
+        for index in selectedSets:
+            aDir = valFile['directories'][index]
+            aSet = manifestData['sets'].get(aDir['name'])
+
+            if(aSet is None):
+                utils.log("error set not found in manifest: " + aDir['name'])
+                xbmcgui.Dialog().ok(utils.getString(30010), '%s\n%s' % (utils.getString(30045), aDir['name']))
+                continue
+
+            destRoot = self.xbmc_vfs.clean_path(xbmcvfs.translatePath(aDir['path']))
+
+            # directories are listed parent first so they can be created in order
+            restoreFiles.append((None, destRoot, 0))
+            for path in aSet['dirs']:
+                restoreFiles.append((None, destRoot + path, 0))
+
+            for path, size, mtime, fileHash in aSet['files']:
+                restoreFiles.append((manifest.objectPath(fileHash), destRoot + path, size / 1024))
+
+        transfers = self._createTransfers(self.remote_vfs, self.xbmc_vfs)
+        for sourceFile, destFile, size in restoreFiles:
+            if(transfers.cancelled):
+                break
+
+            if(sourceFile is None):
+                self.xbmc_vfs.mkdir(destFile)
+            elif(destFile in self.resume_files):
+                utils.log('Skipping ' + destFile + ', restored before Kodi closed')
+            else:
+                transfers.put(self.remote_vfs, self.xbmc_vfs, sourceFile, destFile, size)
+
+        return self._finishRestore(transfers)
+
+    def _manifestObject(self, manifestData, setName, path):
+        aSet = manifestData['sets'].get(setName)
+
+        if(aSet is not None):
+            for aFile in aSet['files']:
+                if(aFile[0] == path):
+                    return BackupManifest(self.remote_base_path).objectPath(aFile[3])
+
+        return None
+
+    def _loadLastManifest(self):
+        # local copy of the last manifest, falls back to the newest one on the remote
+        result = None
+        localFile = xbmcvfs.translatePath(utils.data_dir() + BackupManifest.MANIFEST_NAME)
+
+        if(xbmcvfs.exists(localFile)):
+            with xbmcvfs.File(localFile, 'r') as f:
+                jsonString = f.read()
+
+            try:
+                result = json.loads(jsonString)
+            except ValueError:
+                result = None
+
+            # the backup it belongs to may have been rotated out or the remote changed
+            if(result is not None and (result.get('remote') != self.remote_base_path or not self.remote_vfs.exists(self.remote_base_path + result['backup'] + "/" + BackupManifest.MANIFEST_NAME))):
+                result = None
+
+        if(result is None):
+            for aDir, folderName in self.listBackups():
+                manifestFile = self.remote_base_path + aDir + "/" + BackupManifest.MANIFEST_NAME
+
+                if(self.remote_vfs.exists(manifestFile)):
+                    result = self._readRemoteJson(manifestFile)
+                    break
+
+        return result
+
+    def _pruneObjects(self):
+        referenced = set()
+
+        for aDir, folderName in self.listBackups():
+            manifestFile = self.remote_base_path + aDir + "/" + BackupManifest.MANIFEST_NAME
+
+            if(self.remote_vfs.exists(manifestFile)):
+                data = self._readRemoteJson(manifestFile)
+
+                if(data is None):
+                    # can't tell what is still in use, keep everything
+                    utils.log("Could not read " + manifestFile + ", skipping object cleanup")
+                    return
+
+                referenced.update(BackupManifest.hashes(data))
+
+        objectRoot = self.remote_base_path + BackupManifest.OBJECT_DIR
+        dirs, files = self.remote_vfs.listdir(objectRoot)
+
+        for aDir in dirs:
+            subDirs, objects = self.remote_vfs.listdir(objectRoot + aDir + "/")
+
+            for anObject in objects:
+                if(anObject not in referenced):
+                    self.remote_vfs.rmfile(objectRoot + aDir + "/" + anObject)
+
+    def _readRemoteJson(self, remoteFile):
+        result = None
+        localFile = xbmcvfs.translatePath(utils.data_dir() + "xbmcbackup_remote.json")
+
+        if(self._copyFile(self.remote_vfs, self.xbmc_vfs, remoteFile, localFile)):
+            with xbmcvfs.File(localFile, 'r') as f:
+                jsonString = f.read()
+
+            xbmcvfs.delete(localFile)
+
+            try:
+                result = json.loads(jsonString)
+            except ValueError:
+                result = None
+
+        return result
+
+    def _writeRemoteJson(self, data, remoteFile):
+        localFile = xbmcvfs.translatePath(utils.data_dir() + "xbmcbackup_remote.json")
+
+        with xbmcvfs.File(localFile, 'w') as f:
+            f.write(json.dumps(data))
+
+        result = self._copyFile(self.xbmc_vfs, self.remote_vfs, localFile, remoteFile)
+        xbmcvfs.delete(localFile)
+
+        return result
+
+    def _readBackupSets(self):
+        # returns (name, root, dirs) for every set to back up
+        result = []
+
+        if(utils.getSettingInt('backup_selection_type') == 0):
+            # read in a list of the directories to backup
+            selectedDirs = self._readBackupConfig(utils.addon_dir() + "/resources/data/default_files.json")
+
+            # simple mode - only the enabled directories
+            for aDir in self.simple_directory_list:
+                if(utils.getSettingBool('backup_' + aDir)):
+                    result.append((aDir, selectedDirs[aDir]['root'], selectedDirs[aDir]['dirs']))
+        else:
+            # advanced mode - load custom paths
+            selectedDirs = self._readBackupConfig(utils.data_dir() + "/custom_paths.json")
+
+            for aKey in list(selectedDirs.keys()):
+                result.append((aKey, selectedDirs[aKey]['root'], selectedDirs[aKey]['dirs']))
+
+        return result
+
+    def _addBackupDir(self, folder_name, root_path, dirList, listener=None):
         utils.log('Backup set: ' + folder_name)
-        fileManager = FileManager(self.xbmc_vfs)
+        fileManager = FileManager(self.xbmc_vfs, listener)
 
         self.xbmc_vfs.set_root(xbmcvfs.translatePath(root_path))
         for aDir in dirList:
@@ -480,6 +687,7 @@ class XbmcBackup:
         self.progressBar.updateProgress(int((float(self.transferSize - self.transferLeft) / float(self.transferSize)) * 100), message)
 
     def _rotateBackups(self):
+        removed = False
         total_backups = utils.getSettingInt('backup_rotation')
 
         if(total_backups > 0):
@@ -502,9 +710,12 @@ class XbmcBackup:
                         self.remote_vfs.rmdir(self.remote_vfs.clean_path(self.remote_base_path) + dirs[remove_num][0] + "/")
 
                     remove_num = remove_num + 1
+                    removed = True
+
+        return removed
 
     def _createValidationFile(self, dirList):
-        valInfo = {"name": "XBMC Backup Validation File", "xbmc_version": xbmc.getInfoLabel('System.BuildVersion'), "type": 0, "system_settings": [], "addons": []}
+        valInfo = {"name": "XBMC Backup Validation File", "xbmc_version": xbmc.getInfoLabel('System.BuildVersion'), "type": 0, "system_settings": [], "addons": [], "incremental": self._incrementalEnabled()}
         valDirs = []
 
         # save list of file sets
@@ -567,8 +778,9 @@ class XbmcBackup:
         return result
 
     def _createResumeBackupFile(self):
+        # first line is the restore point, followed by any files already restored
         with xbmcvfs.File(xbmcvfs.translatePath(utils.data_dir() + "resume.txt"), 'w') as f:
-            f.write(self.restore_point)
+            f.write("\n".join([self.restore_point] + sorted(self.resume_files)))
 
     def _readBackupConfig(self, aFile):
         with xbmcvfs.File(xbmcvfs.translatePath(aFile), 'r') as f:
@@ -578,15 +790,17 @@ class XbmcBackup:
 
 class FileManager:
     not_dir = ['.zip', '.xsp', '.rar']
-    exclude_dir = []
+    exclude_dir = None
     root_dirs = []
     pathSep = '/'
     totalSize = 1
 
-    def __init__(self, vfs):
+    def __init__(self, vfs, listener=None):
         self.vfs = vfs
+        self.listener = listener  # called with each file as the walk finds it
+        self.verbose = utils.getSettingBool('verbose_logging')
         self.fileArray = []
-        self.exclude_dir = []
+        self.exclude_dir = ExcludeMatcher()
         self.root_dirs = []
 
     def walk(self):
@@ -596,40 +810,58 @@ class FileManager:
             self.walkTree(xbmcvfs.translatePath(aDir['path']), aDir['recurse'])
 
     def walkTree(self, directory, recurse=True):
-        if(utils.getSettingBool('verbose_logging')):
+        if(self.verbose):
             utils.log('walking ' + directory + ', recurse: ' + str(recurse))
 
         if(directory[-1:] == '/' or directory[-1:] == '\\'):
             directory = directory[:-1]
 
         if(self.vfs.exists(directory + self.pathSep)):
-            dirs, files = self.vfs.listdir(directory)
+            startTime = time.time()
+            startCount = len(self.fileArray)
+            self.dirCount = 0
+
+            # listings are fetched ahead on worker threads while results are still added in walk order
+            with ThreadPoolExecutor(max_workers=self.vfs.MAX_TRANSFERS) as pool:
+                self._walkListing(pool, directory, pool.submit(self.vfs.scandir, directory), recurse)
+
+            scanTime = max(time.time() - startTime, 0.001)
+            fileCount = len(self.fileArray) - startCount - self.dirCount
+            utils.log('Scanned %d files in %d folders, %0.2fs (%d files/s)' % (fileCount, self.dirCount, scanTime, fileCount / scanTime))
+
+    def _walkListing(self, pool, directory, listing, recurse=True):
+        dirs, files = listing.result()
+
+        if(recurse):
+            subDirs = []
 
-            if(recurse):
-                # create all the subdirs first
-                for aDir in dirs:
-                    dirPath = xbmcvfs.validatePath(xbmcvfs.translatePath(directory + self.pathSep + aDir))
-                    file_ext = aDir.split('.')[-1]
+            for aDir in dirs:
+                dirPath = directory + self.pathSep + aDir
+                file_ext = aDir.split('.')[-1]
 
-                    # check if directory is excluded
-                    if(not any(dirPath.startswith(exDir) for exDir in self.exclude_dir)):
+                # check if directory is excluded
+                if(not self.exclude_dir.match(dirPath)):
+                    # catch for "non directory" type files
+                    shouldWalk = True
 
-                        self.addFile(dirPath, True)
+                    for s in file_ext:
+                        if(s in self.not_dir):
+                            shouldWalk = False
 
-                        # catch for "non directory" type files
-                        shouldWalk = True
+                    # start listing every sub directory now so they are ready when the walk gets there
+                    subDirs.append((dirPath, pool.submit(self.vfs.scandir, dirPath) if shouldWalk else None))
 
-                        for s in file_ext:
-                            if(s in self.not_dir):
-                                shouldWalk = False
+            # create all the subdirs first
+            for dirPath, subListing in subDirs:
+                self.addFile(dirPath, True)
+                self.dirCount = self.dirCount + 1
 
-                        if(shouldWalk):
-                            self.walkTree(dirPath)
+                if(subListing is not None):
+                    self._walkListing(pool, dirPath, subListing)
 
-            # copy all the files
-            for aFile in files:
-                filePath = xbmcvfs.translatePath(directory + self.pathSep + aFile)
-                self.addFile(filePath)
+        # copy all the files
+        for aFile, fSize in files:
+            self.addFile(directory + self.pathSep + aFile, size=fSize)
 
     def addDir(self, dirMeta):
         if(dirMeta['type'] == 'include'):
@@ -637,17 +869,26 @@ class FileManager:
         else:
             self.excludeFile(xbmcvfs.translatePath(dirMeta['path']))
 
-    def addFile(self, filename, is_dir = False):
+    def addFile(self, filename, is_dir=False, size=None):
         # write the full remote path name of this file
-        if(utils.getSettingBool('verbose_logging')):
+        if(self.verbose):
             utils.log("Add File: " + filename)
 
-        # get the file size
-        fSize = self.vfs.fileSize(filename)
+        # the walk already has sizes from the listing, directories don't count
+        if(is_dir):
+            fSize = 0
+        elif(size is None):
+            fSize = self.vfs.fileSize(filename)
+        else:
+            fSize = size
+
         self.totalSize = self.totalSize + fSize
 
         self.fileArray.append({'file': filename, 'size': fSize, 'is_dir': is_dir})
 
+        if(self.listener is not None):
+            self.listener(self.fileArray[-1])
+
     def excludeFile(self, filename):
         # remove trailing slash
         if(filename[-1] == '/' or filename[-1] == '\\'):
@@ -655,13 +896,13 @@ class FileManager:
 
         # write the full remote path name of this file
         utils.log("Exclude File: " + filename)
-        self.exclude_dir.append(filename)
+        self.exclude_dir.add(filename)
 
     def getFiles(self):
         result = self.fileArray
         self.fileArray = []
         self.root_dirs = []
-        self.exclude_dir = []
+        self.exclude_dir = ExcludeMatcher()
         self.totalSize = 0
 
         return result
@@ -671,3 +912,35 @@ class FileManager:
 
     def fileSize(self):
         return self.totalSize
+
+
+class ExcludeMatcher:
+    # excluded paths as a tree of path parts, a check costs the depth of the path instead of the number of exclusions
+    EXCLUDED = None
+
+    def __init__(self):
+        self.tree = {}
+
+    def add(self, path):
+        node = self.tree
+
+        for part in self._parts(path):
+            node = node.setdefault(part, {})
+
+        node[self.EXCLUDED] = True
+
+    def match(self, path):
+        node = self.tree
+
+        for part in self._parts(path):
+            node = node.get(part)
+
+            if(node is None):
+                return False
+            elif(self.EXCLUDED in node):
+                return True
+
+        return False
+
+    def _parts(self, path):
+        return [part for part in path.replace('\\', '/').split('/') if part != '']
@@ -0,0 +1,147 @@
+from __future__ import unicode_literals
+import hashlib
+import xbmcvfs
+from . import utils as utils
+
+
+class BackupManifest:
+    # incremental backups store each unique file once in objects/ under the remote base path
+    # every backup folder holds a manifest.json listing path, size, mtime and hash for each set
+    # version 2 manifests only list objects whose upload finished, version 1 may point at failed uploads
+    MANIFEST_NAME = "manifest.json"
+    VERSION = 2
+    OBJECT_DIR = "objects/"
+    HASH_CHUNK = 1024 * 1024
+
+    remote_base_path = None
+    previous = None
+    sets = None
+    objects = None
+    unverified = None
+    queued = None
+
+    def __init__(self, remote_base_path):
+        self.remote_base_path = remote_base_path
+        self.previous = {}
+        self.sets = {}
+        self.objects = set()
+        self.unverified = set()
+        self.queued = {}
+        self._made_dirs = set()
+
+    def objectPath(self, fileHash):
+        return self.remote_base_path + self.OBJECT_DIR + fileHash[:2] + "/" + fileHash
+
+    def hasObject(self, fileHash):
+        # stored by an earlier backup or already queued in this run
+        return fileHash in self.objects or fileHash in self.queued
+
+    def isUnverified(self, fileHash):
+        # listed by an older manifest that could reference an upload that failed
+        return fileHash in self.unverified and fileHash not in self.objects
+
+    def stored(self, fileHash):
+        self.objects.add(fileHash)
+
+    def queue(self, fileHash):
+        self.queued[fileHash] = self.objectPath(fileHash)
+
+    def confirm(self, completed):
+        # only objects that finished uploading count as stored, files pointing at any other are dropped
+        completed = set(completed)
+        failed = set()
+
+        for fileHash, objectPath in self.queued.items():
+            if(objectPath in completed):
+                self.objects.add(fileHash)
+            else:
+                failed.add(fileHash)
+
+        self.queued = {}
+        dropped = []
+
+        if(len(failed) > 0):
+            for setName, aSet in self.sets.items():
+                dropped.extend(setName + "/" + aFile[0] for aFile in aSet['files'] if aFile[3] in failed)
+                aSet['files'] = [aFile for aFile in aSet['files'] if aFile[3] not in failed]
+
+        return dropped
+
+    def objectDirs(self, fileHash):
+        # directories that must exist before this object can be written, each only once per run
+        result = []
+
+        for aDir in [self.remote_base_path + self.OBJECT_DIR, self.remote_base_path + self.OBJECT_DIR + fileHash[:2] + "/"]:
+            if(aDir not in self._made_dirs):
+                self._made_dirs.add(aDir)
+                result.append(aDir)
+
+        return result
+
+    def loadPrevious(self, data):
+        # index the last manifest so unchanged files skip hashing and already stored content skips the upload
+        if(data is None):
+            return
+
+        # older manifests were written even when an upload failed, their objects are checked before being trusted
+        known = self.objects if data.get('version', 1) >= self.VERSION else self.unverified
+
+        for setName, aSet in data['sets'].items():
+            for path, size, mtime, fileHash in aSet['files']:
+                self.previous[(setName, path)] = (size, mtime, fileHash)
+                known.add(fileHash)
+
+    def addSet(self, setName, source):
+        self.sets[setName] = {'source': source, 'dirs': [], 'files': []}
+
+    def addDir(self, setName, path):
+        self.sets[setName]['dirs'].append(path)
+
+    def addFile(self, setName, path, filename):
+        # returns the manifest entry, the hash is only computed when size or mtime changed
+        stat = xbmcvfs.Stat(filename)
+        size = stat.st_size()
+        mtime = int(stat.st_mtime())
+
+        previous = self.previous.get((setName, path))
+        if(previous is not None and previous[0] == size and previous[1] == mtime):
+            fileHash = previous[2]
+        else:
+            fileHash = self.hashFile(filename)
+
+            if(fileHash is None):
+                return None
+
+        entry = [path, size, mtime, fileHash]
+        self.sets[setName]['files'].append(entry)
+
+        return entry
+
+    def hashFile(self, filename):
+        result = hashlib.sha1()
+
+        try:
+            with xbmcvfs.File(filename, 'r') as f:
+                chunk = f.readBytes(self.HASH_CHUNK)
+
+                while(chunk):
+                    result.update(chunk)
+                    chunk = f.readBytes(self.HASH_CHUNK)
+        except Exception as anError:
+            utils.log("Failed to hash " + filename + ": " + str(anError))
+            return None
+
+        return result.hexdigest()
+
+    def toDict(self, backupName):
+        return {'version': self.VERSION, 'backup': backupName, 'sets': self.sets}
+
+    @staticmethod
+    def hashes(data):
+        result = set()
+
+        for aSet in data['sets'].values():
+            for aFile in aSet['files']:
+                result.add(aFile[3])
+
+        return result
@@ -16,6 +16,7 @@ class BackupScheduler:
     next_run = 0
     next_run_path = None
     restore_point = None
+    restored_files = []
 
     def __init__(self):
         self.monitor = UpdateMonitor(update_method=self.settingsChanged)
@@ -35,6 +36,7 @@ class BackupScheduler:
             restore.selectRestore(self.restore_point)
             # skip the advanced settings check
             restore.skipAdvanced()
+            restore.resumeFrom(self.restored_files)
             restore.restore()
 
         if(self.enabled):
@@ -175,8 +177,11 @@ class BackupScheduler:
         shouldContinue = False
         if(xbmcvfs.exists(xbmcvfs.translatePath(utils.data_dir() + "resume.txt"))):
             rFile = xbmcvfs.File(xbmcvfs.translatePath(utils.data_dir() + "resume.txt"), 'r')
-            self.restore_point = rFile.read()
+            # restore point, then any files that were already restored
+            resumeLines = rFile.read().split("\n")
             rFile.close()
+            self.restore_point = resumeLines[0]
+            self.restored_files = [f for f in resumeLines[1:] if f != '']
             xbmcvfs.delete(xbmcvfs.translatePath(utils.data_dir() + "resume.txt"))
             shouldContinue = xbmcgui.Dialog().yesno(utils.getString(30042), "%s\n%s" % (utils.getString(30043), utils.getString(30044)))
 
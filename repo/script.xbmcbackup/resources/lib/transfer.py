@@ -0,0 +1,125 @@
+from __future__ import unicode_literals
+import queue
+import threading
+import xbmc
+from . import utils as utils
+
+
+class TransferQueue:
+    # copies files on worker threads while the caller keeps adding work
+    # put() blocks once the queue is full so a fast directory walk can't run ahead of the uploads
+    WAIT_TIME = 0.5
+
+    copyMethod = None
+    progress = None
+    checkCancel = None
+
+    totalSize = 0
+    doneSize = 0
+    totalFiles = 0
+    doneFiles = 0
+    current = ''
+    cancelled = False
+    aborted = False
+
+    def __init__(self, copyMethod, workers=1, progress=None, checkCancel=None):
+        self.copyMethod = copyMethod
+        self.progress = progress
+        self.checkCancel = checkCancel
+        self.completed = []
+        self.errors = []
+        self.monitor = xbmc.Monitor()
+        self.lock = threading.Lock()
+        self.queue = queue.Queue(maxsize=workers * 4)
+
+        utils.log("Starting " + str(workers) + " transfer threads")
+        self.threads = []
+        for i in range(workers):
+            aThread = threading.Thread(target=self._worker)
+            aThread.daemon = True
+            aThread.start()
+            self.threads.append(aThread)
+
+    def put(self, source, dest, sourceFile, destFile, size=0):
+        with self.lock:
+            self.totalSize = self.totalSize + size
+            self.totalFiles = self.totalFiles + 1
+
+        while(not self._tick()):
+            try:
+                self.queue.put((source, dest, sourceFile, destFile, size), timeout=self.WAIT_TIME)
+                return True
+            except queue.Full:
+                pass
+
+        return False
+
+    def failed(self, aFile):
+        # errors found before the copy, like a file that could not be read
+        with self.lock:
+            self.errors.append(aFile)
+
+    def finish(self):
+        # wait for everything queued, returns False if any file failed to copy
+        for aThread in self.threads:
+            while(True):
+                try:
+                    self.queue.put(None, timeout=self.WAIT_TIME)
+                    break
+                except queue.Full:
+                    self._tick()
+
+        for aThread in self.threads:
+            while(aThread.is_alive()):
+                aThread.join(self.WAIT_TIME)
+                self._tick()
+
+        self._tick()
+
+        return len(self.errors) == 0
+
+    def _tick(self):
+        if(not self.cancelled):
+            if(self.monitor.abortRequested()):
+                # Kodi is shutting down, anything already copied is kept in completed so it can be resumed
+                self.aborted = True
+                self.cancelled = True
+            elif(self.checkCancel is not None and self.checkCancel()):
+                self.cancelled = True
+
+        if(self.progress is not None):
+            self.progress(self)
+
+        return self.cancelled
+
+    def _worker(self):
+        while(True):
+            item = self.queue.get()
+
+            if(item is None):
+                break
+
+            source, dest, sourceFile, destFile, size = item
+
+            # once cancelled the rest of the queue is drained without copying
+            if(not self.cancelled):
+                self.current = destFile
+
+                try:
+                    result = self.copyMethod(source, dest, sourceFile, destFile)
+                except Exception as anError:
+                    # a worker that dies here would leave put() waiting on a full queue
+                    utils.log(str(anError))
+                    result = False
+            else:
+                result = None
+
+            with self.lock:
+                self.doneSize = self.doneSize + size
+                self.doneFiles = self.doneFiles + 1
+
+                if(result):
+                    self.completed.append(destFile)
+                elif(result is not None):
+                    utils.log("Failed to write " + sourceFile)
+                    self.errors.append(sourceFile)
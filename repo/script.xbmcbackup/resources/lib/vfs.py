@@ -2,6 +2,8 @@ from __future__ import unicode_literals
 import zipfile
 import os.path
 import sys
+import time
+import requests
 import xbmcvfs
 import xbmcgui
 from dropbox import dropbox
@@ -12,6 +14,7 @@ from . authorizers import DropboxAuthorizer
 
 class Vfs:
     root_path = None
+    MAX_TRANSFERS = 1  # how many copies or listings can run against this vfs at once
 
     def __init__(self, rootString):
         self.set_root(rootString)
@@ -36,6 +39,11 @@ class Vfs:
     def listdir(self, directory):
         return {}
 
+    def scandir(self, directory):
+        # like listdir but files come with their size in KB, fine to call from several threads
+        dirs, files = self.listdir(directory)
+        return [dirs, [(aFile, self.fileSize(directory + "/" + aFile)) for aFile in files]]
+
     def mkdir(self, directory):
         return True
 
@@ -60,12 +68,47 @@ class Vfs:
     def fileSize(self, filename):
         return 0  # result should be in KB
 
+    def openRead(self, aFile):
+        return None  # seekable file object, used to read zip archives in place
+
+    def openWrite(self, aFile):
+        return None  # file object written front to back, used to stream zip archives
+
 
 class XBMCFileSystem(Vfs):
+    MAX_TRANSFERS = 8
 
     def listdir(self, directory):
         return xbmcvfs.listdir(directory)
 
+    def scandir(self, directory):
+        path = xbmcvfs.translatePath(directory)
+
+        if(not os.path.isdir(path)):
+            # network paths go through Kodi, a stat is still cheaper than opening every file
+            dirs, files = xbmcvfs.listdir(directory)
+            return [dirs, [(aFile, xbmcvfs.Stat(directory + "/" + aFile).st_size() / 1024) for aFile in files]]
+
+        # local folders are listed in one call that already holds the sizes
+        dirs = []
+        files = []
+
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    try:
+                        if(entry.is_dir()):
+                            dirs.append(entry.name)
+                        else:
+                            files.append((entry.name, entry.stat().st_size / 1024))
+                    except OSError:
+                        # broken links and files removed while listing
+                        files.append((entry.name, 0))
+        except OSError as anError:
+            utils.log("Failed to list " + path + ": " + str(anError))
+
+        return [dirs, files]
+
     def mkdir(self, directory):
         return xbmcvfs.mkdir(xbmcvfs.translatePath(directory))
 
@@ -90,26 +133,74 @@ class XBMCFileSystem(Vfs):
 
         return result
 
+    def openRead(self, aFile):
+        return VfsReader(xbmcvfs.translatePath(aFile))
+
+    def openWrite(self, aFile):
+        return VfsWriter(xbmcvfs.translatePath(aFile))
+
 
 class ZipFileSystem(Vfs):
+    MAX_TRANSFERS = 1  # the archive has a single writer
+    CHUNK_SIZE = 1024 * 1024
     zip = None
+    stream = None
 
-    def __init__(self, rootString, mode):
+    def __init__(self, stream, mode):
+        # stream comes from openRead or openWrite on the remote so the archive is never copied locally
         self.root_path = ""
-        self.zip = zipfile.ZipFile(rootString, mode=mode, compression=zipfile.ZIP_DEFLATED, allowZip64=True)
+        self.stream = stream
+        self.zip = zipfile.ZipFile(stream, mode=mode, compression=zipfile.ZIP_DEFLATED, allowZip64=True)
+
+        # directory -> (sub directories, files), entries only name files so directories come from their paths
+        self.files = {}
+        self.dirs = {'': (set(), [])}
+
+        if(mode == 'r'):
+            for info in self.zip.infolist():
+                self._addEntry(info)
 
     def listdir(self, directory):
-        return [[], []]
+        dirs, files = self.dirs.get(self._dirName(directory), (set(), []))
+        return [sorted(dirs), list(files)]
+
+    def scandir(self, directory):
+        dirs, files = self.listdir(directory)
+        directory = self._dirName(directory)
+
+        return [dirs, [(aFile, self.files[directory + aFile].file_size / 1024) for aFile in files]]
 
     def mkdir(self, directory):
         # self.zip.write(directory[len(self.root_path):])
         return False
 
     def put(self, source, dest):
+        info = zipfile.ZipInfo(dest, time.localtime(time.time())[:6])
+        info.compress_type = zipfile.ZIP_DEFLATED
 
-        aFile = xbmcvfs.File(xbmcvfs.translatePath(source), 'r')
+        # copied in chunks so large files are never held in memory
+        with xbmcvfs.File(xbmcvfs.translatePath(source), 'r') as aFile:
+            info.file_size = aFile.size()
 
-        self.zip.writestr(dest, aFile.readBytes())
+            with self.zip.open(info, 'w') as zFile:
+                chunk = aFile.readBytes(self.CHUNK_SIZE)
+
+                while(chunk):
+                    zFile.write(chunk)
+                    chunk = aFile.readBytes(self.CHUNK_SIZE)
+
+        return True
+
+    def get_file(self, source, dest):
+        with self.zip.open(self.files[self._entryName(source)]) as zFile:
+            with xbmcvfs.File(dest, 'w') as aFile:
+                chunk = zFile.read(self.CHUNK_SIZE)
+
+                while(chunk):
+                    if(not aFile.write(chunk)):
+                        return False
+
+                    chunk = zFile.read(self.CHUNK_SIZE)
 
         return True
 
@@ -117,21 +208,57 @@ class ZipFileSystem(Vfs):
         return False
 
     def exists(self, aFile):
-        return False
+        name = self._entryName(aFile)
+        return name in self.files or self._dirName(name) in self.dirs
+
+    def fileSize(self, filename):
+        info = self.files.get(self._entryName(filename))
+        return info.file_size / 1024 if info is not None else 0
 
     def cleanup(self):
         self.zip.close()
 
-    def extract(self, aFile, path):
-        # extract zip file to path
-        self.zip.extract(aFile, path)
+        # a remote writer only finishes its upload here
+        return self.stream.close()
+
+    def _addEntry(self, info):
+        name = self._entryName(info.filename)
+
+        if(name[-1:] == '/'):
+            parent = name[:-1]
+        else:
+            self.files[name] = info
+            parent = name
+
+        # register each parent directory with its own parent
+        while(parent != ''):
+            child = parent
+            parent = parent.rpartition('/')[0]
+            parentDirs, parentFiles = self.dirs.setdefault(self._dirName(parent), (set(), []))
+
+            if(child == name):
+                parentFiles.append(child.rpartition('/')[2])
+            elif(child.rpartition('/')[2] not in parentDirs):
+                parentDirs.add(child.rpartition('/')[2])
+                self.dirs.setdefault(child + '/', (set(), []))
+            else:
+                break
 
-    def listFiles(self):
-        return self.zip.infolist()
+    def _entryName(self, aFile):
+        return aFile.replace('\\', '/').lstrip('/')
+
+    def _dirName(self, directory):
+        directory = self._entryName(directory)
+
+        if(directory != '' and directory[-1:] != '/'):
+            directory = directory + '/'
+
+        return directory
 
 
 class DropboxFileSystem(Vfs):
-    MAX_CHUNK = 50 * 1000 * 1000  # dropbox uses 150, reduced to 50 for small mem systems
+    MAX_CHUNK = 16 * 1024 * 1024  # dropbox allows 150, each parallel upload holds one chunk in memory
+    MAX_TRANSFERS = 4
     client = None
     APP_KEY = ''
     APP_SECRET = ''
@@ -166,6 +293,31 @@ class DropboxFileSystem(Vfs):
         else:
             return [[], []]
 
+    def scandir(self, directory):
+        dirs = []
+        files = []
+
+        if(self.client is not None):
+            # the folder listing already has every file size, follow the cursor for large folders
+            try:
+                metadata = self.client.files_list_folder(self._fix_slashes(directory))
+
+                while(True):
+                    for aFile in metadata.entries:
+                        if(isinstance(aFile, dropbox.files.FolderMetadata)):
+                            dirs.append(aFile.name)
+                        else:
+                            files.append((aFile.name, aFile.size / 1024))
+
+                    if(not metadata.has_more):
+                        break
+
+                    metadata = self.client.files_list_folder_continue(metadata.cursor)
+            except Exception as anError:
+                utils.log(str(anError))
+
+        return [dirs, files]
+
     def mkdir(self, directory):
         directory = self._fix_slashes(directory)
         if(self.client is not None):
@@ -217,46 +369,36 @@ class DropboxFileSystem(Vfs):
             return False
 
     def put(self, source, dest, retry=True):
-        dest = self._fix_slashes(dest)
-
         if(self.client is not None):
-            # open the file and get its size
-            f = open(source, 'rb')
-            f_size = os.path.getsize(source)
-
             try:
-                if(f_size < self.MAX_CHUNK):
-                    # use the regular upload
-                    self.client.files_upload(f.read(), dest, mode=WriteMode('overwrite'))
-                else:
-                    # start the upload session
-                    upload_session = self.client.files_upload_session_start(f.read(self.MAX_CHUNK))
-                    upload_cursor = UploadSessionCursor(upload_session.session_id, f.tell())
-
-                    while(f.tell() < f_size):
-                        # check if we should finish the upload
-                        if((f_size - f.tell()) <= self.MAX_CHUNK):
-                            # upload and close
-                            self.client.files_upload_session_finish(f.read(self.MAX_CHUNK), upload_cursor, CommitInfo(dest, mode=WriteMode('overwrite')))
-                        else:
-                            # upload a part and store the offset
-                            self.client.files_upload_session_append_v2(f.read(self.MAX_CHUNK), upload_cursor)
-                            upload_cursor.offset = f.tell()
+                # sent a chunk at a time, a failed chunk is sent again on its own instead of restarting the file
+                writer = DropboxWriter(self, self._fix_slashes(dest), retry)
 
-                # if no errors we're good!
-                return True
+                with open(source, 'rb') as f:
+                    chunk = f.read(self.MAX_CHUNK)
+
+                    while(chunk):
+                        writer.write(chunk)
+                        chunk = f.read(self.MAX_CHUNK)
+
+                return writer.close()
             except Exception as anError:
+                # tried once already, just quit
                 utils.log(str(anError))
-
-                # if we have an exception retry
-                if(retry):
-                    return self.put(source, dest, False)
-                else:
-                    # tried once already, just quit
-                    return False
+                return False
         else:
             return False
 
+    def _retry(self, retry, method):
+        try:
+            return method()
+        except Exception as anError:
+            if(not retry):
+                raise
+
+            utils.log(str(anError))
+            return method()
+
     def fileSize(self, filename):
         result = 0
         aFile = self._fix_slashes(filename)
@@ -267,6 +409,20 @@ class DropboxFileSystem(Vfs):
 
         return result
 
+    def openRead(self, aFile):
+        if(self.client is not None):
+            # a temporary link takes range requests so an archive can be read without downloading all of it
+            result = self.client.files_get_temporary_link(self._fix_slashes(aFile))
+            return HttpReader(result.link, result.metadata.size)
+        else:
+            return None
+
+    def openWrite(self, aFile):
+        if(self.client is not None):
+            return DropboxWriter(self, self._fix_slashes(aFile))
+        else:
+            return None
+
     def get_file(self, source, dest):
         if(self.client is not None):
             # write the file locally
@@ -287,3 +443,180 @@ class DropboxFileSystem(Vfs):
             result = result[:-1]
 
         return result
+
+
+class VfsReader:
+    # seekable reader over xbmcvfs.File for zipfile
+    def __init__(self, path):
+        self.file = xbmcvfs.File(path)
+        self.size = self.file.size()
+        self.pos = 0
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self.pos
+
+    def seek(self, offset, whence=0):
+        if(whence == 1):
+            offset = self.pos + offset
+        elif(whence == 2):
+            offset = self.size + offset
+
+        self.file.seek(offset, 0)
+        self.pos = offset
+
+        return self.pos
+
+    def read(self, size=-1):
+        if(size < 0 or self.pos + size > self.size):
+            size = self.size - self.pos
+
+        # readBytes(0) would read the whole file
+        if(size <= 0):
+            return b''
+
+        result = bytes(self.file.readBytes(size))
+        self.pos = self.pos + len(result)
+
+        return result
+
+    def close(self):
+        self.file.close()
+        return True
+
+
+class VfsWriter:
+    # write only stream over xbmcvfs.File, zipfile keeps its own offsets when the stream can't seek
+    def __init__(self, path):
+        self.path = path
+        self.file = xbmcvfs.File(path, 'w')
+
+    def write(self, data):
+        if(not self.file.write(bytes(data))):
+            raise IOError("Failed to write to " + self.path)
+
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.file.close()
+        return True
+
+
+class HttpReader:
+    # seekable reader over an http url, data is fetched with range requests a block at a time
+    BLOCK_SIZE = 1024 * 1024
+
+    def __init__(self, url, size):
+        self.session = requests.Session()
+        self.url = url
+        self.size = size
+        self.pos = 0
+        self.block_start = 0
+        self.block = b''
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self.pos
+
+    def seek(self, offset, whence=0):
+        if(whence == 1):
+            offset = self.pos + offset
+        elif(whence == 2):
+            offset = self.size + offset
+
+        self.pos = offset
+
+        return self.pos
+
+    def read(self, size=-1):
+        if(size < 0 or self.pos + size > self.size):
+            size = self.size - self.pos
+
+        result = []
+        remaining = size
+
+        while(remaining > 0):
+            offset = self.pos - self.block_start
+
+            if(offset < 0 or offset >= len(self.block)):
+                self._fetch(remaining)
+                offset = self.pos - self.block_start
+
+            chunk = self.block[offset:offset + remaining]
+            result.append(chunk)
+            self.pos = self.pos + len(chunk)
+            remaining = remaining - len(chunk)
+
+        return b''.join(result)
+
+    def close(self):
+        self.session.close()
+        return True
+
+    def _fetch(self, size):
+        end = min(self.pos + max(size, self.BLOCK_SIZE), self.size) - 1
+        response = self.session.get(self.url, headers={'Range': 'bytes=%d-%d' % (self.pos, end)}, timeout=60)
+        response.raise_for_status()
+
+        # a server that ignores the range sends the whole file
+        self.block_start = self.pos if response.status_code == 206 else 0
+        self.block = response.content
+
+        if(self.pos - self.block_start >= len(self.block)):
+            raise IOError("No data returned for " + self.url)
+
+
+class DropboxWriter:
+    # sends full chunks through an upload session as they fill, the file is committed on close
+    def __init__(self, vfs, path, retry=True):
+        self.vfs = vfs
+        self.path = path
+        self.retry = retry
+        self.buffer = bytearray()
+        self.cursor = None
+
+    def write(self, data):
+        self.buffer.extend(data)
+
+        while(len(self.buffer) >= self.vfs.MAX_CHUNK):
+            self._send(bytes(self.buffer[:self.vfs.MAX_CHUNK]))
+
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def close(self):
+        client = self.vfs.client
+        chunk = bytes(self.buffer)
+
+        try:
+            if(self.cursor is None):
+                # small enough for the regular upload
+                self.vfs._retry(self.retry, lambda: client.files_upload(chunk, self.path, mode=WriteMode('overwrite')))
+            else:
+                self.vfs._retry(self.retry, lambda: client.files_upload_session_finish(chunk, self.cursor, CommitInfo(self.path, mode=WriteMode('overwrite'))))
+
+            return True
+        except Exception as anError:
+            utils.log(str(anError))
+            return False
+
+    def _send(self, chunk):
+        client = self.vfs.client
+
+        if(self.cursor is None):
+            upload_session = self.vfs._retry(self.retry, lambda: client.files_upload_session_start(chunk))
+            self.cursor = UploadSessionCursor(upload_session.session_id, len(chunk))
+        else:
+            self.vfs._retry(self.retry, lambda: client.files_upload_session_append_v2(chunk, self.cursor))
+            self.cursor.offset = self.cursor.offset + len(chunk)
+
+        del self.buffer[:len(chunk)]
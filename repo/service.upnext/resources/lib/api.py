@@ -2,7 +2,7 @@
 # GNU General Public License v2.0 (see COPYING or https://www.gnu.org/licenses/gpl-2.0.txt)
 
 from __future__ import absolute_import, division, unicode_literals
-from xbmc import sleep, PLAYLIST_VIDEO, PLAYLIST_MUSIC
+from xbmc import PLAYLIST_VIDEO, PLAYLIST_MUSIC
 from utils import event, get_int, get_setting_bool, get_setting_int, jsonrpc, log as ulog
 
 
@@ -15,6 +15,13 @@ class Api:
         'audio': PLAYLIST_MUSIC   # 0
     }
 
+    EPISODE_PROPERTIES = ['art', 'dateadded', 'episode', 'file', 'firstaired', 'lastplayed',
+                          'playcount', 'plot', 'rating', 'resume', 'runtime', 'season',
+                          'showtitle', 'streamdetails', 'title', 'tvshowid', 'writer']
+
+    # Number of candidate episodes fetched at once when looking for the next episode
+    NEXT_EPISODE_PAGE = 5
+
     def __init__(self):
         """Constructor for Api class"""
         self.__dict__ = self._shared_state
@@ -134,9 +141,7 @@ class Api:
             'playlistid': Api.get_playlistid(),
             # limits are zero indexed, position is one indexed
             'limits': {'start': position, 'end': position + 1},
-            'properties': ['art', 'dateadded', 'episode', 'file', 'firstaired', 'lastplayed',
-                           'playcount', 'plot', 'rating', 'resume', 'runtime', 'season',
-                           'showtitle', 'streamdetails', 'title', 'tvshowid', 'writer'],
+            'properties': Api.EPISODE_PROPERTIES,
         })
 
         item = result.get('result', {}).get('items')
@@ -228,96 +233,101 @@ class Api:
         self.log('Got details of now playing media %s' % result, 2)
         return result
 
-    def handle_kodi_lookup_of_episode(self, tvshowid, current_file, include_watched, current_episode_id):
-        result = jsonrpc(method='VideoLibrary.GetEpisodes', params={
-            'tvshowid': tvshowid,
-            'properties': ['art', 'dateadded', 'episode', 'file', 'firstaired', 'lastplayed',
-                           'playcount', 'plot', 'rating', 'resume', 'runtime', 'season',
-                           'showtitle', 'streamdetails', 'title', 'tvshowid', 'writer'],
-            'sort': {'method': 'episode'},
-        })
-
-        if not result.get('result'):
+    def handle_kodi_lookup_of_episode(self, tvshowid, current_file, include_watched, current_episode_id, current_season, current_episode):
+        if not current_episode_id:
+            self.log('No current episode found', 1)
             return None
 
-        self.log('Got details of next up episode %s' % result, 2)
-        sleep(100)
+        # Only ask for episodes sorted after the current one, instead of fetching the whole show
+        filters = [{'or': [
+            {'field': 'season', 'operator': 'greaterthan', 'value': str(current_season)},
+            {'and': [
+                {'field': 'season', 'operator': 'is', 'value': str(current_season)},
+                {'field': 'episode', 'operator': 'greaterthan', 'value': str(current_episode)},
+            ]},
+        ]}]
+        # Skip already watched episodes?
+        if not include_watched:
+            filters.append({'field': 'playcount', 'operator': 'is', 'value': '0'})
+
+        current_library_file = self.get_episode_file(current_episode_id) or current_file
+        start = 0
+        while True:
+            result = jsonrpc(method='VideoLibrary.GetEpisodes', params={
+                'tvshowid': int(tvshowid),
+                'properties': Api.EPISODE_PROPERTIES,
+                'sort': {'method': 'episode'},
+                'filter': {'and': filters},
+                'limits': {'start': start, 'end': start + Api.NEXT_EPISODE_PAGE},
+            })
+            episodes = result.get('result', {}).get('episodes', [])
+
+            episode = self.find_next_episode(episodes, current_file, current_library_file)
+            if episode:
+                self.log('Got details of next up episode %s' % episode, 2)
+                return episode
 
-        # Find the next unwatched and the newest added episodes
-        return self.find_next_episode(result, current_file, include_watched, current_episode_id)
+            # Every candidate was part of the current file, try the next page
+            if len(episodes) < Api.NEXT_EPISODE_PAGE:
+                break
+            start += Api.NEXT_EPISODE_PAGE
 
-    def handle_kodi_lookup_of_current_episode(self, tvshowid, current_episode_id):
-        result = jsonrpc(method='VideoLibrary.GetEpisodes', params={
-            'tvshowid': tvshowid,
-            'properties': ['art', 'dateadded', 'episode', 'file', 'firstaired', 'lastplayed',
-                           'playcount', 'plot', 'rating', 'resume', 'runtime', 'season',
-                           'showtitle', 'streamdetails', 'title', 'tvshowid', 'writer'],
-            'sort': {'method': 'episode'},
-        })
+        # No next episode found
+        self.log('No next episode found', 1)
+        return None
 
-        if not result.get('result'):
+    def handle_kodi_lookup_of_current_episode(self, tvshowid, current_episode_id):  # pylint: disable=unused-argument
+        if not current_episode_id:
             return None
 
-        self.log('Find current episode called', 2)
-        sleep(100)
+        result = jsonrpc(method='VideoLibrary.GetEpisodeDetails', params={
+            'episodeid': int(current_episode_id),
+            'properties': Api.EPISODE_PROPERTIES,
+        })
+        episode = result.get('result', {}).get('episodedetails')
+        if not episode:
+            self.log('No current episode found', 1)
+            return None
 
-        # Find the next unwatched and the newest added episodes
-        episodes = result.get('result', {}).get('episodes', [])
-        for idx, episode in enumerate(episodes):
-            # Find position of current episode
-            if current_episode_id == episode.get('episodeid'):
-                self.log('Find current episode found episode in position: %d' % idx, 2)
-                return episode
+        self.log('Find current episode found episode %s' % current_episode_id, 2)
+        return episode
 
-        # No next episode found
-        self.log('No next episode found', 1)
-        return None
+    @staticmethod
+    def get_episode_file(episodeid):
+        result = jsonrpc(method='VideoLibrary.GetEpisodeDetails', params={
+            'episodeid': int(episodeid),
+            'properties': ['file'],
+        })
+        return result.get('result', {}).get('episodedetails', {}).get('file')
 
     @staticmethod
-    def showtitle_to_id(title):
-        result = jsonrpc(method='VideoLibrary.GetTVShows', id='libTvShows', params={'properties': ['title']})
+    def showtitle_to_id(title, tvshowid_cache={}):  # pylint: disable=dangerous-default-value
+        # Show ids don't change, only refresh the cached title map when a show is missing
+        if title not in tvshowid_cache:
+            result = jsonrpc(method='VideoLibrary.GetTVShows', id='libTvShows')
+            tvshowid_cache.clear()
+            for tvshow in result.get('result', {}).get('tvshows', []):
+                tvshowid_cache[tvshow.get('label')] = tvshow.get('tvshowid')
 
-        for tvshow in result.get('result', {}).get('tvshows', []):
-            if tvshow.get('label') == title:
-                return tvshow.get('tvshowid')
-        return '-1'
+        return tvshowid_cache.get(title, '-1')
 
     @staticmethod
     def get_episode_id(showid, show_season, show_episode):
-        show_season = int(show_season)
-        show_episode = int(show_episode)
         result = jsonrpc(method='VideoLibrary.GetEpisodes', params={
-            'properties': ['episode', 'season'],
             'tvshowid': int(showid),
+            'season': int(show_season),
+            'filter': {'field': 'episode', 'operator': 'is', 'value': str(show_episode)},
+            'limits': {'start': 0, 'end': 1},
         })
 
-        episodeid = 0
-        for episode in result.get('result', {}).get('episodes', []):
-            if episode.get('episodeid') and episode.get('season') == show_season and episode.get('episode') == show_episode:
-                episodeid = episode.get('episodeid')
-
-        return episodeid
-
-    def find_next_episode(self, result, current_file, include_watched, current_episode_id):
-        found_match = False
-        current_library_file = current_file
         episodes = result.get('result', {}).get('episodes', [])
+        return episodes[0].get('episodeid', 0) if episodes else 0
+
+    @staticmethod
+    def find_next_episode(episodes, current_file, current_library_file):
         for episode in episodes:
-            # Find position of current episode
-            episode_library_file = episode.get('file')
-            if current_episode_id == episode.get('episodeid'):
-                found_match = True
-                current_library_file = episode_library_file
-                continue
             # Check if it may be a multi-part episode
-            if episode_library_file in (current_file, current_library_file):
-                continue
-            # Skip already watched episodes?
-            if not include_watched and episode.get('playcount') > 0:
+            if episode.get('file') in (current_file, current_library_file):
                 continue
-            if found_match:
-                return episode
-
-        # No next episode found
-        self.log('No next episode found', 1)
+            return episode
         return None
@@ -2,10 +2,12 @@
 # GNU General Public License v2.0 (see COPYING or https://www.gnu.org/licenses/gpl-2.0.txt)
 
 from __future__ import absolute_import, division, unicode_literals
+from time import time
 from xbmc import Monitor
 from api import Api
 from playbackmanager import PlaybackManager
 from player import UpNextPlayer
+from state import State
 from statichelper import to_unicode
 from utils import decode_json, get_property, get_setting_bool, kodi_version_major, log as ulog
 
@@ -13,10 +15,14 @@ from utils import decode_json, get_property, get_setting_bool, kodi_version_majo
 class UpNextMonitor(Monitor):
     """Service monitor for Kodi"""
 
+    # Start checking the player this many seconds before the notification is due
+    WAKE_MARGIN = 5
+
     def __init__(self):
         """Constructor for Monitor"""
         self.player = UpNextPlayer()
         self.api = Api()
+        self.state = State()
         self.playback_manager = PlaybackManager()
         Monitor.__init__(self)
 
@@ -37,6 +43,16 @@ class UpNextMonitor(Monitor):
             if not self.player.is_tracking():
                 continue
 
+            if self.state.pause:
+                # Nothing changes until playback resumes, which re-arms the deadline
+                continue
+
+            # Player callbacks only run inside waitForAbort(), so keep the 1 sec tick
+            # to pick up a re-arm quickly but skip all player queries until the deadline
+            deadline = self.state.notification_deadline
+            if deadline and time() < deadline:
+                continue
+
             if bool(get_property('PseudoTVRunning') == 'True'):
                 self.player.disable_tracking()
                 self.playback_manager.demo.hide()
@@ -99,9 +115,16 @@ class UpNextMonitor(Monitor):
                 self.playback_manager.demo.hide()
                 continue
 
+            # Look up the next episode now, so the library isn't queried while the popup is due
+            self.playback_manager.play_item.prefetch_next(current_file)
+
             notification_time = self.api.notification_time(total_time=total_time)
-            if total_time - play_time > notification_time:
-                # Media hasn't reach notification time yet, waiting a bit longer...
+            remaining = total_time - play_time - notification_time
+            if remaining > 0:
+                # Media hasn't reach notification time yet, sleep until shortly before it
+                # Skip the deadline when fast forwarding or rewinding, remaining time isn't wall time then
+                if self.state.speed == 1:
+                    self.state.notification_deadline = time() + remaining - self.WAKE_MARGIN
                 continue
 
             self.player.set_last_file(current_file)
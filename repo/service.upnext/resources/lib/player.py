@@ -32,6 +32,11 @@ class UpNextPlayer(Player):
 
     def enable_tracking(self):
         self.state.track = True
+        self.rearm()
+
+    def rearm(self):
+        """Have the service loop recompute when the notification is due"""
+        self.state.notification_deadline = None
 
     def reset_queue(self):
         if self.state.queued:
@@ -43,6 +48,7 @@ class UpNextPlayer(Player):
         if not getCondVisibility('videoplayer.content(episodes)'):
             return
         self.state.track = True
+        self.rearm()
         self.reset_queue()
 
     if callable(getattr(Player, 'onAVStarted', None)):
@@ -56,9 +62,21 @@ class UpNextPlayer(Player):
 
     def onPlayBackPaused(self):  # pylint: disable=invalid-name
         self.state.pause = True
+        self.rearm()
 
     def onPlayBackResumed(self):  # pylint: disable=invalid-name
         self.state.pause = False
+        self.rearm()
+
+    def onPlayBackSpeedChanged(self, speed):  # pylint: disable=invalid-name
+        self.state.speed = speed
+        self.rearm()
+
+    def onPlayBackSeek(self, time, seekOffset):  # pylint: disable=invalid-name,unused-argument
+        self.rearm()
+
+    def onPlayBackSeekChapter(self, chapter):  # pylint: disable=invalid-name,unused-argument
+        self.rearm()
 
     def onPlayBackStopped(self):  # pylint: disable=invalid-name
         """Will be called when user stops playing a file"""
@@ -59,17 +59,38 @@ class PlayItem:
         # Next video from Kodi library
         else:
             current_file = self.player.get_last_file()
-            # Get the active player
-            result = self.api.get_now_playing()
-            self.handle_now_playing_result(result)
-            # Get the next episode from Kodi
-            episode = self.api.handle_kodi_lookup_of_episode(
-                self.state.tv_show_id, current_file, self.state.include_watched, self.state.current_episode_id
-            )
+            episode = self.get_next_in_library(current_file)
             source = 'library'
 
         return episode, source
 
+    def get_next_in_library(self, current_file):
+        """Get next episode from Kodi library, reusing the lookup done early in playback"""
+
+        if self.state.next_file == current_file:
+            return self.state.next_episode
+
+        # Get the active player
+        result = self.api.get_now_playing()
+        self.handle_now_playing_result(result)
+        # Get the next episode from Kodi
+        episode = self.api.handle_kodi_lookup_of_episode(
+            self.state.tv_show_id, current_file, self.state.include_watched, self.state.current_episode_id,
+            self.state.current_season, self.state.current_episode
+        )
+        self.state.next_file = current_file
+        self.state.next_episode = episode
+        return episode
+
+    def prefetch_next(self, current_file):
+        """Look up the next library episode once per file, well before the popup is due"""
+
+        if self.state.next_file == current_file:
+            return
+        if self.api.has_addon_data() or self.get_playlist_position():
+            return
+        self.get_next_in_library(current_file)
+
     def handle_now_playing_result(self, result):
         if not result.get('result'):
             return
@@ -80,12 +101,14 @@ class PlayItem:
 
         self.state.tv_show_id = item.get('tvshowid')
         if int(self.state.tv_show_id) == -1:
-            current_show_title = item.get('showtitle').encode('utf-8')
+            current_show_title = item.get('showtitle')
             self.state.tv_show_id = self.api.showtitle_to_id(title=current_show_title)
             self.log('Fetched missing tvshowid %s' % self.state.tv_show_id, 2)
 
         current_episode_number = item.get('episode')
         current_season_id = item.get('season')
+        self.state.current_season = current_season_id
+        self.state.current_episode = current_episode_number
         # Get current episodeid
         current_episode_id = self.api.get_episode_id(
             showid=str(self.state.tv_show_id),
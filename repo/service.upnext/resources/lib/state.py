@@ -15,10 +15,16 @@ class State:
         self.include_watched = get_setting_bool('includeWatched')
         self.current_tv_show_id = None
         self.current_episode_id = None
+        self.current_season = None
+        self.current_episode = None
+        self.next_file = None
+        self.next_episode = None
         self.tv_show_id = None
         self.played_in_a_row = 1
         self.last_file = None
         self.track = False
         self.pause = False
+        self.speed = 1
+        self.notification_deadline = None
         self.queued = False
         self.playing_next = False